@@ -8,6 +8,7 @@ from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 
 from app.config import Config
 from app.services.file_cleanup import FileCleanupService
+from app.services.upload_sniffer import SniffingRequest
 from app.extensions import db, login_manager #migrate, mail, csrf
 from app.utils.logging_utils import setup_logging
 
@@ -16,6 +17,8 @@ __version__ = "2.0.0"
 def create_app(config_class=Config):
     """Application factory function"""
     app = Flask(__name__, instance_relative_config=True)
+    # Check uploads while they stream in, before they are saved
+    app.request_class = SniffingRequest
     app.config.from_object(config_class)
     
     # Load instance config if exists
@@ -24,6 +24,21 @@ class Config:
     # Google Sheets
     GOOGLE_CREDENTIALS_PATH = os.environ.get('GOOGLE_CREDENTIALS_PATH')
     GOOGLE_CREDENTIALS_JSON = os.environ.get('GOOGLE_CREDENTIALS_JSON')
+    GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS = int(os.environ.get('GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS', 300))  # Refresh tokens this long before expiry
+    GOOGLE_TOKEN_CACHE_PATH = os.environ.get('GOOGLE_TOKEN_CACHE_PATH')  # Persist access tokens across restarts (off when unset)
+    GOOGLE_HTTP_POOL_SIZE = int(os.environ.get('GOOGLE_HTTP_POOL_SIZE', 10))  # Keep-alive connections per pooled client
+    GOOGLE_SHEETS_HTTP_TIMEOUT = int(os.environ.get('GOOGLE_SHEETS_HTTP_TIMEOUT', 30))  # Seconds before a Sheets API call is abandoned
+    GOOGLE_SHEETS_FETCH_WORKERS = int(os.environ.get('GOOGLE_SHEETS_FETCH_WORKERS', 4))  # Worksheets downloaded at once by multi-tab fetches
+    GOOGLE_SHEETS_CACHE_TTL = int(os.environ.get('GOOGLE_SHEETS_CACHE_TTL', 300))  # Seconds fetched sheet data stays cached
+    GOOGLE_SHEETS_CACHE_MAX_BYTES = int(os.environ.get('GOOGLE_SHEETS_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # Memory budget for cached sheet data
+    GOOGLE_SHEETS_METADATA_TTL = int(os.environ.get('GOOGLE_SHEETS_METADATA_TTL', 60))  # Seconds worksheet lists and titles are reused
+    GOOGLE_SHEETS_SNAPSHOTS = os.environ.get('GOOGLE_SHEETS_SNAPSHOTS', 'true').lower() == 'true'  # Share fetched sheets between workers
+    GOOGLE_SHEETS_SNAPSHOT_PATH = os.environ.get('GOOGLE_SHEETS_SNAPSHOT_PATH')  # SQLite file; defaults to TEMP_FOLDER/sheets_snapshots.sqlite3
+    GOOGLE_SHEETS_SNAPSHOT_MAX_STALE = int(os.environ.get('GOOGLE_SHEETS_SNAPSHOT_MAX_STALE', 3600))  # Oldest snapshot kept for version-checked reuse
+    GOOGLE_SHEETS_HEADER_BAND_ROWS = int(os.environ.get('GOOGLE_SHEETS_HEADER_BAND_ROWS', 30))  # Rows read to locate columns before a month-only fetch
+    GOOGLE_SHEETS_READS_PER_MINUTE = int(os.environ.get('GOOGLE_SHEETS_READS_PER_MINUTE', 60))  # Sheets API read quota per minute
+    GOOGLE_SHEETS_RATE_LIMIT_BURST = int(os.environ.get('GOOGLE_SHEETS_RATE_LIMIT_BURST', 10))  # Calls allowed back to back before pacing starts
+    GOOGLE_SHEETS_RATE_LIMIT_MAX_WAIT = int(os.environ.get('GOOGLE_SHEETS_RATE_LIMIT_MAX_WAIT', 10))  # Longest a call queues for quota before it is shed
     DEFAULT_SHEET_URL = os.environ.get('DEFAULT_SHEET_URL')
 
     # Report Settings
@@ -39,7 +54,35 @@ class Config:
     
     # Upload settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload
-    ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'csv'}
+    ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'csv', 'tsv'}
+    
+    # Streaming upload pre-check: limits on what an xlsx zip may expand to
+    UPLOAD_MAX_UNCOMPRESSED_MB = int(os.environ.get('UPLOAD_MAX_UNCOMPRESSED_MB', 200))
+    UPLOAD_MAX_ZIP_MEMBERS = int(os.environ.get('UPLOAD_MAX_ZIP_MEMBERS', 5000))
+    
+    # Parse cache (decoded sheets keyed by file hash + sheet name)
+    PARSE_CACHE_MAX_BYTES = int(os.environ.get('PARSE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    PARSE_CACHE_SPILL = os.environ.get('PARSE_CACHE_SPILL', 'false').lower() == 'true'  # Spill evicted sheets to TEMP_FOLDER
+    
+    # Stream xlsx uploads at least this large with openpyxl read-only mode
+    STREAMING_PARSE_MIN_BYTES = int(os.environ.get('STREAMING_PARSE_MIN_BYTES', 8 * 1024 * 1024))
+    
+    # Upload structure preview: rows sampled per sheet and latency budget
+    PREVIEW_ROWS = int(os.environ.get('PREVIEW_ROWS', 50))
+    PREVIEW_MAX_SHEETS = int(os.environ.get('PREVIEW_MAX_SHEETS', 24))
+    PREVIEW_TIME_BUDGET_MS = int(os.environ.get('PREVIEW_TIME_BUDGET_MS', 500))
+    
+    # Detected sheet layouts reused for uploads with the same structure
+    LAYOUT_CACHE_MAX_ENTRIES = int(os.environ.get('LAYOUT_CACHE_MAX_ENTRIES', 128))
+    
+    # Parse uploads in subprocess workers with per-task limits
+    PARSE_IN_SUBPROCESS = os.environ.get('PARSE_IN_SUBPROCESS', 'true').lower() == 'true'
+    PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', 2))
+    PARSE_TIMEOUT_SECONDS = int(os.environ.get('PARSE_TIMEOUT_SECONDS', 60))
+    PARSE_MAX_RSS_MB = int(os.environ.get('PARSE_MAX_RSS_MB', 1024))
+    
+    # Force a spreadsheet engine (calamine, openpyxl, openpyxl-readonly, xlrd, csv, pandas); unset = fastest installed
+    PARSE_ENGINE = os.environ.get('PARSE_ENGINE') or None
 
         # Cleanup settings
     ENABLE_AUTO_CLEANUP = True
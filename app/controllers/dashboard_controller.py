@@ -9,6 +9,13 @@ from app.extensions import db
 
 from app.models.user import User
 from app.services.file_cleanup import FileCleanupService
+from app.services.parse_cache import parse_cache
+from app.services.layout_cache import layout_cache
+from app.services.parse_worker import parse_worker_pool
+from app.services.sheets_cache import sheets_cache
+from app.services.sheets_scheduler import sheets_scheduler
+from app.services.sheets_metadata_cache import sheets_metadata
+from app.services.sheets_snapshot_store import sheets_snapshots
 
 class DashboardController:
     """Handles dashboard display logic only"""
@@ -221,6 +228,25 @@ class DashboardController:
         folder_sizes = FileCleanupService.get_folder_sizes()
         return jsonify(folder_sizes)
     
+    @staticmethod
+    @role_required('admin')
+    def parse_cache_status():
+        """API endpoint to check parse, layout and Google Sheets cache hit/miss counters.
+
+        The top-level parse counters and ``layout_cache`` cover this request
+        process only. Uploads are parsed in the worker processes when
+        PARSE_IN_SUBPROCESS is on, and their caches are under ``parse_workers``.
+        """
+        return jsonify({
+            **parse_cache.stats(),
+            'layout_cache': layout_cache.stats(),
+            'parse_workers': parse_worker_pool.stats(),
+            'sheets_cache': sheets_cache.stats(),
+            'sheets_snapshots': sheets_snapshots.stats(),
+            'sheets_scheduler': sheets_scheduler.stats(),
+            'sheets_metadata': sheets_metadata.stats(),
+        })
+    
     @staticmethod
     def version():
         """API endpoint to get application version"""
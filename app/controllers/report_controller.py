@@ -12,6 +12,7 @@ from io import BytesIO
 
 from app.models.report import GeneratedReport, ReportAccessLog
 from app.models.user import User
+from app.services.contribution_table import ContributionTable
 from app.services.image_generator import ImageGenerator
 from app.services.pdf_service import PDFGenerator
 from app.services.file_cleanup import FileCleanupService
@@ -169,7 +170,9 @@ class ReportController:
             report_data = session['report_data']
 
             data = {
-                'data': pd.DataFrame(report_data['data']),
+                'data': ContributionTable.from_records(
+                    report_data['data'], report_data['name_col'], report_data['month_col']
+                ),
                 'month_col': report_data['month_col'],
                 'name_col': report_data['name_col'],
                 'month': report_data['month'],
@@ -272,28 +275,17 @@ class ReportController:
         
         report_data = session['report_data']
         
-        # Convert data to DataFrame for processing
-        data = pd.DataFrame(report_data['data'])
-        
         paid_members = []
         try:
-            month_col = report_data['month_col']
-            name_col = report_data['name_col']
+            table = ContributionTable.from_records(
+                report_data['data'], report_data['name_col'], report_data['month_col']
+            )
             
-            for _, row in data.iterrows():
-                member_name = row.get(name_col, '')
-                payment = row.get(month_col, 0)
-                
-                try:
-                    payment_value = float(payment)
-                    if payment_value > 0:
-                        paid_members.append({
-                            'name': member_name,
-                            'amount': payment_value,
-                            'status': 'Paid'
-                        })
-                except (ValueError, TypeError):
-                    pass
+            paid_members = [
+                {'name': member_name, 'amount': payment_value, 'status': 'Paid'}
+                for member_name, payment_value in table.paid_members()
+                if payment_value > 0
+            ]
             
         except Exception as e:
             current_app.logger.error(f"Error processing paid members: {str(e)}")
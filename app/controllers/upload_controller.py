@@ -1,14 +1,16 @@
 # app/controllers/upload_controller.py
-from flask import render_template, request, flash, redirect, url_for, session, current_app
+import os
+from flask import render_template, request, flash, redirect, url_for, session, current_app, jsonify
 from flask_login import login_required, current_user
 from app.decorators.permissions import permission_required
 from datetime import datetime
 
 from app.models.setting import Setting
-from app.services.excel_parser import ExcelParser
 from app.services.report_generator import ReportGenerator
 from app.services.file_cleanup import FileCleanupService
 from app.services.file_processor import FileProcessor
+from app.services.upload_store import upload_store
+from app.services.parse_worker import parse_worker_pool
 from app.services.report_serializer import ReportDataSerializer
 
 class UploadController:
@@ -38,13 +40,37 @@ class UploadController:
                              user_role=current_user.role,
                              recent_reports=recent_reports)
     
+    @staticmethod
+    @permission_required('upload_files')
+    def preview():
+        """API endpoint: inspect an upload's sheets and columns before the full parse"""
+        try:
+            filepath = FileProcessor.save_preview_upload(request)
+        except ValueError as e:
+            return jsonify({'valid': False, 'errors': [str(e)]}), 400
+        
+        try:
+            result = parse_worker_pool.preview(
+                filepath,
+                year=request.form.get('year', type=int),
+                month=request.form.get('month', type=int)
+            )
+        except Exception as e:
+            current_app.logger.warning(f"Upload preview failed: {str(e)}")
+            return jsonify({'valid': False, 'errors': [f'Could not read workbook: {str(e)}']}), 422
+        finally:
+            os.remove(filepath)
+        
+        return jsonify(result)
+    
     @staticmethod
     @permission_required('upload_files')
     def upload():
         """Handle file upload and report generation"""
         try:
-            # Process upload
-            filepath = FileProcessor.process_upload(request)
+            # Process upload; Google Sheets grids are parsed in memory, not saved
+            use_google_sheets = FileProcessor.uses_google_sheets(request)
+            filepath = None if use_google_sheets else FileProcessor.process_upload(request)
             
             # Get year and month
             year = request.form.get('year', type=int)
@@ -54,21 +80,22 @@ class UploadController:
                 flash('Year and month are required', 'error')
                 return redirect(url_for('main.upload_dashboard'))
             
-            # Parse Excel data
-            data = ExcelParser.parse_excel(filepath, year=year, month=month)
+            if use_google_sheets:
+                data = FileProcessor.parse_google_sheets(request, year, month)
+            else:
+                # Parse Excel data in a sandboxed worker
+                data = parse_worker_pool.parse_excel(filepath, year=year, month=month)
             
             # Generate report
             report_path = ReportGenerator.generate_contribution_report(
                 data, 
-                current_app.config['REPORT_FOLDER']
+                current_app.config['REPORT_FOLDER'],
+                source_digest=upload_store.digest_of(filepath) if filepath else None
             )
             
             # Store in session
             session.update(ReportDataSerializer.serialize(data, report_path))
             
-            # Cleanup temporary file
-            FileProcessor.cleanup_file(filepath)
-            
             # Run quick cleanup of very old files (> 30 days)
             try:
                 FileCleanupService.cleanup_old_files(days_to_keep=30)
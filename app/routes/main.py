@@ -18,6 +18,7 @@ main.route('/viewer-dashboard')(DashboardController.viewer_dashboard)
 # ==================== UPLOAD ROUTES ====================
 main.route('/upload-dashboard')(UploadController.upload_dashboard)
 main.route('/upload', methods=['POST'])(UploadController.upload)
+main.route('/upload/preview', methods=['POST'])(UploadController.preview)
 
 # ==================== SETTINGS ROUTES ====================
 main.route('/settings', methods=['GET', 'POST'])(SettingsController.settings)
@@ -28,6 +29,7 @@ main.route('/welfare-rules')(WelfareController.welfare_rules)
 # ==================== ADMIN CLEANUP ROUTES ====================
 main.route('/admin/cleanup', methods=['GET', 'POST'])(DashboardController.cleanup_files)
 main.route('/admin/storage-status')(DashboardController.storage_status)
+main.route('/admin/parse-cache-status')(DashboardController.parse_cache_status)
 
 # ==================== USER MANAGEMENT ROUTES ====================
 
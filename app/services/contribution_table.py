@@ -0,0 +1,110 @@
+# app/services/contribution_table.py
+import numpy as np
+import pandas as pd
+
+
+class ContributionTable:
+    """Read-only member/amount table for one month of contributions.
+
+    Names are stored as categorical codes into a shared ``categories`` array,
+    amounts as a float64 array (NaN = not paid), and the paid mask is
+    computed once. The parser builds one table per month and the report
+    generators and serializer read from it without copying.
+    """
+
+    __slots__ = ('codes', 'categories', 'amounts', 'paid', 'name_col', 'month_col')
+
+    def __init__(self, codes, categories, amounts, name_col, month_col):
+        self.codes = codes
+        self.categories = categories
+        self.amounts = amounts
+        self.paid = ~np.isnan(amounts)
+        self.name_col = name_col
+        self.month_col = month_col
+
+        for array in (self.codes, self.categories, self.amounts, self.paid):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_arrays(cls, names, amounts, name_col, month_col):
+        """Build a table from parallel name and amount arrays"""
+        codes, categories = pd.factorize(np.asarray(names, dtype=object), use_na_sentinel=False)
+        amounts = pd.to_numeric(pd.Series(amounts), errors='coerce').to_numpy(dtype=float)
+        return cls(codes, np.asarray(categories, dtype=object), amounts, name_col, month_col)
+
+    @classmethod
+    def from_records(cls, records, name_col, month_col):
+        """Build a table from serialized ``[{name_col: ..., month_col: ...}]`` records"""
+        names = [record.get(name_col) for record in records]
+        amounts = [record.get(month_col) for record in records]
+        return cls.from_arrays(names, amounts, name_col, month_col)
+
+    @classmethod
+    def from_data(cls, data):
+        """Return the table of a parser/session data dict, converting older shapes"""
+        table = data.get('data')
+        if isinstance(table, cls):
+            return table
+
+        name_col = data.get('name_col')
+        month_col = data.get('month_col')
+        if isinstance(table, pd.DataFrame):
+            if table.empty or name_col not in table or month_col not in table:
+                return cls.from_arrays([], [], name_col, month_col)
+            return cls.from_arrays(table[name_col].to_numpy(), table[month_col].to_numpy(), name_col, month_col)
+        return cls.from_records(table or [], name_col, month_col)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def names(self):
+        return self.categories[self.codes]
+
+    @property
+    def total_contributions(self):
+        return float(self.amounts[self.paid].sum())
+
+    @property
+    def num_contributors(self):
+        return int(self.paid.sum())
+
+    @property
+    def num_missing(self):
+        return len(self) - self.num_contributors
+
+    def paid_members(self, order=None, limit=None):
+        """List of (name, amount) for paid members.
+
+        ``order`` is None (sheet order) or 'desc' (largest amount first).
+        """
+        positions = np.flatnonzero(self.paid)
+        if order == 'desc':
+            positions = positions[np.argsort(-self.amounts[positions], kind='stable')]
+        if limit is not None:
+            positions = positions[:limit]
+        return list(zip(self.categories[self.codes[positions]].tolist(), self.amounts[positions].tolist()))
+
+    def defaulters(self):
+        """Names of members with no amount for the month"""
+        return self.categories[self.codes[~self.paid]].tolist()
+
+    def summary_stats(self):
+        return {
+            'total_contributions': self.total_contributions,
+            'num_contributors': self.num_contributors,
+            'num_missing': self.num_missing,
+            'defaulters': self.defaulters()
+        }
+
+    def to_records(self):
+        """JSON-safe records keyed by the original column labels"""
+        amounts = np.where(self.paid, self.amounts, None).tolist()
+        return [
+            {self.name_col: name, self.month_col: amount}
+            for name, amount in zip(self.names.tolist(), amounts)
+        ]
+
+    def to_frame(self):
+        """A (copied) DataFrame with the original column labels"""
+        return pd.DataFrame({self.name_col: self.names, self.month_col: self.amounts})
@@ -0,0 +1,149 @@
+# app/services/delimited_reader.py
+import io
+import os
+import re
+import csv
+from itertools import islice
+
+import pandas as pd
+from flask import current_app
+
+from app.services.excel_parser import ExcelParser, SheetIndex, FINANCIAL_LABELS
+
+
+class DelimitedReader:
+    """Fast path for CSV/TSV contribution exports.
+
+    The header rows, name columns and month columns are detected in a
+    bounded sample of leading rows, grouped as SheetIndex.layout groups them;
+    the body is then read once by pandas' C parser with explicit dtypes,
+    restricted to the name and month columns.
+    """
+
+    # Leading rows searched for the header row and the name label
+    SAMPLE_ROWS = 200
+
+    DELIMITERS = ',;\t|'
+
+    # A comma grouping thousands: "1,000", "12,345.50"
+    THOUSANDS_PATTERN = re.compile(r'(?<=\d),(?=\d{3}(?!\d))')
+
+    # Lines that may hold a financial label anywhere in the file
+    FINANCIAL_LINE_PATTERN = re.compile(
+        '|'.join(re.escape(label) for label in FINANCIAL_LABELS.values()), re.IGNORECASE
+    )
+
+    @staticmethod
+    def read_year(filepath, year):
+        """Return (sheet name, header groups, financial info) for a delimited file.
+
+        A delimited file has a single table, so ``year`` only labels the result.
+        """
+        with open(filepath, newline='', encoding='utf-8-sig', errors='replace') as f:
+            text = f.read()
+
+        sep = DelimitedReader._detect_delimiter(filepath, text)
+        current_app.logger.info(f"Reading delimited file with separator {sep!r} for year {year}")
+
+        # Sample the leading rows as strings, padded to a rectangle
+        sample_rows = list(csv.reader(islice(io.StringIO(text), DelimitedReader.SAMPLE_ROWS), delimiter=sep))
+        sample = pd.DataFrame(sample_rows, dtype=object)
+
+        financial_info = DelimitedReader._extract_financial_info(text, sep)
+
+        # Each month belongs to the row it first appears in, so a title
+        # naming one month does not hide the real header row
+        groups = SheetIndex.build(sample).layout(os.path.basename(filepath))['groups']
+        if not groups:
+            return os.path.basename(filepath), [], financial_info
+
+        first_row = groups[0]['header_row'] + 1
+        frame = DelimitedReader._read_columns(
+            text, sep, first_row,
+            {group['name_position'] for group in groups},
+            {col for group in groups for _, col in group['months']}
+        )
+
+        header_groups = []
+        for group in groups:
+            labels = ExcelParser._header_labels(sample.iloc[group['header_row']])
+            body = frame.iloc[group['header_row'] + 1 - first_row:]
+            name_position = group['name_position']
+            header_groups.append((
+                labels[name_position],
+                body[name_position].to_numpy(),
+                [(month_name, labels[col], body[col].to_numpy()) for month_name, col in group['months']]
+            ))
+        return os.path.basename(filepath), header_groups, financial_info
+
+    @staticmethod
+    def sample(filepath, max_rows):
+        """First ``max_rows`` rows as a raw string frame, without reading the rest of the file"""
+        with open(filepath, newline='', encoding='utf-8-sig', errors='replace') as f:
+            lines = list(islice(f, max_rows))
+        sep = DelimitedReader._detect_delimiter(filepath, ''.join(lines))
+        return pd.DataFrame(list(csv.reader(lines, delimiter=sep)), dtype=object)
+
+    @staticmethod
+    def _detect_delimiter(filepath, text):
+        if str(filepath).lower().endswith('.tsv'):
+            return '\t'
+        try:
+            return csv.Sniffer().sniff(text[:64 * 1024], delimiters=DelimitedReader.DELIMITERS).delimiter
+        except csv.Error:
+            return ','
+
+    @staticmethod
+    def _read_columns(text, sep, first_row, name_positions, month_positions):
+        """Read the name and month columns from ``first_row`` on with the C parser"""
+        usecols = sorted({*name_positions, *month_positions})
+        # Widest row; ragged title rows are shorter. Counting separators is
+        # enough unless quoted fields may hide some
+        if '"' in text:
+            width = max((len(row) for row in csv.reader(io.StringIO(text), delimiter=sep)), default=1)
+        else:
+            width = max(line.count(sep) for line in text.splitlines()) + 1 if text else 1
+        width = max(width, usecols[-1] + 1)
+
+        options = dict(
+            sep=sep,
+            header=None,
+            names=list(range(width)),
+            usecols=usecols,
+            skiprows=first_row,
+            engine='c',
+            # Exports often keep the sheet's number format: "1,000"
+            thousands=',',
+            skip_blank_lines=False,
+        )
+        # A month column that is another group's name column stays text
+        name_dtypes = {position: object for position in name_positions}
+        amount_dtypes = {position: 'float64' for position in month_positions if position not in name_positions}
+        try:
+            return pd.read_csv(io.StringIO(text), dtype={**name_dtypes, **amount_dtypes}, **options)
+        except ValueError:
+            # Non-numeric amounts ("-", "N/A"...); read as text and let the
+            # parser coerce them, once thousands separators are dropped
+            frame = pd.read_csv(io.StringIO(text), dtype=object, **options)
+            for position in amount_dtypes:
+                frame[position] = frame[position].str.replace(DelimitedReader.THOUSANDS_PATTERN, '', regex=True)
+            return frame
+
+    @staticmethod
+    def _extract_financial_info(text, sep):
+        """Find financial label lines anywhere in the file; the last label wins"""
+        financial_info = {key: None for key in FINANCIAL_LABELS}
+        for match in DelimitedReader.FINANCIAL_LINE_PATTERN.finditer(text):
+            line_start = text.rfind('\n', 0, match.start()) + 1
+            line_end = text.find('\n', match.end())
+            line = text[line_start:line_end if line_end != -1 else len(text)]
+            row = next(csv.reader([line], delimiter=sep), [])
+
+            labels = SheetIndex.row_labels(row)
+            for key in FINANCIAL_LABELS:
+                if labels[key] is not None:
+                    value = row[1] if len(row) > 1 and row[1].strip() != '' else None
+                    if value is not None:
+                        value = DelimitedReader.THOUSANDS_PATTERN.sub('', value)
+                    financial_info[key] = ExcelParser._coerce_numeric_value(value)
+        return financial_info
@@ -1,21 +1,268 @@
 # app/services/excel_parser.py
+import os
+import re
+import time
+import numpy as np
 import pandas as pd
 import calendar
+from contextlib import contextmanager
 from datetime import datetime
 from flask import current_app
+from openpyxl import load_workbook
+
+from app.services.contribution_table import ContributionTable
+from app.services.parse_cache import ParseCache, parse_cache
+from app.services.layout_cache import layout_cache
+from app.services.upload_store import upload_store
+
+MONTH_NAMES = [calendar.month_name[m].casefold() for m in range(1, 13)]
+
+FINANCIAL_LABELS = {
+    'money_dispensed': 'money dispensed',
+    'total_book_balance': 'total book balance',
+}
+
+# Cell text pandas' readers turn into NaN (read_excel's default na_values);
+# readers that see raw cell text apply it themselves so every engine agrees
+NA_MARKERS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+# A four-digit year in a sheet name
+SHEET_YEAR_PATTERN = re.compile(r'(?<!\d)(?:19|20)\d{2}(?!\d)')
+
+# One pattern for every label the parser looks for; the named group that
+# matched tells us what kind of cell it is
+LABEL_PATTERN = re.compile(
+    '(?P<month>' + '|'.join(MONTH_NAMES) + ')'
+    '|(?P<name>name)'
+    + ''.join(f'|(?P<{key}>{re.escape(label)})' for key, label in FINANCIAL_LABELS.items())
+)
+
+
+class SheetIndex:
+    """Coordinates of the labels found in a raw (header=None) sheet.
+    
+    Built by a single vectorized scan so that header, name-column and
+    financial-label lookups do not rescan the sheet.
+    """
+    
+    # Rows below a header checked for "name" cells when a cached layout is replayed
+    NAME_BAND_ROWS = 50
+    
+    def __init__(self, months, name_cells, financial_cells):
+        # {'january': (row, col)} - first occurrence in row-major order
+        self.months = months
+        # (rows, cols) arrays of cells containing "name", row-major order
+        self.name_cells = name_cells
+        # {'money_dispensed': [(row, col), ...]} in row-major order
+        self.financial_cells = financial_cells
+    
+    @classmethod
+    def build(cls, raw_df):
+        """Scan the string cells of ``raw_df`` once with LABEL_PATTERN"""
+        empty = cls({}, (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)),
+                    {key: [] for key in FINANCIAL_LABELS})
+        
+        # Only text-typed columns can hold labels
+        positions = np.flatnonzero([pd.api.types.is_string_dtype(dtype) for dtype in raw_df.dtypes])
+        if positions.size == 0 or raw_df.empty:
+            return empty
+        
+        cells = pd.Series(raw_df.iloc[:, positions].to_numpy(dtype=object).ravel())
+        try:
+            # Non-string cells become NaN under the .str accessor
+            text = cells.str.casefold().dropna()
+        except AttributeError:
+            # No string cells at all
+            return empty
+        
+        matches = text.str.extractall(LABEL_PATTERN) if not text.empty else None
+        if matches is None or matches.empty:
+            return empty
+        
+        flat = matches.index.get_level_values(0).to_numpy()
+        rows = flat // positions.size
+        cols = positions[flat % positions.size]
+        
+        months = {}
+        month_hits = matches['month'].notna().to_numpy()
+        for month, row, col in zip(matches['month'].to_numpy()[month_hits], rows[month_hits], cols[month_hits]):
+            months.setdefault(month, (int(row), int(col)))
+        
+        name_hits = matches['name'].notna().to_numpy()
+        name_cells = (rows[name_hits], cols[name_hits])
+        
+        financial_cells = {}
+        claimed = set()
+        for key in FINANCIAL_LABELS:
+            hits = matches[key].notna().to_numpy()
+            # A cell is only counted under the first label it contains
+            financial_cells[key] = [
+                (int(row), int(col)) for position, row, col in zip(flat[hits], rows[hits], cols[hits])
+                if position not in claimed
+            ]
+            claimed.update(flat[hits].tolist())
+        
+        return cls(months, name_cells, financial_cells)
+    
+    @staticmethod
+    def row_labels(row):
+        """Match LABEL_PATTERN against the string cells of one row of values.
+        
+        Returns {'months': {month: first position}, 'name': [positions],
+        <financial key>: first position or None}.
+        """
+        labels = {'months': {}, 'name': [], **{key: None for key in FINANCIAL_LABELS}}
+        for position, value in enumerate(row):
+            if not isinstance(value, str):
+                continue
+            
+            kinds = {}
+            for match in LABEL_PATTERN.finditer(value.casefold()):
+                kinds.setdefault(match.lastgroup, match.group())
+            
+            if 'month' in kinds:
+                labels['months'].setdefault(kinds['month'], position)
+            if 'name' in kinds:
+                labels['name'].append(position)
+            # A cell is only counted under the first label it contains
+            for key in FINANCIAL_LABELS:
+                if key in kinds:
+                    if labels[key] is None:
+                        labels[key] = position
+                    break
+        return labels
+    
+    def month_header(self, month_name):
+        """Return (row, col) of the first cell naming the month, or None"""
+        return self.months.get(month_name.casefold())
+    
+    def name_column(self, header_row):
+        """Position of the first column with a "name" cell below the header row"""
+        rows, cols = self.name_cells
+        below = cols[rows > header_row]
+        return int(below.min()) if below.size else 0
+    
+    def name_cell(self, header_row):
+        """(row, col) of the first "name" cell in the name column, or None"""
+        rows, cols = self.name_cells
+        hits = np.flatnonzero((rows > header_row) & (cols == self.name_column(header_row)))
+        return (int(rows[hits[0]]), int(cols[hits[0]])) if hits.size else None
+    
+    def layout(self, sheet):
+        """Describe the detected layout so it can be cached and replayed.
+        
+        Month headers are grouped by the row they sit in (normally all
+        twelve share one header row); the last cell of each financial label
+        is the one whose value is used.
+        """
+        header_rows = {}
+        for month in range(1, 13):
+            month_header = self.month_header(calendar.month_name[month])
+            if month_header is not None:
+                header_row, month_position = month_header
+                header_rows.setdefault(header_row, []).append((calendar.month_name[month], month_position))
+        
+        return {
+            'sheet': sheet,
+            'groups': [
+                {
+                    'header_row': header_row,
+                    'name_position': self.name_column(header_row),
+                    'name_cell': self.name_cell(header_row),
+                    'months': month_columns,
+                }
+                for header_row, month_columns in sorted(header_rows.items())
+            ],
+            'financial_cells': {key: cells[-1] if cells else None for key, cells in self.financial_cells.items()},
+        }
+    
+    @staticmethod
+    def financial_labels(row):
+        """{financial key: first position} for the financial labels in one row of values"""
+        found = {}
+        for position, value in enumerate(row):
+            if not isinstance(value, str):
+                continue
+            text = value.casefold()
+            # A cell is only counted under the first label it contains
+            for key, label in FINANCIAL_LABELS.items():
+                if label in text:
+                    found.setdefault(key, position)
+                    break
+        return found
+    
+    @staticmethod
+    def find_financial_cells(raw_df):
+        """{key: (row, col) of the last row holding its label, or None}.
+        
+        Financial labels can sit on any row and the last one wins, so a
+        replayed layout cannot trust the cells recorded earlier: a label row
+        added below them would be missed. Only the text cells of text
+        columns are checked, a fraction of the cost of a full build.
+        """
+        cells = {key: None for key in FINANCIAL_LABELS}
+        positions = np.flatnonzero([pd.api.types.is_string_dtype(dtype) for dtype in raw_df.dtypes])
+        if positions.size == 0:
+            return cells
+        for row, values in enumerate(raw_df.iloc[:, positions].to_numpy(dtype=object)):
+            for key, position in SheetIndex.financial_labels(values).items():
+                cells[key] = (row, int(positions[position]))
+        return cells
+    
+    @staticmethod
+    def expected_labels(layout):
+        """(row, col, label) for every header and name cell a layout relies on"""
+        for group in layout['groups']:
+            for month_name, position in group['months']:
+                yield group['header_row'], position, month_name.casefold()
+            if group['name_cell'] is not None:
+                yield (*group['name_cell'], 'name')
+    
+    @staticmethod
+    def cell_has_label(value, label):
+        return isinstance(value, str) and label in value.casefold()
+    
+    @staticmethod
+    def is_complete(layout):
+        """Whether a layout may be cached and replayed.
+        
+        It needs month columns and every financial label: a label that was
+        missing may since have been added anywhere in the sheet, which only
+        a full scan would find.
+        """
+        return bool(layout['groups']) and all(cell is not None for cell in layout['financial_cells'].values())
+    
+    @staticmethod
+    def has_new_months(layout, header_values):
+        """Whether a header row names a month the layout has no column for"""
+        known = {month_name.casefold() for group in layout['groups'] for month_name, _ in group['months']}
+        return not set(SheetIndex.row_labels(header_values)['months']) <= known
+    
+    @staticmethod
+    def name_band_matches(group, band_rows):
+        """Whether the rows just below a group's header agree with its name column.
+        
+        A "name" cell there, left of the recorded name column or where none
+        was recorded, would move the name column on a fresh scan.
+        """
+        positions = [position for row in band_rows for position in SheetIndex.row_labels(row)['name']]
+        if not positions:
+            return True
+        return group['name_cell'] is not None and min(positions) == group['name_position']
+
 
 class ExcelParser:
     @staticmethod
     def find_month_row(df, month_name):
-        """Scan through the dataframe to find the row containing month names"""
-        for i, row in df.iterrows():
-            for cell in row:
-                if pd.notna(cell) and month_name.lower() in str(cell).lower():
-                    return i
-        return None
+        """Find the first row containing the given month name"""
+        header = SheetIndex.build(df).month_header(month_name)
+        return df.index[header[0]] if header else None
 
     @staticmethod
-    def parse_excel(filepath, year=None, month=None):
+    def parse_excel(filepath, year=None, month=None, engine=None):
         """Parse the Excel file and return data for specified month/year"""
         # Use current month/year if not specified
         if year is None:
@@ -23,63 +270,412 @@ class ExcelParser:
         if month is None:
             month = datetime.now().month
         
-        month_name = calendar.month_name[month]
+        year_data = ExcelParser.parse_year(filepath, year, engine=engine)
+        return ExcelParser.month_slice(year_data, month)
+    
+    @staticmethod
+    def preview(filepath, year=None, month=None, max_rows=None):
+        """Describe a workbook's structure from the first rows of its sheets.
         
-        # Read all sheets
-        all_sheets = pd.read_excel(filepath, sheet_name=None, header=None)
+        Only the sheet list and the first ``max_rows`` (PREVIEW_ROWS) rows of
+        the year sheet and other year-named sheets are read, stopping once
+        PREVIEW_TIME_BUDGET_MS is spent. Returns the detected year sheets and,
+        per sampled sheet, the header row (1-based), name column and months,
+        plus ``errors`` that would make parse_excel fail for ``year``/``month``.
+        """
+        started = time.perf_counter()
+        config = current_app.config
+        max_rows = max_rows or config.get('PREVIEW_ROWS', 50)
+        budget = config.get('PREVIEW_TIME_BUDGET_MS', 500) / 1000
+        max_sheets = config.get('PREVIEW_MAX_SHEETS', 24)
         
-        # Find the right sheet
-        year_sheet = ExcelParser._find_year_sheet(all_sheets, year)
+        with ExcelParser._sheet_sampler(filepath, max_rows) as (sheet_names, sample):
+            year_sheets = {}
+            for sheet_name in sheet_names:
+                match = SHEET_YEAR_PATTERN.search(str(sheet_name))
+                if match:
+                    year_sheets.setdefault(match.group(), sheet_name)
+            
+            selected = ExcelParser._find_year_sheet(sheet_names, year) if year else None
+            candidates = [selected] if selected else []
+            candidates += [sheet_name for sheet_name in year_sheets.values() if sheet_name != selected]
+            
+            sheets = []
+            for sheet_name in candidates[:max_sheets]:
+                # The selected sheet is always sampled; the rest fit the budget
+                if sheets and time.perf_counter() - started > budget:
+                    break
+                sheets.append(ExcelParser._sheet_structure(sample(sheet_name), sheet_name))
         
-        if not year_sheet:
-            available_sheets = list(all_sheets.keys())
-            raise ValueError(f"No sheet found for year {year}. Available sheets: {available_sheets}")
+        errors = []
+        delimited = str(filepath).lower().endswith(('.csv', '.tsv'))
+        structure = sheets[0] if selected else None
+        if month and not 1 <= month <= 12:
+            errors.append(f"Invalid month: {month}")
+            month = None
+        if year and selected is None:
+            errors.append(f"No sheet found for year {year}. Available sheets: {list(sheet_names)}")
+        elif year and not delimited and str(year) not in str(selected):
+            # A delimited file is a single table, so only workbooks name their years
+            errors.append(f"No sheet is named for year {year}; the parser would use sheet '{selected}'")
+        if structure is not None:
+            if not structure['months']:
+                errors.append(f"No month header found in the first {max_rows} rows of sheet '{selected}'")
+            elif month and calendar.month_name[month] not in structure['months']:
+                errors.append(f"Sheet '{selected}' has no column for {calendar.month_name[month]}")
         
-        current_app.logger.info(f"Using sheet: {year_sheet} for year {year}")
+        return {
+            'filename': os.path.basename(str(filepath)),
+            'sheets': list(sheet_names),
+            'year_sheets': year_sheets,
+            'year': year,
+            'month': calendar.month_name[month] if month else None,
+            'selected_sheet': selected,
+            'structure': structure,
+            'sampled_sheets': sheets,
+            'valid': not errors,
+            'errors': errors,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+    
+    @staticmethod
+    @contextmanager
+    def _sheet_sampler(filepath, max_rows):
+        """Yield (sheet names, function returning a sheet's first rows as a raw frame)"""
+        extension = os.path.splitext(str(filepath))[1].lower()
+        if extension in ('.csv', '.tsv'):
+            from app.services.delimited_reader import DelimitedReader
+            rows = DelimitedReader.sample(filepath, max_rows)
+            yield [os.path.basename(str(filepath))], lambda sheet_name: rows
+        elif extension in ('.xlsx', '.xlsm'):
+            # Read-only rows stop decompressing the sheet after max_rows
+            workbook = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+            try:
+                yield workbook.sheetnames, lambda sheet_name: pd.DataFrame(
+                    list(workbook[sheet_name].iter_rows(max_row=max_rows, values_only=True)), dtype=object
+                )
+            finally:
+                workbook.close()
+        else:
+            with pd.ExcelFile(filepath) as workbook:
+                yield workbook.sheet_names, lambda sheet_name: workbook.parse(sheet_name, header=None, nrows=max_rows)
+    
+    @staticmethod
+    def _sheet_structure(raw_df, sheet_name):
+        """Header row, name column, months and financial labels found in a sheet sample"""
+        layout = SheetIndex.build(raw_df).layout(sheet_name)
+        structure = {
+            'sheet': sheet_name,
+            'header_row': None,
+            'name_column': None,
+            'months': [],
+            'financial_labels': [key for key, cell in layout['financial_cells'].items() if cell is not None],
+        }
+        if layout['groups']:
+            group = layout['groups'][0]
+            labels = ExcelParser._header_labels(raw_df.iloc[group['header_row']])
+            structure.update({
+                'header_row': group['header_row'] + 1,
+                'name_column': str(labels[group['name_position']]) if group['name_position'] < len(labels) else None,
+                'months': [month_name for month_name, _ in group['months']],
+            })
+        return structure
+    
+    @staticmethod
+    def parse_year(filepath, year=None, engine=None):
+        """Parse every month column of the year sheet from a single load.
         
-        # Get the raw sheet data
-        raw_df = all_sheets[year_sheet]
+        Returns a dict with a long-format ``contributions`` table
+        (member, month, amount - amount is NaN for unpaid months), per-month
+        ``months`` metadata with a ContributionTable and summary stats, and
+        the sheet's financial info.
         
-        # Extract financial info
-        financial_info = ExcelParser._extract_financial_info(raw_df)
+        ``engine`` names a registered spreadsheet engine ('calamine',
+        'openpyxl', 'openpyxl-readonly' (alias 'streaming'), 'xlrd', 'csv'
+        or 'pandas'). By default PARSE_ENGINE is used if set, otherwise the
+        fastest installed engine for the file type; engines whose
+        dependencies are missing fall back to the next candidate.
+        """
+        if year is None:
+            year = datetime.now().year
         
-        # Find the row containing month names
-        month_row = ExcelParser.find_month_row(raw_df, month_name)
-        if month_row is None:
-            raise ValueError(f"No row found containing month {month_name}")
+        year_sheet, header_groups, financial_info = ExcelParser.read_year(filepath, year, engine=engine)
+        return ExcelParser._build_year_data(year, year_sheet, header_groups, financial_info)
+    
+    @staticmethod
+    def read_year(filepath, year, engine=None):
+        """Return the raw (sheet name, header groups, financial info) of the year sheet.
         
-        # Read with proper header
-        df = pd.read_excel(filepath, sheet_name=year_sheet, header=month_row)
+        This is the file-reading half of parse_year; its result is plain
+        arrays, so it can run in a parse worker and be rebuilt by the caller.
+        """
+        from app.services.spreadsheet_engines import engine_registry
         
-        # Find month column
-        month_col = ExcelParser._find_month_column(df, month_name)
+        if engine is None:
+            engine = current_app.config.get('PARSE_ENGINE')
         
-        # Find name column
-        name_col = ExcelParser._find_name_column(df)
+        candidates = engine_registry.candidates(filepath)
+        if engine is not None:
+            requested = engine_registry.get(engine)
+            if requested.is_available():
+                candidates = [requested] + [c for c in candidates if c is not requested]
+            else:
+                current_app.logger.warning(f"Parse engine {requested.name} is not installed; selecting automatically")
+        if not candidates:
+            candidates = [engine_registry.get('pandas')]
         
-        # Clean and process data
-        df = df[[name_col, month_col]].dropna(subset=[name_col])
-        df = df[df[name_col].astype(str).str.strip() != '']
-        df = df[~df[name_col].str.lower().str.contains('total')]
+        for position, candidate in enumerate(candidates):
+            try:
+                current_app.logger.debug(f"Parsing {os.path.basename(str(filepath))} with engine {candidate.name}")
+                year_sheet, header_groups, financial_info = candidate.read_year(filepath, year)
+                break
+            except ImportError as e:
+                if position == len(candidates) - 1:
+                    raise
+                current_app.logger.warning(f"Parse engine {candidate.name} unavailable ({str(e)}); trying next engine")
         
-        # Convert amounts to numeric
-        df[month_col] = pd.to_numeric(df[month_col], errors='coerce')
+        return year_sheet, header_groups, financial_info
+    
+    @staticmethod
+    def parse_grid(rows, sheet_name, year, month):
+        """parse_excel for a sheet already in memory as a list of row lists.
+        
+        Used for Google Sheets imports: the fetched cell values go straight
+        to header detection and extraction, with no workbook written or
+        decoded in between. Empty strings are treated as empty cells.
+        """
+        year_sheet, header_groups, financial_info = ExcelParser.read_grid(rows, sheet_name, year)
+        return ExcelParser.month_slice(
+            ExcelParser._build_year_data(year, year_sheet, header_groups, financial_info), month
+        )
+    
+    @staticmethod
+    def read_grid(rows, sheet_name, year):
+        """read_year for an in-memory grid: (sheet name, header groups, financial info)"""
+        raw_df = pd.DataFrame(rows, dtype=object)
+        raw_df = raw_df.where(raw_df.notna() & (raw_df != ''), np.nan)
+        # Grids get their own layout keys, apart from workbooks with the same sheet names
+        layout_key = layout_cache.fingerprint(f"{sheet_name}.grid", [sheet_name], year)
+        
+        header_groups, financial_info = ExcelParser._extract_sheet(raw_df, sheet_name, layout_key)
+        return sheet_name, header_groups, financial_info
+    
+    @staticmethod
+    def _extract_sheet(raw_df, year_sheet, layout_key):
+        """Return (header groups, financial info) for a raw sheet.
         
-        # Calculate summary stats
-        summary_stats = ExcelParser._calculate_summary_stats(df, month_col, name_col)
+        A cached layout for ``layout_key`` is replayed when every label it
+        relies on is still in place; otherwise the sheet is scanned and the
+        detected layout cached for the next upload. The financial labels of
+        a replayed layout are always looked up again.
+        """
+        layout = layout_cache.get(layout_key)
+        if layout is not None:
+            layout = {**layout, 'financial_cells': SheetIndex.find_financial_cells(raw_df)}
+        if layout is not None and not ExcelParser._layout_matches(raw_df, layout):
+            current_app.logger.info(f"Cached layout no longer matches sheet {year_sheet}; detecting columns")
+            layout_cache.invalidate(layout_key)
+            layout = None
+        
+        if layout is None:
+            # Locate every label we need in one scan of the raw sheet
+            layout = SheetIndex.build(raw_df).layout(year_sheet)
+            if SheetIndex.is_complete(layout):
+                layout_cache.put(layout_key, layout)
+        
+        return ExcelParser._extract_header_groups(raw_df, layout), ExcelParser._extract_financial_info(raw_df, layout)
+    
+    @staticmethod
+    def _layout_matches(raw_df, layout):
+        """Whether a cached layout still describes the sheet.
+        
+        Every financial label must be found, every header and name cell it
+        relies on must still be where it was, its header rows must not name
+        a month added since, and the rows just below each header must not
+        hold a new "name" cell. Label cells the layout never found are not
+        among the cells it records, so these rows are rescanned rather than
+        trusted.
+        """
+        if not SheetIndex.is_complete(layout):
+            return False
+        rows, cols = raw_df.shape
+        for row, col, label in SheetIndex.expected_labels(layout):
+            if row >= rows or col >= cols or not SheetIndex.cell_has_label(raw_df.iat[row, col], label):
+                return False
+        for group in layout['groups']:
+            header_row = group['header_row']
+            if SheetIndex.has_new_months(layout, raw_df.iloc[header_row].tolist()):
+                return False
+            band = raw_df.iloc[header_row + 1:header_row + 1 + SheetIndex.NAME_BAND_ROWS]
+            if not SheetIndex.name_band_matches(group, band.itertuples(index=False)):
+                return False
+        return True
+    
+    @staticmethod
+    def _extract_header_groups(raw_df, layout):
+        """Return [(name_col, names, [(month_name, month_col, values), ...])] per header row"""
+        header_groups = []
+        for group in layout['groups']:
+            header_row = group['header_row']
+            name_position = group['name_position']
+            # Only the name and month columns below the header are read
+            labels = ExcelParser._header_labels(raw_df.iloc[header_row])
+            body = raw_df.iloc[header_row + 1:]
+            header_groups.append((
+                labels[name_position],
+                body.iloc[:, name_position].to_numpy(),
+                [(month_name, labels[position], body.iloc[:, position].to_numpy())
+                 for month_name, position in group['months']]
+            ))
+        return header_groups
+    
+    @staticmethod
+    def _build_year_data(year, year_sheet, header_groups, financial_info):
+        """Clean the extracted columns and assemble the parse_year result"""
+        tables = []
+        months = {}
+        offset = 0
+        for name_col, name_values, month_columns in header_groups:
+            # Clean member names once for every month under this header
+            names = pd.Series(name_values, dtype=object)
+            text = names.astype(str)
+            keep = (names.notna() & (text.str.strip() != '') & ~text.str.lower().str.contains('total')).to_numpy()
+            codes, categories = pd.factorize(names.to_numpy()[keep], use_na_sentinel=False)
+            categories = np.asarray(categories, dtype=object)
+            
+            # Convert amounts to numeric, one contiguous row per month
+            month_names = [month_name for month_name, _, _ in month_columns]
+            amounts = np.vstack([
+                pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)[keep]
+                for _, _, values in month_columns
+            ]) if month_columns else np.empty((0, len(codes)))
+            
+            for i, (month_name, month_col, _) in enumerate(month_columns):
+                # Every month shares the name codes; amounts are a row view
+                table = ContributionTable(codes, categories, amounts[i], name_col, month_col)
+                months[month_name] = {
+                    'name_col': name_col,
+                    'month_col': month_col,
+                    'table': table,
+                    'rows': (offset + i * len(codes), offset + (i + 1) * len(codes)),
+                    **table.summary_stats()
+                }
+            
+            # Long format, month-major so each month is a contiguous slice
+            tables.append(pd.DataFrame({
+                'member': pd.Categorical.from_codes(np.tile(codes, len(month_columns)), categories=pd.Index(categories, dtype=object)),
+                'month': np.repeat(month_names, len(codes)),
+                'amount': amounts.ravel(),
+            }))
+            offset += len(codes) * len(month_columns)
+        
+        if tables:
+            contributions = pd.concat(tables, ignore_index=True)
+        else:
+            contributions = pd.DataFrame({'member': [], 'month': [], 'amount': np.empty(0)})
+        contributions['month'] = pd.Categorical(
+            contributions['month'],
+            categories=[calendar.month_name[m] for m in range(1, 13) if calendar.month_name[m] in months]
+        )
         
         return {
-            'data': df,
-            'month': month_name,
             'year': year,
-            'name_col': name_col,
-            'month_col': month_col,
-            **summary_stats,
+            'sheet': year_sheet,
+            'contributions': contributions,
+            'months': months,
             **financial_info
         }
     
     @staticmethod
-    def _find_year_sheet(all_sheets, year):
+    def month_slice(year_data, month):
+        """Build the per-month parse_excel result from parse_year output"""
+        month_name = calendar.month_name[month]
+        info = year_data['months'].get(month_name)
+        if info is None:
+            raise ValueError(f"No row found containing month {month_name}")
+        
+        return {
+            'data': info['table'],
+            'month': month_name,
+            'year': year_data['year'],
+            'name_col': info['name_col'],
+            'month_col': info['month_col'],
+            'total_contributions': info['total_contributions'],
+            'num_contributors': info['num_contributors'],
+            'num_missing': info['num_missing'],
+            'defaulters': list(info['defaulters']),
+            'money_dispensed': year_data.get('money_dispensed'),
+            'total_book_balance': year_data.get('total_book_balance')
+        }
+    
+    @staticmethod
+    def _load_year_sheet(filepath, year, engine=None):
+        """Return (sheet name, raw header=None frame, layout key) for the year, via the parse cache.
+        
+        ``engine`` is passed to ``pd.ExcelFile``; None lets pandas choose.
+        xlsx sheets are cached per worksheet fingerprint, so a sheet is only
+        decoded again when its own zip member (or the shared string table)
+        changed; other files are cached per whole-file digest.
+        """
+        fingerprints = parse_cache.sheet_fingerprints(filepath)
+        if fingerprints is not None:
+            sheet_names = list(fingerprints)
+            year_sheet, layout_key = ExcelParser._year_sheet(filepath, sheet_names, year)
+            
+            raw_df = parse_cache.get(fingerprints[year_sheet], year_sheet)
+            if raw_df is not None:
+                current_app.logger.info(f"Using cached sheet: {year_sheet} for year {year}")
+                return year_sheet, raw_df, layout_key
+            
+            current_app.logger.info(f"Using sheet: {year_sheet} for year {year}")
+            raw_df = pd.read_excel(filepath, sheet_name=year_sheet, header=None, engine=engine)
+            parse_cache.put(fingerprints[year_sheet], year_sheet, raw_df)
+            return year_sheet, raw_df, layout_key
+        
+        # Stored uploads are named by their digest; hash anything else
+        digest = upload_store.digest_of(filepath) or parse_cache.file_digest(filepath)
+        
+        sheet_names = parse_cache.get(digest, ParseCache.SHEET_LIST)
+        if sheet_names is not None:
+            year_sheet, layout_key = ExcelParser._year_sheet(filepath, sheet_names, year)
+            
+            raw_df = parse_cache.get(digest, year_sheet)
+            if raw_df is not None:
+                current_app.logger.info(f"Using cached sheet: {year_sheet} for year {year}")
+                return year_sheet, raw_df, layout_key
+        
+        # Open the workbook once; sheet names come from the workbook index
+        # without decoding any worksheet
+        with pd.ExcelFile(filepath, engine=engine) as workbook:
+            sheet_names = workbook.sheet_names
+            parse_cache.put(digest, ParseCache.SHEET_LIST, sheet_names)
+            
+            # Find the right sheet
+            year_sheet, layout_key = ExcelParser._year_sheet(filepath, sheet_names, year)
+            
+            current_app.logger.info(f"Using sheet: {year_sheet} for year {year}")
+            
+            # Decode only the year sheet
+            raw_df = workbook.parse(year_sheet, header=None)
+        
+        parse_cache.put(digest, year_sheet, raw_df)
+        return year_sheet, raw_df, layout_key
+    
+    @staticmethod
+    def _year_sheet(filepath, sheet_names, year):
+        """Return (year sheet, layout key); a cached layout names the sheet directly"""
+        layout_key = layout_cache.fingerprint(filepath, sheet_names, year)
+        layout = layout_cache.peek(layout_key)
+        if layout is not None and layout['sheet'] in sheet_names:
+            return layout['sheet'], layout_key
+        
+        year_sheet = ExcelParser._find_year_sheet(sheet_names, year)
+        if not year_sheet:
+            raise ValueError(f"No sheet found for year {year}. Available sheets: {sheet_names}")
+        return year_sheet, layout_key
+    
+    @staticmethod
+    def _find_year_sheet(sheet_names, year):
         """Find the appropriate sheet for the given year"""
         possible_sheet_names = [
             str(year),
@@ -89,80 +685,66 @@ class ExcelParser:
             f"{year} Contributions",
         ]
         
-        for sheet_name in all_sheets:
+        for sheet_name in sheet_names:
             if str(year) in sheet_name:
                 return sheet_name
         
         # Check for common patterns
-        for sheet_name in all_sheets:
+        for sheet_name in sheet_names:
             sheet_lower = sheet_name.lower()
             if any(pattern.lower() in sheet_lower for pattern in ['data', 'contributions']):
                 return sheet_name
         
         # Return first sheet if none found
-        if all_sheets:
-            return list(all_sheets.keys())[0]
+        if sheet_names:
+            return list(sheet_names)[0]
         
         return None
     
     @staticmethod
-    def _extract_financial_info(raw_df):
+    def _header_labels(values):
+        """Column labels pandas would derive from a header row of cell values"""
+        columns = []
+        seen = {}
+        for position, value in enumerate(values):
+            if pd.isna(value) or value == '':
+                label = f"Unnamed: {position}"
+            elif isinstance(value, float) and value.is_integer():
+                label = int(value)
+            else:
+                label = value
+            
+            if label in seen:
+                seen[label] += 1
+                label = f"{label}.{seen[label]}"
+            seen.setdefault(label, 0)
+            columns.append(label)
+        return columns
+    
+    @staticmethod
+    def _extract_financial_info(raw_df, layout):
         """Extract money dispensed and total book balance from raw dataframe"""
-        money_dispensed = None
-        total_book_balance = None
-        
-        for i, row in raw_df.iterrows():
-            for cell in row:
-                if pd.notna(cell) and isinstance(cell, str):
-                    cell_lower = cell.lower()
-                    if "money dispensed" in cell_lower:
-                        money_dispensed = ExcelParser._extract_numeric_value(raw_df, i, 1)
-                    elif "total book balance" in cell_lower:
-                        total_book_balance = ExcelParser._extract_numeric_value(raw_df, i, 1)
-        
-        return {
-            'money_dispensed': money_dispensed,
-            'total_book_balance': total_book_balance
-        }
+        financial_info = {}
+        for key, cell in layout['financial_cells'].items():
+            # The value sits in the second column of the label's row
+            financial_info[key] = ExcelParser._extract_numeric_value(raw_df, cell[0], 1) if cell else None
+        return financial_info
     
     @staticmethod
     def _extract_numeric_value(df, row_index, col_index):
         """Extract numeric value from specific cell"""
+        if col_index >= df.shape[1]:
+            return None
+        return ExcelParser._coerce_numeric_value(df.iloc[row_index, col_index])
+    
+    @staticmethod
+    def _coerce_numeric_value(value):
+        """Return a cell value as float, or as-is if it is not numeric"""
+        if isinstance(value, str) and value in NA_MARKERS:
+            return None
         try:
-            value = df.iloc[row_index, col_index]
             if pd.notna(value):
                 return float(value)
         except (ValueError, TypeError):
-            value = df.iloc[row_index, col_index]
             return value if pd.notna(value) else None
         return None
-    
-    @staticmethod
-    def _find_month_column(df, month_name):
-        """Find column containing the specified month"""
-        for col in df.columns:
-            if pd.notna(col) and month_name.lower() in str(col).lower():
-                return col
-        raise ValueError(f"No column found for month {month_name}")
-    
-    @staticmethod
-    def _find_name_column(df):
-        """Find column containing member names"""
-        for col in df.columns:
-            if df[col].dropna().apply(lambda x: isinstance(x, str) and "name" in x.lower()).any():
-                return col
-        return df.columns[0]
-    
-    @staticmethod
-    def _calculate_summary_stats(df, month_col, name_col):
-        """Calculate summary statistics from the dataframe"""
-        total_contributions = float(df[month_col].sum()) if not df[month_col].empty else 0.0
-        num_contributors = int(df[month_col].count()) if not df[month_col].empty else 0
-        num_missing = int(len(df) - num_contributors)
-        
-        return {
-            'total_contributions': total_contributions,
-            'num_contributors': num_contributors,
-            'num_missing': num_missing,
-            'defaulters': df[df[month_col].isna()][name_col].tolist()
-        }
\ No newline at end of file
@@ -1,30 +1,37 @@
 # app/services/file_processor.py
 import os
+import tempfile
 from werkzeug.utils import secure_filename
-from datetime import datetime
 from flask import current_app
 
+from app.services.upload_sniffer import UploadSniffer
+from app.services.upload_store import upload_store
+
 class FileProcessor:
     """Utility class for processing file uploads"""
     
     @staticmethod
     def process_upload(request):
-        """Process file upload from request"""
-        use_google_sheets = request.form.get('input_method') == 'sheets' or request.form.get('use_google_sheets') == 'on'
+        """Process file upload from request
         
-        if use_google_sheets:
-            return FileProcessor._process_google_sheets(request)
-        else:
-            return FileProcessor._process_file_upload(request)
+        Google Sheets imports are parsed in memory by parse_google_sheets
+        and never reach this method.
+        """
+        return FileProcessor._process_file_upload(request)
     
     @staticmethod
-    def _process_google_sheets(request):
-        """Process Google Sheets upload"""
+    def uses_google_sheets(request):
+        """Whether the upload form asked for a Google Sheets import"""
+        return request.form.get('input_method') == 'sheets' or request.form.get('use_google_sheets') == 'on'
+    
+    @staticmethod
+    def parse_google_sheets(request, year, month):
+        """Fetch the year worksheet from Google Sheets and parse its cell grid in memory"""
         from app.services.google_sheets_service import GoogleSheetsService
+        from app.services.excel_parser import ExcelParser
         from app.models.setting import Setting
         
         sheet_url = request.form.get('sheet_url', '')
-        year = request.form.get('year', type=int)
         
         if not sheet_url:
             raise ValueError("Google Sheets URL is required")
@@ -35,52 +42,65 @@ class FileProcessor:
         # Save Google Sheets URL
         Setting.set_value('google_sheets_url', sheet_url)
         
-        # Get data from Google Sheets
         google_sheets_service = GoogleSheetsService()
         google_sheets_service.init_app(current_app)
-        excel_data = google_sheets_service.get_sheet_as_excel(sheet_url, sheet_name=str(year))
+        # Only the header band and the month's columns are downloaded
+        grid = google_sheets_service.get_month_grid(sheet_url, str(year), month)
         
-        if excel_data is None:
+        if grid is None:
             raise ValueError("Failed to fetch data from Google Sheets. Please check the URL and credentials.")
         
-        # Save temporarily
-        filename = f"google_sheet_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+        worksheet_title, rows = grid
+        current_app.logger.info(f"Parsing Google Sheets worksheet {worksheet_title} in memory")
+        return ExcelParser.parse_grid(rows, worksheet_title, year, month)
+    
+    @staticmethod
+    def _process_file_upload(request):
+        """Process file upload from form into the content-addressed upload store"""
+        file, filename = FileProcessor._validated_upload(request)
         
-        with open(filepath, 'wb') as f:
-            f.write(excel_data.getvalue())
+        digest, filepath, created = upload_store.save(file, filename.rsplit('.', 1)[1])
         
-        current_app.logger.info(f"Saved Google Sheets data to: {filepath}")
+        if created:
+            current_app.logger.info(f"Saved uploaded file {filename} to: {filepath}")
+        else:
+            current_app.logger.info(f"Uploaded file {filename} matches stored upload {digest[:12]}")
         return filepath
     
     @staticmethod
-    def _process_file_upload(request):
-        """Process file upload from form"""
-        if 'file' not in request.files:
+    def save_preview_upload(request):
+        """Save an uploaded file to a unique TEMP_FOLDER path for structure preview"""
+        file, filename = FileProcessor._validated_upload(request)
+        
+        temp_folder = current_app.config['TEMP_FOLDER']
+        os.makedirs(temp_folder, exist_ok=True)
+        fd, filepath = tempfile.mkstemp(prefix='preview_', suffix=f".{filename.rsplit('.', 1)[1].lower()}", dir=temp_folder)
+        with os.fdopen(fd, 'wb') as f:
+            file.save(f)
+        return filepath
+    
+    @staticmethod
+    def _validated_upload(request):
+        """Return (file, secure filename) of the form upload, checking its extension and content"""
+        files = request.files
+        # Set when the streaming pre-check aborted form parsing
+        rejection = getattr(request, 'upload_rejection', None)
+        if rejection is not None:
+            raise rejection
+        
+        if 'file' not in files:
             raise ValueError("No file selected")
         
-        file = request.files['file']
+        file = files['file']
         if file.filename == '':
             raise ValueError("No file selected")
         
         # Check file extension
-        allowed_extensions = {'xlsx', 'xls', 'csv'}
+        allowed_extensions = current_app.config.get('ALLOWED_EXTENSIONS', {'xlsx', 'xls', 'csv', 'tsv'})
         filename = secure_filename(file.filename)
         if '.' not in filename or filename.rsplit('.', 1)[1].lower() not in allowed_extensions:
-            raise ValueError("Invalid file type. Please upload Excel (.xlsx, .xls) or CSV files.")
+            raise ValueError("Invalid file type. Please upload Excel (.xlsx, .xls) or CSV/TSV files.")
         
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        current_app.logger.info(f"Saved uploaded file to: {filepath}")
-        return filepath
-    
-    @staticmethod
-    def cleanup_file(filepath):
-        """Clean up temporary file if needed"""
-        if filepath and os.path.exists(filepath) and 'google_sheet' in os.path.basename(filepath):
-            try:
-                os.remove(filepath)
-                current_app.logger.info(f"Cleaned up temporary file: {filepath}")
-            except Exception as e:
-                current_app.logger.error(f"Error cleaning up file {filepath}: {str(e)}")
\ No newline at end of file
+        if isinstance(file.stream, UploadSniffer):
+            file.stream.verify()
+        return file, filename
@@ -1,25 +1,53 @@
 # app/services/google_sheets_service.py
 import os
+import json
+import hashlib
 import gspread
+from gspread.urls import DRIVE_FILES_API_V3_URL
+from gspread.utils import ValueRenderOption, absolute_range_name, rowcol_to_a1
+import calendar
+import numpy as np
 import pandas as pd
 from google.oauth2.service_account import Credentials
 from google.auth.exceptions import GoogleAuthError
 from google.api_core.exceptions import PermissionDenied, NotFound
 from flask import current_app
 import logging
-from io import BytesIO
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from urllib.parse import urlparse
 import re
 import time
-from datetime import datetime
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from cachetools import LRUCache
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
+
+from app.services.sheets_client_pool import sheets_client_pool
+from app.services.sheets_cache import SheetsCache, sheets_cache
+from app.services.sheets_snapshot_store import sheets_snapshots
+from app.services.sheets_scheduler import SheetsRateLimited, sheets_scheduler
+from app.services.sheets_metadata_cache import sheets_metadata
+from app.services.excel_parser import SheetIndex
 
 logger = logging.getLogger(__name__)
 
+
+def _is_retryable_api_error(error):
+    """API errors worth retrying; quota errors (429) would only spend more quota"""
+    return isinstance(error, gspread.exceptions.APIError) and getattr(error, 'code', None) != 429
+
 class GoogleSheetsService:
     _instance = None
     
+    # Sheets whose last fetch time and content hash are remembered
+    MAX_TRACKED_SHEETS = 1024
+    
+    # Non-empty values per column checked before converting it to numbers
+    NUMERIC_SAMPLE_SIZE = 100
+    
+    # Cell text that stands for no amount in an otherwise numeric column
+    NUMERIC_PLACEHOLDERS = ('-',)
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -28,10 +56,14 @@ class GoogleSheetsService:
     
     def __init__(self):
         if not self._initialized:
-            self.cache = {}
-            self.cache_timeout = 300  # 5 minutes cache
-            self._last_update_times = {}
-            self._sheet_hashes = {}
+            # Bounded TTL + LRU cache of fetched frames and grids
+            self.cache = sheets_cache
+            # Single-flight fetches and the read-quota limiter
+            self.scheduler = sheets_scheduler
+            # Per-sheet change tracking, bounded to the most recently used sheets
+            self._tracking_lock = threading.Lock()
+            self._last_update_times = LRUCache(maxsize=self.MAX_TRACKED_SHEETS)
+            self._sheet_hashes = LRUCache(maxsize=self.MAX_TRACKED_SHEETS)
             self._initialized = True
     
     def init_app(self, app):
@@ -64,40 +96,24 @@ class GoogleSheetsService:
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((gspread.exceptions.APIError,))
+        retry=retry_if_exception(_is_retryable_api_error)
     )
     def get_client(self):
-        """Authenticate and return a Google Sheets client with retry logic"""
+        """Return the pooled, authorized Google Sheets client for the configured credentials"""
         try:
-            creds = None
-            
-            creds_info = current_app.config.get('GOOGLE_CREDENTIALS_JSON')
-            if creds_info:
-                import json
-                try:
-                    creds_dict = json.loads(creds_info)
-                    creds = Credentials.from_service_account_info(
-                        creds_dict, 
-                        scopes=self.scopes
-                    )
-                    logger.info("Using credentials from environment variable")
-                except json.JSONDecodeError:
-                    logger.error("Invalid JSON in GOOGLE_CREDENTIALS_JSON")
-            
-            # Fallback to file
-            if not creds and self.credentials_path and os.path.exists(self.credentials_path):
-                creds = Credentials.from_service_account_file(
-                    self.credentials_path, 
-                    scopes=self.scopes
-                )
-                logger.info(f"Using credentials from file: {self.credentials_path}")
-            
-            if not creds:
+            source = self._credentials_source()
+            if source is None:
                 logger.error("Google Sheets credentials not configured")
                 return None
             
-            client = gspread.authorize(creds)
-            return client
+            kind, value = source
+            if kind == 'json':
+                key = 'json:' + hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+            else:
+                stat = os.stat(value)
+                key = f"file:{os.path.abspath(value)}:{stat.st_mtime_ns}:{stat.st_size}"
+            
+            return sheets_client_pool.get_client(key, lambda: self._load_credentials(source))
             
         except GoogleAuthError as e:
             logger.error(f"Google authentication error: {str(e)}")
@@ -106,6 +122,37 @@ class GoogleSheetsService:
             logger.error(f"Unexpected error getting Google Sheets client: {str(e)}")
             return None
     
+    def open_spreadsheet(self, sheet_url: str, client=None):
+        """Open a spreadsheet whose id, title and worksheet list come from the shared metadata cache"""
+        client = client or self.get_client()
+        if not client:
+            return None
+        return sheets_metadata.open(client, sheet_url)
+    
+    def _credentials_source(self):
+        """Return ('json', info dict) or ('file', path) for the configured credentials, or None"""
+        creds_info = current_app.config.get('GOOGLE_CREDENTIALS_JSON')
+        if creds_info:
+            try:
+                return 'json', json.loads(creds_info)
+            except json.JSONDecodeError:
+                logger.error("Invalid JSON in GOOGLE_CREDENTIALS_JSON")
+        
+        # Fallback to file
+        if self.credentials_path and os.path.exists(self.credentials_path):
+            return 'file', self.credentials_path
+        return None
+    
+    def _load_credentials(self, source):
+        """Build service-account credentials; only called when the pool has no client for them"""
+        kind, value = source
+        if kind == 'json':
+            logger.info("Using credentials from environment variable")
+            return Credentials.from_service_account_info(value, scopes=self.scopes)
+        
+        logger.info(f"Using credentials from file: {value}")
+        return Credentials.from_service_account_file(value, scopes=self.scopes)
+    
     def get_sheet_data(self, sheet_url: str, sheet_name: Optional[str] = None, 
                       force_refresh: bool = False) -> Optional[pd.DataFrame]:
         """Get data from Google Sheets with caching"""
@@ -115,52 +162,86 @@ class GoogleSheetsService:
             logger.error(f"Invalid Google Sheets URL: {sheet_url}")
             return None
         
-        # Check cache if not forcing refresh
         cache_key = f"{sheet_url}:{sheet_name}"
-        if not force_refresh and cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            if time.time() - timestamp < self.cache_timeout:
+        return self._cached_fetch(
+            sheet_url, cache_key, force_refresh, lambda: self._fetch_sheet_data(sheet_url, sheet_name, cache_key)
+        )
+    
+    def _cached_fetch(self, sheet_url: str, cache_key: str, force_refresh: bool, fetch):
+        """Serve ``cache_key`` from the in-process cache, then the shared snapshots, then ``fetch()``"""
+        if not force_refresh:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
                 logger.debug(f"Returning cached data for {cache_key}")
-                return cached_data
+                return cached
+            
+            cached = self._from_snapshot(sheet_url, cache_key)
+            if cached is not None:
+                return cached
+        
+        def load():
+            if not force_refresh:
+                cached = self.cache.peek(cache_key)
+                if cached is not None:
+                    return cached
+            return fetch()
+        
+        # One fetch per sheet; concurrent requests wait for it and share its result
+        return self.scheduler.coalesce(cache_key, load)
+    
+    def _from_snapshot(self, sheet_url: str, cache_key: str):
+        """Return the shared snapshot for ``cache_key``, or None to fetch it
+        
+        A snapshot older than GOOGLE_SHEETS_CACHE_TTL is served only if the
+        spreadsheet version it was fetched at is still current.
+        """
+        snapshot = sheets_snapshots.get(cache_key)
+        if snapshot is None:
+            return None
+        
+        value, fetched_at, version = snapshot
+        age = time.time() - fetched_at
+        if age < current_app.config.get('GOOGLE_SHEETS_CACHE_TTL', SheetsCache.DEFAULT_TTL):
+            self.cache.put(cache_key, value)
+            return value
+        
+        # One small Drive request instead of serving data that may have changed
+        if version and self.sheet_version(sheet_url) == version:
+            sheets_snapshots.touch(cache_key)
+            self.cache.put(cache_key, value)
+            logger.debug(f"{cache_key} unchanged at {version}")
+            return value
+        return None
+    
+    def _fetch_sheet_data(self, sheet_url: str, sheet_name: Optional[str], cache_key: str,
+                          opened: Optional[Tuple[Any, list, Optional[str]]] = None) -> Optional[pd.DataFrame]:
+        """Fetch a worksheet as a cleaned DataFrame and cache it
         
+        ``opened`` is (spreadsheet, worksheets, version) already fetched by
+        get_sheets_data, so tabs fetched together share one metadata lookup.
+        """
         client = self.get_client()
         if not client:
             return None
         
         try:
-            # Open the spreadsheet
-            spreadsheet = client.open_by_url(sheet_url)
-            
-            # Get available worksheets
-            worksheets = spreadsheet.worksheets()
-            logger.info(f"Available worksheets: {[ws.title for ws in worksheets]}")
+            if opened is None:
+                # Open the spreadsheet
+                spreadsheet = self.open_spreadsheet(sheet_url, client)
+                
+                # Get available worksheets
+                worksheets = spreadsheet.worksheets()
+                logger.info(f"Available worksheets: {[ws.title for ws in worksheets]}")
+                
+                # Version first, so a change made during the pull is seen next time
+                version = self.sheet_version(sheet_url, client)
+            else:
+                spreadsheet, worksheets, version = opened
             
             # Get the worksheet
-            worksheet = None
-            if sheet_name:
-                try:
-                    worksheet = spreadsheet.worksheet(sheet_name)
-                except gspread.exceptions.WorksheetNotFound:
-                    logger.warning(f"Worksheet '{sheet_name}' not found, trying case-insensitive match")
-                    # Try case-insensitive match
-                    for ws in worksheets:
-                        if sheet_name.lower() in ws.title.lower():
-                            worksheet = ws
-                            logger.info(f"Using worksheet with similar name: {ws.title}")
-                            break
-            
-            # If still no worksheet, use first sheet or sheet1
-            if not worksheet:
-                try:
-                    worksheet = spreadsheet.sheet1
-                    logger.info(f"Using default worksheet: {worksheet.title}")
-                except:
-                    if worksheets:
-                        worksheet = worksheets[0]
-                        logger.info(f"Using first worksheet: {worksheet.title}")
-                    else:
-                        logger.error("No worksheets found in spreadsheet")
-                        return None
+            worksheet = self._resolve_worksheet(spreadsheet, worksheets, sheet_name)
+            if worksheet is None:
+                return None
             
             # Get all values
             data = worksheet.get_all_values()
@@ -176,9 +257,10 @@ class GoogleSheetsService:
                 # Clean data
                 df = self._clean_dataframe(df)
                 
-                # Update cache
-                self.cache[cache_key] = (df, time.time())
-                self._last_update_times[cache_key] = time.time()
+                # Update cache and the snapshot shared with other workers
+                self.cache.put(cache_key, df)
+                sheets_snapshots.put(cache_key, df, version)
+                self._mark_fetched(cache_key, version or self._content_digest(data))
                 
                 logger.info(f"Successfully fetched {len(df)} rows from Google Sheet")
                 return df
@@ -196,41 +278,394 @@ class GoogleSheetsService:
         except gspread.exceptions.APIError as e:
             logger.error(f"Google Sheets API error: {str(e)}")
             return None
+        except SheetsRateLimited as e:
+            logger.warning(f"Google Sheets fetch shed: {str(e)}")
+            return None
         except Exception as e:
             logger.error(f"Error accessing Google Sheet: {str(e)}", exc_info=True)
             return None
     
+    def get_sheets_data(self, sheet_url: str, sheet_names: Optional[List[str]] = None,
+                        force_refresh: bool = False, max_workers: Optional[int] = None,
+                        timeout: Optional[float] = None,
+                        cancel: Optional[threading.Event] = None) -> Dict[str, Optional[pd.DataFrame]]:
+        """Fetch several worksheets (every tab by default) in parallel, keyed by name
+        
+        The spreadsheet is opened once and its tabs are downloaded by at most
+        ``max_workers`` threads (GOOGLE_SHEETS_FETCH_WORKERS by default), each
+        going through the same cache, coalescing and rate limiting as
+        get_sheet_data. Every API call is bounded by GOOGLE_SHEETS_HTTP_TIMEOUT;
+        ``timeout`` bounds the whole batch. Tabs that fail, are still running
+        at the deadline, or had not started when ``cancel`` was set come back
+        as None. Downloads already in progress are left to finish in the
+        background and still fill the cache.
+        """
+        if not self._validate_sheet_url(sheet_url):
+            logger.error(f"Invalid Google Sheets URL: {sheet_url}")
+            return {}
+        
+        client = self.get_client()
+        if not client:
+            return {}
+        
+        try:
+            spreadsheet = self.open_spreadsheet(sheet_url, client)
+            worksheets = spreadsheet.worksheets()
+            version = self.sheet_version(sheet_url, client)
+        except Exception as e:
+            logger.error(f"Error opening Google Sheet {sheet_url}: {str(e)}")
+            return {}
+        
+        if sheet_names is None:
+            sheet_names = [ws.title for ws in worksheets]
+        if not sheet_names:
+            return {}
+        
+        opened = (spreadsheet, worksheets, version)
+        app = current_app._get_current_object()
+        
+        def fetch_one(sheet_name):
+            with app.app_context():
+                if cancel is not None and cancel.is_set():
+                    return None
+                cache_key = f"{sheet_url}:{sheet_name}"
+                return self._cached_fetch(
+                    sheet_url, cache_key, force_refresh,
+                    lambda: self._fetch_sheet_data(sheet_url, sheet_name, cache_key, opened)
+                )
+        
+        workers = max_workers or current_app.config.get('GOOGLE_SHEETS_FETCH_WORKERS', 4)
+        executor = ThreadPoolExecutor(max_workers=min(workers, len(sheet_names)), thread_name_prefix='sheets-fetch')
+        futures = {executor.submit(fetch_one, name): name for name in sheet_names}
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        
+        try:
+            pending = set(futures)
+            while pending and not (cancel is not None and cancel.is_set()):
+                # Wake periodically so a cancel request is noticed promptly
+                wait_for = 0.2 if cancel is not None else None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    wait_for = min(wait_for, remaining) if wait_for is not None else remaining
+                _, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        results, unfinished = {}, []
+        for future, name in futures.items():
+            results[name] = None
+            if not future.done() or future.cancelled():
+                unfinished.append(name)
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching worksheet {name}: {str(e)}")
+        
+        if unfinished:
+            logger.warning(f"Gave up waiting for worksheets {unfinished} of {sheet_url}")
+        return results
+    
+    def _mark_fetched(self, cache_key: str, token: str):
+        """Remember when ``cache_key`` was fetched and the version token it was fetched at"""
+        with self._tracking_lock:
+            self._last_update_times[cache_key] = time.time()
+            self._sheet_hashes[cache_key] = token
+    
+    def sheet_version(self, sheet_url: str, client=None) -> Optional[str]:
+        """Spreadsheet version token from Drive metadata (one small request), or None
+        
+        Drive's file ``version`` increases on every change; ``modifiedTime``
+        is kept alongside it for readability in logs.
+        """
+        sheet_id = self._extract_sheet_id(sheet_url)
+        if not sheet_id:
+            return None
+        
+        client = client or self.get_client()
+        if not client:
+            return None
+        
+        try:
+            response = client.http_client.request(
+                'get',
+                f"{DRIVE_FILES_API_V3_URL}/{sheet_id}",
+                params={'fields': 'version,modifiedTime', 'supportsAllDrives': True}
+            )
+            metadata = response.json()
+        except Exception as e:
+            logger.debug(f"Drive metadata unavailable for {sheet_id}: {str(e)}")
+            return None
+        
+        if not metadata.get('version') and not metadata.get('modifiedTime'):
+            return None
+        return f"drive:{metadata.get('version')}@{metadata.get('modifiedTime')}"
+    
+    @staticmethod
+    def _content_digest(values) -> str:
+        """Stable SHA-256 of worksheet values, for when Drive metadata is unavailable"""
+        payload = json.dumps(values, separators=(',', ':'), default=str)
+        return 'sha256:' + hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _resolve_worksheet(self, spreadsheet, worksheets, sheet_name: Optional[str]):
+        """Return the named worksheet, a case-insensitive match, or the first sheet"""
+        worksheet = None
+        if sheet_name:
+            try:
+                worksheet = spreadsheet.worksheet(sheet_name)
+            except gspread.exceptions.WorksheetNotFound:
+                logger.warning(f"Worksheet '{sheet_name}' not found, trying case-insensitive match")
+                # Try case-insensitive match (against the refreshed list if the lookup refetched it)
+                for ws in spreadsheet.worksheets():
+                    if sheet_name.lower() in ws.title.lower():
+                        worksheet = ws
+                        logger.info(f"Using worksheet with similar name: {ws.title}")
+                        break
+        
+        # If still no worksheet, use first sheet or sheet1
+        if not worksheet:
+            try:
+                worksheet = spreadsheet.sheet1
+                logger.info(f"Using default worksheet: {worksheet.title}")
+            except:
+                if worksheets:
+                    worksheet = worksheets[0]
+                    logger.info(f"Using first worksheet: {worksheet.title}")
+                else:
+                    logger.error("No worksheets found in spreadsheet")
+                    return None
+        return worksheet
+    
+    def get_month_grid(self, sheet_url: str, sheet_name: Optional[str], month: int,
+                       force_refresh: bool = False) -> Optional[Tuple[str, List[List[Any]]]]:
+        """Get the cells a single-month report reads as (worksheet title, rows), with caching
+        
+        Values are fetched unformatted (numbers as numbers, empty cells as
+        ''), with no header row promoted and no type cleaning, so the grid
+        can go straight to ExcelParser.parse_grid.
+        
+        Phase one reads a header band (the first GOOGLE_SHEETS_HEADER_BAND_ROWS
+        rows, every column) and locates the header row, name column and the
+        month's column in it. Phase two fetches just those columns below the
+        band, plus columns A:B where financial labels and their values sit,
+        in one batchGet. The result keeps the full header band, so
+        ExcelParser.parse_grid detects the same layout as for the whole tab;
+        other month columns are simply empty below it. Tabs whose header is
+        not inside the band are fetched whole.
+        """
+        if not self._validate_sheet_url(sheet_url):
+            logger.error(f"Invalid Google Sheets URL: {sheet_url}")
+            return None
+        
+        cache_key = f"{sheet_url}:{sheet_name}#month{month}"
+        return self._cached_fetch(
+            sheet_url, cache_key, force_refresh,
+            lambda: self._fetch_month_grid(sheet_url, sheet_name, month, cache_key)
+        )
+    
+    def _fetch_month_grid(self, sheet_url: str, sheet_name: Optional[str], month: int,
+                          cache_key: str) -> Optional[Tuple[str, List[List[Any]]]]:
+        """Two-phase fetch of the name and month columns; cached like a grid"""
+        client = self.get_client()
+        if not client:
+            return None
+        
+        try:
+            spreadsheet = self.open_spreadsheet(sheet_url, client)
+            worksheets = spreadsheet.worksheets()
+            worksheet = self._resolve_worksheet(spreadsheet, worksheets, sheet_name)
+            if worksheet is None:
+                return None
+            
+            version = self.sheet_version(sheet_url, client)
+            band_rows = current_app.config.get('GOOGLE_SHEETS_HEADER_BAND_ROWS', 30)
+            
+            # Phase one: the header band, every column
+            band = worksheet.get_values(f"1:{band_rows}", value_render_option=ValueRenderOption.unformatted)
+            columns = self._month_columns(band, worksheet.title, month)
+            
+            if columns is None or len(band) < band_rows:
+                # Header not in the band (or the band is the whole tab): read it all
+                rows = worksheet.get_all_values(value_render_option=ValueRenderOption.unformatted)
+            else:
+                # Phase two: only the needed columns below the band
+                ranges = [
+                    absolute_range_name(worksheet.title, f"{letter}{band_rows + 1}:{letter}")
+                    for letter in (rowcol_to_a1(1, col + 1)[:-1] for col in columns)
+                ]
+                fetched = self._batch_get_ranges(
+                    spreadsheet, ranges, ValueRenderOption.unformatted, major_dimension='COLUMNS'
+                )
+                rows = self._assemble_grid(band, dict(zip(columns, (values[0] if values else [] for values in fetched))))
+                logger.info(
+                    f"Fetched {len(columns)} of {max(len(row) for row in band)} columns "
+                    f"below the header band of {worksheet.title}"
+                )
+            
+            grid = (worksheet.title, rows)
+            self.cache.put(cache_key, grid)
+            sheets_snapshots.put(cache_key, grid, version)
+            self._mark_fetched(cache_key, version or self._content_digest(rows))
+            return grid
+            
+        except PermissionDenied as e:
+            logger.error(f"Permission denied accessing Google Sheet: {sheet_url}")
+            logger.error(f"Permission error details: {str(e)}")
+            return None
+        except NotFound as e:
+            logger.error(f"Google Sheet not found: {sheet_url}")
+            return None
+        except gspread.exceptions.APIError as e:
+            logger.error(f"Google Sheets API error: {str(e)}")
+            return None
+        except SheetsRateLimited as e:
+            logger.warning(f"Google Sheets fetch shed: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Error accessing Google Sheet: {str(e)}", exc_info=True)
+            return None
+    
+    @staticmethod
+    def _month_columns(band: List[List[Any]], title: str, month: int) -> Optional[List[int]]:
+        """Zero-based columns to fetch below the band: A, B, the name column and the month column"""
+        if not band:
+            return None
+        
+        raw_df = pd.DataFrame(band, dtype=object)
+        layout = SheetIndex.build(raw_df.where(raw_df != '', np.nan)).layout(title)
+        month_name = calendar.month_name[month]
+        for group in layout['groups']:
+            for name, position in group['months']:
+                if name == month_name:
+                    return sorted({0, 1, group['name_position'], position})
+        return None
+    
+    @staticmethod
+    def _assemble_grid(band: List[List[Any]], columns: Dict[int, List[Any]]) -> List[List[Any]]:
+        """The header band followed by rows holding only the fetched columns"""
+        width = max([len(row) for row in band] + [col + 1 for col in columns])
+        rows = [list(row) + [''] * (width - len(row)) for row in band]
+        height = max((len(values) for values in columns.values()), default=0)
+        for i in range(height):
+            row = [''] * width
+            for col, values in columns.items():
+                if i < len(values):
+                    row[col] = values[i]
+            rows.append(row)
+        return rows
+    
+    def batch_get_values(self, spreadsheet, titles: List[str], max_rows: Optional[int] = None,
+                         value_render_option: Optional[ValueRenderOption] = None) -> Dict[str, List[List[Any]]]:
+        """Fetch several worksheets' values with a single values:batchGet request
+        
+        Returns {title: rows}. ``max_rows`` bounds each range to its leading
+        rows, which is enough to tell whether a tab holds data.
+        """
+        if not titles:
+            return {}
+        
+        ranges = [
+            absolute_range_name(title, f"1:{max_rows}") if max_rows else absolute_range_name(title)
+            for title in titles
+        ]
+        return dict(zip(titles, self._batch_get_ranges(spreadsheet, ranges, value_render_option)))
+    
+    def _batch_get_ranges(self, spreadsheet, ranges: List[str], value_render_option=None,
+                          major_dimension: Optional[str] = None) -> List[List[List[Any]]]:
+        """Values of each A1 range, in request order, from one values:batchGet request"""
+        params = {}
+        if value_render_option:
+            params['valueRenderOption'] = value_render_option
+        if major_dimension:
+            params['majorDimension'] = major_dimension
+        response = spreadsheet.values_batch_get(ranges, params=params or None)
+        
+        # Empty ranges come back without 'values'
+        return [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+    
     def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and validate the DataFrame"""
-        if df.empty:
-            return df
+        """Clean and validate the DataFrame
         
-        # Remove completely empty rows/columns
-        df = df.dropna(how='all')
+        Works on the whole grid at once: empty strings (what the API returns
+        for blank cells) become NaN in one pass, blank rows and trailing
+        blank, unheaded columns are dropped by numpy masks, and only columns
+        whose sampled values are all numeric (allowing "1,000" and "-") are
+        converted to numbers, so text columns such as names are kept as they
+        are. Placeholders become NaN, as they did when every column was
+        coerced.
+        """
         if df.empty:
             return df
         
+        values = df.to_numpy(dtype=object)
+        blank = pd.isna(values) | (values == '')
+        
+        # Drop rows with no values at all, and trailing columns with neither values nor a header
+        keep_rows = ~blank.all(axis=1)
+        filled_columns = np.flatnonzero(~blank.all(axis=0) | (df.columns.astype(str).str.strip() != ''))
+        width = filled_columns[-1] + 1 if len(filled_columns) else 0
+        if not keep_rows.any() or width == 0:
+            return pd.DataFrame(columns=df.columns[:width])
+        
         # Remove unnamed columns
-        df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+        kept = np.flatnonzero(~df.columns[:width].astype(str).str.contains('^Unnamed'))
+        values = values[keep_rows][:, kept]
+        filled = ~blank[keep_rows][:, kept]
+        values[~filled] = np.nan
+        df = pd.DataFrame(values, columns=df.columns[kept])
         
-        # Convert numeric columns
-        for col in df.columns:
-            try:
-                # Skip if column is all NaN
-                if df[col].isna().all():
-                    continue
-                    
-                # Try to convert to numeric
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            except Exception as e:
-                logger.debug(f"Could not convert column '{col}' to numeric: {str(e)}")
+        # Convert columns whose sampled values all parse as numbers
+        for position in range(df.shape[1]):
+            present = filled[:, position]
+            numbers = self._to_numbers(values[present, position])
+            if numbers is None:
                 continue
-        
-        # Reset index
-        df = df.reset_index(drop=True)
+            column = np.full(len(values), np.nan)
+            column[present] = numbers
+            df.isetitem(position, column)
         
         return df
     
+    @classmethod
+    def _to_numbers(cls, cells: np.ndarray) -> Optional[np.ndarray]:
+        """Non-blank cells of a column as floats, or None if its sample is not numeric
+        
+        Thousands separators are dropped, as read_csv(thousands=',') does;
+        placeholders and anything else unparseable become NaN. A column of
+        plain numbers is converted by one numpy cast and the rest by a
+        single list pass, both several times faster than pd.to_numeric on
+        object arrays.
+        """
+        sample = [str(cell).strip() for cell in cells[:cls.NUMERIC_SAMPLE_SIZE]]
+        sample = [cell for cell in sample if cell not in cls.NUMERIC_PLACEHOLDERS]
+        if not sample or any(np.isnan(cls._parse_amount(cell)) for cell in sample):
+            return None
+        
+        try:
+            return cells.astype(float)
+        except (TypeError, ValueError):
+            pass
+        
+        numbers = np.full(len(cells), np.nan)
+        amounts = np.ones(len(cells), dtype=bool)
+        for placeholder in cls.NUMERIC_PLACEHOLDERS:
+            amounts &= cells != placeholder
+        try:
+            numbers[amounts] = [float(cell.replace(',', '')) for cell in cells[amounts]]
+        except (AttributeError, ValueError):
+            # Text among the amounts: parse cell by cell
+            numbers[amounts] = [cls._parse_amount(cell) for cell in cells[amounts]]
+        return numbers
+    
+    @staticmethod
+    def _parse_amount(cell) -> float:
+        try:
+            return float(str(cell).replace(',', ''))
+        except ValueError:
+            return np.nan
+    
     def get_latest_sheet_data(self, sheet_url: str, 
                              year: Optional[int] = None) -> Optional[pd.DataFrame]:
         """Get the latest relevant sheet data based on naming patterns"""
@@ -239,7 +674,7 @@ class GoogleSheetsService:
             return None
         
         try:
-            spreadsheet = client.open_by_url(sheet_url)
+            spreadsheet = self.open_spreadsheet(sheet_url, client)
             worksheets = spreadsheet.worksheets()
             
             # Sort worksheets by title to find latest (reverse alphabetical)
@@ -275,111 +710,34 @@ class GoogleSheetsService:
             logger.error(f"Error finding latest sheet: {str(e)}")
             return None
     
-    def get_sheet_as_excel(self, sheet_url: str, sheet_name: Optional[str] = None) -> Optional[BytesIO]:
-        """Get Google Sheets data as Excel file bytes"""
-        try:
-            # Get data from Google Sheets
-            df = self.get_sheet_data(sheet_url, sheet_name)
-            
-            if df is None:
-                logger.error("Failed to get data from Google Sheet")
-                return None
-            
-            if df.empty:
-                logger.warning("Google Sheet is empty")
-                # Return empty Excel file
-                df = pd.DataFrame({'Message': ['No data found in Google Sheet']})
-            
-            # Convert DataFrame to Excel bytes
-            output = BytesIO()
-            
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                # Write main data
-                sheet_title = sheet_name or 'Sheet1'
-                df.to_excel(writer, index=False, sheet_name=sheet_title[:31])  # Excel sheet name max 31 chars
-                
-                # Get workbook and worksheet objects for formatting
-                workbook = writer.book
-                worksheet = writer.sheets[sheet_title[:31]]
-                
-                # Add header formatting
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'text_wrap': True,
-                    'valign': 'top',
-                    'fg_color': '#D7E4BC',
-                    'border': 1
-                })
-                
-                # Apply header formatting
-                for col_num, value in enumerate(df.columns.values):
-                    worksheet.write(0, col_num, value, header_format)
-                
-                # Auto-adjust column widths
-                for i, col in enumerate(df.columns):
-                    # Calculate max width
-                    max_len = max(
-                        df[col].astype(str).apply(len).max() if not df[col].empty else 0,
-                        len(str(col))
-                    )
-                    # Set column width (max 50 characters)
-                    worksheet.set_column(i, i, min(max_len + 2, 50))
-                
-                # Add metadata sheet
-                metadata_df = pd.DataFrame({
-                    'Property': ['Source URL', 'Export Time', 'Total Rows', 'Total Columns', 'Sheet Name', 'Generated By'],
-                    'Value': [
-                        sheet_url,
-                        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        len(df),
-                        len(df.columns),
-                        sheet_name or 'Default',
-                        'Welfare Management System'
-                    ]
-                })
-                metadata_df.to_excel(writer, sheet_name='Metadata', index=False)
-            
-            output.seek(0)
-            
-            logger.info(f"Successfully converted Google Sheet to Excel format: {len(df)} rows")
-            return output
-            
-        except Exception as e:
-            logger.error(f"Error converting Google Sheet to Excel: {str(e)}", exc_info=True)
-            return None
-    
     def check_sheet_updated(self, sheet_url: str, sheet_name: str) -> bool:
-        """Check if sheet has been updated since last fetch"""
+        """Check if sheet has been updated since last fetch
+        
+        Compares the spreadsheet's Drive version with the one recorded at
+        the last fetch; only when Drive metadata is unavailable are the
+        worksheet values pulled and compared by content digest.
+        """
         cache_key = f"{sheet_url}:{sheet_name}"
-        if cache_key not in self._last_update_times:
-            return True
+        with self._tracking_lock:
+            if cache_key not in self._last_update_times:
+                return True
         
         client = self.get_client()
         if not client:
             return False
         
         try:
-            spreadsheet = client.open_by_url(sheet_url)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            current = self.sheet_version(sheet_url, client)
+            if current is None:
+                spreadsheet = self.open_spreadsheet(sheet_url, client)
+                worksheet = spreadsheet.worksheet(sheet_name)
+                current = self._content_digest(worksheet.get_all_values())
             
-            # Get a sample of data (first 10 rows) to check for changes
-            data = worksheet.get_all_records(head=1)
-            if not data:
-                return True
-            
-            # Create hash of the data
-            import json
-            data_str = json.dumps(data, sort_keys=True)
-            current_hash = hash(data_str)
-            
-            # Initialize _sheet_hashes if needed
-            if not hasattr(self, '_sheet_hashes'):
-                self._sheet_hashes = {}
-            
-            # Store and compare hash
-            last_hash = self._sheet_hashes.get(cache_key)
-            self._sheet_hashes[cache_key] = current_hash
-            return last_hash != current_hash
+            # Store and compare version token
+            with self._tracking_lock:
+                last = self._sheet_hashes.get(cache_key)
+                self._sheet_hashes[cache_key] = current
+            return last != current
                 
         except Exception as e:
             logger.error(f"Error checking sheet update: {str(e)}")
@@ -387,32 +745,38 @@ class GoogleSheetsService:
     
     def clear_cache(self, sheet_url: str = None, sheet_name: str = None):
         """Clear cache for specific sheet or all sheets"""
-        if sheet_url and sheet_name:
-            cache_key = f"{sheet_url}:{sheet_name}"
-            if cache_key in self.cache:
-                del self.cache[cache_key]
-            if cache_key in self._last_update_times:
-                del self._last_update_times[cache_key]
-            if hasattr(self, '_sheet_hashes') and cache_key in self._sheet_hashes:
-                del self._sheet_hashes[cache_key]
-            logger.info(f"Cleared cache for {cache_key}")
-        elif sheet_url:
-            # Clear all caches for this URL
-            keys_to_delete = [k for k in self.cache.keys() if k.startswith(sheet_url)]
-            for key in keys_to_delete:
-                del self.cache[key]
-                if key in self._last_update_times:
-                    del self._last_update_times[key]
-                if hasattr(self, '_sheet_hashes') and key in self._sheet_hashes:
-                    del self._sheet_hashes[key]
-            logger.info(f"Cleared cache for all sheets in {sheet_url}")
-        else:
-            # Clear all caches
-            self.cache.clear()
-            self._last_update_times.clear()
-            if hasattr(self, '_sheet_hashes'):
+        with self._tracking_lock:
+            if sheet_url and sheet_name:
+                cache_key = f"{sheet_url}:{sheet_name}"
+                # The tab's frame and everything derived from it (#month{m} grids)
+                derived = f"{cache_key}#"
+                self.cache.pop(cache_key)
+                self.cache.pop_prefix(derived)
+                sheets_snapshots.delete(key=cache_key)
+                sheets_snapshots.delete(prefix=derived)
+                for tracked in (self._last_update_times, self._sheet_hashes):
+                    for key in [k for k in tracked.keys() if k == cache_key or k.startswith(derived)]:
+                        tracked.pop(key, None)
+                logger.info(f"Cleared cache for {cache_key}")
+            elif sheet_url:
+                # Clear all caches for this URL
+                self.cache.pop_prefix(sheet_url)
+                sheets_snapshots.delete(prefix=sheet_url)
+                sheet_id = self._extract_sheet_id(sheet_url)
+                if sheet_id:
+                    sheets_metadata.invalidate(sheet_id)
+                for tracked in (self._last_update_times, self._sheet_hashes):
+                    for key in [k for k in tracked.keys() if k.startswith(sheet_url)]:
+                        tracked.pop(key, None)
+                logger.info(f"Cleared cache for all sheets in {sheet_url}")
+            else:
+                # Clear all caches
+                self.cache.clear()
+                sheets_snapshots.delete()
+                sheets_metadata.invalidate()
+                self._last_update_times.clear()
                 self._sheet_hashes.clear()
-            logger.info("Cleared all Google Sheets cache")
+                logger.info("Cleared all Google Sheets cache")
     
     def test_connection(self, sheet_url: str = None) -> Dict[str, Any]:
         """Test connection to Google Sheets API"""
@@ -433,7 +797,7 @@ class GoogleSheetsService:
                     }
                 
                 try:
-                    spreadsheet = client.open_by_url(sheet_url)
+                    spreadsheet = self.open_spreadsheet(sheet_url, client)
                     worksheets = spreadsheet.worksheets()
                     
                     return {
@@ -10,6 +10,8 @@ from flask import current_app
 import logging
 import warnings
 
+from app.services.contribution_table import ContributionTable
+
 logger = logging.getLogger(__name__)
 
 class ImageGenerator:
@@ -22,10 +24,6 @@ class ImageGenerator:
             # Ensure we're using the right backend
             plt.switch_backend('Agg')
             
-            # Ensure data is properly formatted
-            if not isinstance(data.get('data'), pd.DataFrame):
-                data['data'] = pd.DataFrame(data['data'])
-            
             # Check if we have month column
             month_col = data.get('month_col')
             name_col = data.get('name_col')
@@ -34,18 +32,17 @@ class ImageGenerator:
                 logger.error("Missing month_col or name_col in data")
                 return None
             
-            # Filter paid members (non-null in month column)
-            df = data['data']
-            paid_df = df[~df[month_col].isna()]
+            # Paid members (non-null in month column)
+            paid_members = ContributionTable.from_data(data).paid_members()
             
-            if paid_df.empty:
+            if not paid_members:
                 logger.info("No paid members found to generate image")
                 return None
             
             # Calculate figure height based on number of rows
             base_height = 4  # For summary section
             row_height = 0.4  # Height per row of data
-            fig_height = max(base_height, base_height + len(paid_df) * row_height)
+            fig_height = max(base_height, base_height + len(paid_members) * row_height)
             
             # Create figure with improved styling
             plt.style.use('default')
@@ -54,7 +51,7 @@ class ImageGenerator:
             
             # Create grid layout
             gs = fig.add_gridspec(2, 1, 
-                                 height_ratios=[1.5, len(paid_df) * row_height],
+                                 height_ratios=[1.5, len(paid_members) * row_height],
                                  hspace=0.3)
             
             # Financial Summary Section
@@ -138,15 +135,7 @@ class ImageGenerator:
             ax_members.axis('off')
             
             # Prepare members data
-            member_data = []
-            for _, row in paid_df.iterrows():
-                name = str(row[name_col])
-                amount = row[month_col]
-                try:
-                    formatted_amount = f"MWK {float(amount):,.2f}"
-                except (ValueError, TypeError):
-                    formatted_amount = str(amount)
-                member_data.append([name, formatted_amount])
+            member_data = [[str(name), f"MWK {amount:,.2f}"] for name, amount in paid_members]
             
             if not member_data:
                 logger.warning("No paid members data to display")
@@ -244,35 +233,29 @@ class ImageGenerator:
             # Ensure we're using the right backend
             plt.switch_backend('Agg')
             
-            if not isinstance(data.get('data'), pd.DataFrame):
-                data['data'] = pd.DataFrame(data['data'])
-            
             month_col = data.get('month_col')
             name_col = data.get('name_col')
             
             if not month_col or not name_col:
                 return None
             
-            df = data['data']
-            paid_df = df[~df[month_col].isna()]
+            # Top contributors by amount (limit to 15 for readability)
+            top_members = ContributionTable.from_data(data).paid_members(order='desc', limit=15)
             
-            if paid_df.empty:
+            if not top_members:
                 return None
             
-            # Sort by contribution amount
-            paid_df = paid_df.sort_values(by=month_col, ascending=False)
+            top_n = len(top_members)
+            top_names = [name for name, _ in top_members]
+            top_amounts = [amount for _, amount in top_members]
             
             # Create figure
             fig, ax = plt.subplots(figsize=(12, 6), dpi=150)
             
-            # Get top contributors (limit to 15 for readability)
-            top_n = min(15, len(paid_df))
-            top_df = paid_df.head(top_n)
-            
             # Create bar chart
             bars = ax.barh(
                 range(top_n),
-                top_df[month_col].values,
+                top_amounts,
                 color='#3b82f6',
                 edgecolor='#1d4ed8',
                 linewidth=0.5
@@ -280,11 +263,11 @@ class ImageGenerator:
             
             # Customize chart
             ax.set_yticks(range(top_n))
-            ax.set_yticklabels(top_df[name_col].values, fontsize=9)
+            ax.set_yticklabels(top_names, fontsize=9)
             ax.invert_yaxis()  # Highest on top
             
             # Add value labels on bars
-            for i, (bar, value) in enumerate(zip(bars, top_df[month_col].values)):
+            for i, (bar, value) in enumerate(zip(bars, top_amounts)):
                 width = bar.get_width()
                 ax.text(
                     width + (width * 0.01),
@@ -0,0 +1,92 @@
+# app/services/layout_cache.py
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+
+
+class LayoutCache:
+    """In-process LRU cache of detected workbook layouts.
+
+    A layout is what discovery finds on a year sheet: the sheet name, the
+    header row of each group of month columns, the name column, the month
+    column positions and the financial label cells. Layouts are keyed by a
+    structural fingerprint (file type, the shape of the sheet names and the
+    year), so the next upload of a workbook with the same layout reads the
+    known columns directly. Callers must validate a cached layout
+    against the sheet and fall back to discovery when it no longer matches.
+    """
+
+    DEFAULT_MAX_ENTRIES = 128
+
+    # Four-digit years in sheet names, so "2024" and "2025" books share a shape
+    YEAR_PATTERN = re.compile(r'(19|20)\d{2}')
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def max_entries(self):
+        if has_app_context():
+            return current_app.config.get('LAYOUT_CACHE_MAX_ENTRIES', self.DEFAULT_MAX_ENTRIES)
+        return self.DEFAULT_MAX_ENTRIES
+
+    @staticmethod
+    def fingerprint(filepath, sheet_names, year):
+        """Structural key for the layout of the ``year`` sheet in a workbook"""
+        extension = os.path.splitext(str(filepath))[1].lower()
+        shapes = sorted({LayoutCache.YEAR_PATTERN.sub('{year}', str(name)) for name in sheet_names})
+        token = f"{extension}|{'|'.join(shapes)}|{year}"
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def peek(self, key):
+        """Return a cached layout without touching the LRU order or counters"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, layout):
+        with self._lock:
+            self._entries[key] = layout
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop a layout that failed validation"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
+
+
+# Singleton instance
+layout_cache = LayoutCache()
@@ -0,0 +1,219 @@
+# app/services/parse_cache.py
+import os
+import hashlib
+import logging
+import posixpath
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+import pandas as pd
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCache:
+    """In-process LRU cache of decoded workbook sheets.
+
+    Entries are keyed by the SHA-256 of the file bytes plus the sheet name,
+    so re-uploading the same workbook (under any filename) reuses the frames
+    decoded by the previous upload. The cache is bounded by
+    PARSE_CACHE_MAX_BYTES; evicted frames are optionally pickled to
+    TEMP_FOLDER when PARSE_CACHE_SPILL is enabled.
+    """
+
+    # Pseudo sheet name under which a workbook's sheet list is stored
+    SHEET_LIST = None
+
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    
+    # Workbook-wide parts a worksheet's cell values are resolved through
+    SHARED_PARTS = ('xl/sharedStrings.xml', 'xl/styles.xml')
+    
+    SPREADSHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+    RELATIONSHIP_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+    PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+    def __init__(self):
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spill_hits = 0
+
+    @staticmethod
+    def file_digest(filepath, chunk_size=1024 * 1024):
+        """Return the SHA-256 hex digest of a file, read in chunks"""
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def sheet_fingerprints(filepath):
+        """Return {sheet name: fingerprint} in workbook order for an xlsx file, or None.
+        
+        Read from the zip central directory plus the small workbook index,
+        without inflating any worksheet: a sheet's fingerprint combines the
+        CRC-32 and size of its worksheet member with those of the shared
+        string and style tables its cells are resolved through. Editing
+        numbers on one sheet changes only that sheet's fingerprint; edits
+        that rewrite the shared string table change them all. Returns None
+        for anything that is not a readable xlsx package.
+        """
+        try:
+            with zipfile.ZipFile(filepath) as archive:
+                members = {info.filename: info for info in archive.infolist()}
+                if 'xl/workbook.xml' not in members or 'xl/_rels/workbook.xml.rels' not in members:
+                    return None
+                
+                workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+                relationships = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        except (zipfile.BadZipFile, ET.ParseError, OSError, KeyError):
+            return None
+        
+        targets = {}
+        for relationship in relationships.iter(f'{ParseCache.PACKAGE_REL_NS}Relationship'):
+            target = relationship.get('Target', '')
+            # Targets are relative to xl/ unless absolute within the package
+            path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            targets[relationship.get('Id')] = path
+        
+        shared = ':'.join(
+            f"{members[part].CRC}:{members[part].file_size}" if part in members else '-'
+            for part in ParseCache.SHARED_PARTS
+        )
+        
+        fingerprints = {}
+        for sheet in workbook.iter(f'{ParseCache.SPREADSHEET_NS}sheet'):
+            member = members.get(targets.get(sheet.get(ParseCache.RELATIONSHIP_ID)))
+            if member is None:
+                return None
+            token = f"{member.filename}:{member.CRC}:{member.file_size}:{shared}"
+            fingerprints[sheet.get('name')] = hashlib.sha256(token.encode()).hexdigest()
+        return fingerprints
+    
+    @property
+    def max_bytes(self):
+        if has_app_context():
+            return current_app.config.get('PARSE_CACHE_MAX_BYTES', self.DEFAULT_MAX_BYTES)
+        return self.DEFAULT_MAX_BYTES
+
+    @property
+    def spill_folder(self):
+        """Folder for evicted frames, or None when spilling is disabled"""
+        if not has_app_context() or not current_app.config.get('PARSE_CACHE_SPILL', False):
+            return None
+        return os.path.join(current_app.config['TEMP_FOLDER'], 'parse_cache')
+
+    def get(self, digest, sheet_name):
+        """Return the cached value for (digest, sheet_name) or None"""
+        key = (digest, sheet_name)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        value = self._load_spilled(key)
+        if value is not None:
+            self.put(digest, sheet_name, value)
+            with self._lock:
+                self.hits += 1
+                self.spill_hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, digest, sheet_name, value):
+        """Store a decoded frame (or a sheet list) and evict down to the budget"""
+        key = (digest, sheet_name)
+        nbytes = self._sizeof(value)
+        max_bytes = self.max_bytes
+        if nbytes > max_bytes:
+            logger.debug(f"Not caching {sheet_name!r}: {nbytes} bytes exceeds budget")
+            return
+
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+
+            while self.current_bytes > max_bytes:
+                old_key, (old_value, old_nbytes) = self._entries.popitem(last=False)
+                self.current_bytes -= old_nbytes
+                self.evictions += 1
+                evicted.append((old_key, old_value))
+
+        for old_key, old_value in evicted:
+            self._spill(old_key, old_value)
+
+    def clear(self):
+        """Drop every in-memory entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = self.spill_hits = 0
+
+    def stats(self):
+        """Counters used to size PARSE_CACHE_MAX_BYTES"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'spill_hits': self.spill_hits,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    @staticmethod
+    def _sizeof(value):
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        return sum(len(str(item)) for item in value) + 64
+
+    def _spill_path(self, key):
+        folder = self.spill_folder
+        if folder is None:
+            return None
+        digest, sheet_name = key
+        sheet_hash = hashlib.sha256(str(sheet_name).encode()).hexdigest()[:16]
+        return os.path.join(folder, f"{digest}_{sheet_hash}.pkl")
+
+    def _spill(self, key, value):
+        """Write an evicted frame to TEMP_FOLDER if spilling is enabled"""
+        path = self._spill_path(key)
+        if path is None or not isinstance(value, pd.DataFrame) or os.path.exists(path):
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            value.to_pickle(path)
+        except Exception as e:
+            logger.warning(f"Could not spill parse cache entry to {path}: {str(e)}")
+
+    def _load_spilled(self, key):
+        path = self._spill_path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Could not load spilled parse cache entry {path}: {str(e)}")
+            return None
+
+
+# Singleton instance
+parse_cache = ParseCache()
@@ -0,0 +1,367 @@
+# app/services/parse_worker.py
+import os
+import sys
+import time
+import logging
+import threading
+import subprocess
+from datetime import datetime
+from multiprocessing.connection import Connection
+
+from flask import Flask, current_app
+
+from app.services.excel_parser import ExcelParser
+from app.services.layout_cache import layout_cache
+from app.services.parse_cache import parse_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ParseLimitExceeded(ValueError):
+    """A workbook hit the parse worker's memory or time limit"""
+
+
+class ParseWorkerError(RuntimeError):
+    """A parse worker died or returned an unexpected failure"""
+
+
+# Config copied into each worker's minimal app
+WORKER_CONFIG_KEYS = (
+    'TEMP_FOLDER',
+    'UPLOAD_FOLDER',
+    'PARSE_CACHE_MAX_BYTES',
+    'PARSE_CACHE_SPILL',
+    'STREAMING_PARSE_MIN_BYTES',
+    'PARSE_ENGINE',
+    'LAYOUT_CACHE_MAX_ENTRIES',
+    'PREVIEW_ROWS',
+    'PREVIEW_MAX_SHEETS',
+    'PREVIEW_TIME_BUDGET_MS',
+)
+
+
+# Directory containing the ``app`` package; workers run ``python -m`` from it
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _cache_stats():
+    """This process's parse and layout cache counters"""
+    return {'parse_cache': parse_cache.stats(), 'layout_cache': layout_cache.stats()}
+
+
+def _run_task(task):
+    """Run one ('read_year', filepath, year, engine) or ('preview', filepath, year, month) task"""
+    kind, filepath, year, option = task
+    if kind == 'read_year':
+        return ExcelParser.read_year(filepath, year, engine=option)
+    if kind == 'preview':
+        return ExcelParser.preview(filepath, year=year, month=option)
+    raise ValueError(f"Unknown parse worker task: {kind}")
+
+
+def _worker_main():
+    """Worker process loop: run read_year and preview tasks until None.
+
+    The parent talks to the worker over its stdin/stdout; the first message
+    is the config for the worker's minimal app. Every reply is a
+    (status, payload, cache stats) tuple.
+    """
+    conn_in = Connection(os.dup(0), writable=False)
+    conn_out = Connection(os.dup(1), readable=False)
+    # Keep stray prints off the result pipe
+    os.dup2(2, 1)
+
+    app = Flask('parse_worker')
+    app.config.update(conn_in.recv())
+    with app.app_context():
+        conn_out.send(('ready', None, _cache_stats()))
+        while True:
+            try:
+                task = conn_in.recv()
+            except EOFError:
+                break
+            if task is None:
+                break
+
+            try:
+                reply = ('ok', _run_task(task))
+            except MemoryError:
+                reply = ('memory', None)
+            except ValueError as e:
+                reply = ('invalid', str(e))
+            except Exception as e:
+                reply = ('error', f"{type(e).__name__}: {str(e)}")
+            conn_out.send(reply + (_cache_stats(),))
+
+
+class _Worker:
+    """One parse subprocess and the parent's ends of its pipes"""
+
+    def __init__(self, config):
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'app.services.parse_worker'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=PROJECT_ROOT,
+        )
+        self.send_conn = Connection(os.dup(self.process.stdin.fileno()), readable=False)
+        self.recv_conn = Connection(os.dup(self.process.stdout.fileno()), writable=False)
+        self.process.stdin.close()
+        self.process.stdout.close()
+        self.send_conn.send(config)
+        self.ready = False
+        self.cache_stats = None
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def wait_ready(self, timeout):
+        """Wait for a new worker to finish importing, so start-up is not billed to the task"""
+        if self.ready:
+            return
+        if not self.recv_conn.poll(timeout):
+            raise ParseWorkerError(f"Parse worker did not start within {timeout}s")
+        self.receive()
+        self.ready = True
+
+    def receive(self):
+        """Next (status, payload) reply, keeping the cache stats sent with it"""
+        status, payload, self.cache_stats = self.recv_conn.recv()
+        return status, payload
+
+    def rss_bytes(self):
+        """Resident set size from /proc, or None where that is unavailable"""
+        try:
+            with open(f"/proc/{self.pid}/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def close(self):
+        self.send_conn.close()
+        self.recv_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait(timeout=5)
+        self.close()
+
+    def stop(self):
+        try:
+            self.send_conn.send(None)
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+        self.close()
+
+
+class ParseWorkerPool:
+    """Runs ExcelParser file reads and previews in subprocesses with RSS and wall-clock limits.
+
+    A pathological workbook then only pins its own worker: the parent polls
+    the worker's resident memory (PARSE_MAX_RSS_MB) and elapsed time
+    (PARSE_TIMEOUT_SECONDS), kills it when either limit is hit and raises
+    ParseLimitExceeded. Workers return the raw header-group arrays; the
+    summary tables are rebuilt in the request process. Workers are started
+    lazily, reused across requests (so each keeps its own parse caches) and
+    capped at PARSE_WORKERS; PARSE_CACHE_MAX_BYTES is split between them, so
+    the workers together stay within the one budget.
+    """
+
+    # Seconds between limit checks while a task runs
+    POLL_INTERVAL = 0.05
+
+    # Seconds a new worker may take to import the parser
+    STARTUP_TIMEOUT = 30
+
+    def __init__(self):
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = None
+        # pid -> cache counters from each live worker's latest reply
+        self._cache_stats = {}
+
+    @staticmethod
+    def enabled():
+        # Workers use POSIX pipes and /proc for their limits
+        return current_app.config.get('PARSE_IN_SUBPROCESS', True) and os.name == 'posix'
+
+    def parse_excel(self, filepath, year=None, month=None, engine=None):
+        """ExcelParser.parse_excel, with the file read in a parse worker"""
+        if year is None:
+            year = datetime.now().year
+        if month is None:
+            month = datetime.now().month
+
+        return ExcelParser.month_slice(self.parse_year(filepath, year, engine=engine), month)
+
+    def parse_year(self, filepath, year=None, engine=None):
+        """ExcelParser.parse_year, with the file read in a parse worker"""
+        if year is None:
+            year = datetime.now().year
+        if not self.enabled():
+            return ExcelParser.parse_year(filepath, year, engine=engine)
+
+        year_sheet, header_groups, financial_info = self._run(('read_year', os.path.abspath(filepath), year, engine))
+        return ExcelParser._build_year_data(year, year_sheet, header_groups, financial_info)
+
+    def preview(self, filepath, year=None, month=None):
+        """ExcelParser.preview, with the untrusted upload opened in a parse worker"""
+        if not self.enabled():
+            return ExcelParser.preview(filepath, year=year, month=month)
+
+        return self._run(('preview', os.path.abspath(filepath), year, month))
+
+    def shutdown(self):
+        """Stop every idle worker"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+            self._forget(worker)
+
+    def stats(self):
+        """Parse and layout cache counters summed over the live workers.
+
+        Each worker reports its counters with every reply, so these are as
+        of each worker's most recent parse.
+        """
+        with self._lock:
+            reports = list(self._cache_stats.values())
+
+        totals = {'workers': len(reports)}
+        for cache in ('parse_cache', 'layout_cache'):
+            summed = {}
+            for report in reports:
+                for key, value in report[cache].items():
+                    if key != 'hit_rate':
+                        summed[key] = summed.get(key, 0) + value
+            if cache == 'parse_cache':
+                lookups = summed.get('hits', 0) + summed.get('misses', 0)
+                summed['hit_rate'] = round(summed['hits'] / lookups, 4) if lookups else 0.0
+            totals[cache] = summed
+        return totals
+
+    def _run(self, task):
+        config = current_app.config
+        timeout = config.get('PARSE_TIMEOUT_SECONDS', 60)
+        max_rss = config.get('PARSE_MAX_RSS_MB', 1024) * 1024 * 1024
+        filename = os.path.basename(task[1])
+
+        slots = self._get_slots(config.get('PARSE_WORKERS', 2))
+        slots.acquire()
+        worker = None
+        try:
+            worker = self._checkout(config)
+            worker.wait_ready(self.STARTUP_TIMEOUT)
+            self._record(worker)
+            worker.send_conn.send(task)
+
+            deadline = time.monotonic() + timeout
+            while not worker.recv_conn.poll(self.POLL_INTERVAL):
+                if not worker.is_alive():
+                    dead, worker = worker, None
+                    dead.close()
+                    self._forget(dead)
+                    raise ParseWorkerError(f"Parse worker exited with code {dead.process.returncode} while reading {filename}")
+
+                rss = worker.rss_bytes()
+                if rss is not None and rss > max_rss:
+                    self._discard(worker)
+                    worker = None
+                    current_app.logger.warning(f"Parse of {filename} stopped at {rss // (1024 * 1024)} MB RSS")
+                    raise ParseLimitExceeded(
+                        f"The workbook needs more than {max_rss // (1024 * 1024)} MB to read. "
+                        f"Remove unused rows, columns or sheets and upload it again."
+                    )
+
+                if time.monotonic() > deadline:
+                    self._discard(worker)
+                    worker = None
+                    current_app.logger.warning(f"Parse of {filename} stopped after {timeout}s")
+                    raise ParseLimitExceeded(
+                        f"The workbook took longer than {timeout} seconds to read. "
+                        f"Remove unused rows, columns or sheets and upload it again."
+                    )
+
+            status, payload = worker.receive()
+            self._record(worker)
+        except ParseWorkerError:
+            if worker is not None:
+                self._discard(worker)
+                worker = None
+            raise
+        except (EOFError, OSError) as e:
+            if worker is not None:
+                self._discard(worker)
+                worker = None
+            raise ParseWorkerError(f"Lost contact with parse worker while reading {filename}: {str(e)}")
+        finally:
+            if worker is not None:
+                self._checkin(worker)
+            slots.release()
+
+        if status == 'ok':
+            return payload
+        if status == 'invalid':
+            raise ValueError(payload)
+        if status == 'memory':
+            raise ParseLimitExceeded("The workbook ran out of memory while being read.")
+        raise ParseWorkerError(payload)
+
+    def _get_slots(self, size):
+        with self._lock:
+            if self._slots is None:
+                self._slots = threading.BoundedSemaphore(size)
+            return self._slots
+
+    def _checkout(self, config):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.is_alive():
+                    return worker
+                worker.close()
+                self._cache_stats.pop(worker.pid, None)
+        return _Worker(self._worker_config(config))
+
+    @staticmethod
+    def _worker_config(config):
+        """Config for a new worker, with its share of the parse cache budget"""
+        worker_config = {key: config[key] for key in WORKER_CONFIG_KEYS if key in config}
+        if 'PARSE_CACHE_MAX_BYTES' in worker_config:
+            workers = max(config.get('PARSE_WORKERS', 2), 1)
+            worker_config['PARSE_CACHE_MAX_BYTES'] //= workers
+        return worker_config
+
+    def _record(self, worker):
+        with self._lock:
+            if worker.cache_stats is not None:
+                self._cache_stats[worker.pid] = worker.cache_stats
+
+    def _forget(self, worker):
+        with self._lock:
+            self._cache_stats.pop(worker.pid, None)
+
+    def _checkin(self, worker):
+        with self._lock:
+            self._idle.append(worker)
+
+    def _discard(self, worker):
+        self._forget(worker)
+        try:
+            worker.kill()
+        except Exception as e:
+            logger.warning(f"Could not stop parse worker {worker.pid}: {str(e)}")
+
+
+# Singleton instance
+parse_worker_pool = ParseWorkerPool()
+
+
+if __name__ == '__main__':
+    _worker_main()
@@ -12,6 +12,8 @@ from flask import current_app
 import logging
 import pandas as pd
 
+from app.services.contribution_table import ContributionTable
+
 logger = logging.getLogger(__name__)
 
 class PDFGenerator:
@@ -416,25 +418,17 @@ class PDFGenerator:
             story.append(Paragraph("PAID MEMBERS", section_style))
             
             # Get paid members data
-            df = data.get('data')
             month_col = data.get('month_col')
             name_col = data.get('name_col')
+            table = ContributionTable.from_data(data) if data.get('data') is not None else None
             
-            if isinstance(df, pd.DataFrame) and not df.empty and month_col and name_col:
-                paid_df = df[~df[month_col].isna()]
+            if table is not None and len(table) and month_col and name_col:
+                paid_members = table.paid_members()
                 
-                if not paid_df.empty:
+                if paid_members:
                     # Create table data
                     table_data = [["Name", "Amount (MWK)"]]
-                    
-                    for _, row in paid_df.iterrows():
-                        name = str(row[name_col])
-                        amount = row[month_col]
-                        try:
-                            amount_str = f"{float(amount):,.2f}"
-                        except (ValueError, TypeError):
-                            amount_str = str(amount)
-                        table_data.append([name, amount_str])
+                    table_data.extend([str(name), f"{amount:,.2f}"] for name, amount in paid_members)
                     
                     # Create table
                     paid_table = Table(table_data, colWidths=[3.5*inch, 1.5*inch])
@@ -2,8 +2,11 @@
 from fpdf import FPDF
 from datetime import datetime
 import os
+import tempfile
 from flask import current_app
 
+from app.services.contribution_table import ContributionTable
+
 class ReportPDF(FPDF):
     """Custom PDF generator for contribution reports"""
     def header(self):
@@ -18,8 +21,24 @@ class ReportPDF(FPDF):
 
 class ReportGenerator:
     @staticmethod
-    def generate_contribution_report(data, report_folder):
-        """Generate a PDF report from parsed contribution data"""
+    def generate_contribution_report(data, report_folder, source_digest=None):
+        """Generate a PDF report from parsed contribution data
+        
+        With the upload store digest of the source workbook, the report is
+        named by (year, month, digest) and an existing one is reused. Such a
+        report names the workbook in its footer instead of a generation time,
+        which would be stale whenever the file is served again.
+        """
+        if source_digest:
+            filename = f"contributions_report_{data['year']}_{data['month']}_{source_digest[:16]}.pdf"
+            report_path = os.path.join(report_folder, filename)
+            if os.path.exists(report_path):
+                os.utime(report_path)
+                return report_path
+        else:
+            filename = f"contributions_report_{data['year']}_{data['month']}_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
+            report_path = os.path.join(report_folder, filename)
+        
         pdf = ReportPDF()
         pdf.alias_nb_pages()
         pdf.add_page()
@@ -43,12 +62,18 @@ class ReportGenerator:
             ReportGenerator._add_defaulters_section(pdf, data)
         
         # Footer
-        ReportGenerator._add_report_footer(pdf)
+        ReportGenerator._add_report_footer(pdf, source_digest)
         
-        # Save the file
-        filename = f"contributions_report_{data['year']}_{data['month']}_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
-        report_path = os.path.join(report_folder, filename)
-        pdf.output(report_path)
+        # Save the file; written aside and swapped in so a concurrent request
+        # for the same report never serves a half-written PDF
+        fd, temp_path = tempfile.mkstemp(prefix='.report_', suffix='.pdf', dir=report_folder)
+        os.close(fd)
+        try:
+            pdf.output(temp_path)
+            os.replace(temp_path, report_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
         
         return report_path
     
@@ -94,17 +119,16 @@ class ReportGenerator:
         pdf.cell(0, 10, "PAID MEMBERS", 0, 1, 'L')
         pdf.set_font("Arial", size=12)
         
-        paid_df = data['data'][~data['data'][data['month_col']].isna()]
+        paid_members = ContributionTable.from_data(data).paid_members()
         
-        if not paid_df.empty:
+        if paid_members:
             pdf.set_fill_color(200, 220, 255)
             pdf.cell(120, 10, "Name", 1, 0, 'C', 1)
             pdf.cell(0, 10, "Amount (MWK)", 1, 1, 'C', 1)
             pdf.set_fill_color(255, 255, 255)
             
-            for _, row in paid_df.iterrows():
-                pdf.cell(120, 10, str(row[data['name_col']]), 1, 0, 'L')
-                amount = float(row[data['month_col']])
+            for name, amount in paid_members:
+                pdf.cell(120, 10, str(name), 1, 0, 'L')
                 pdf.cell(0, 10, f"{amount:,.2f}", 1, 1, 'R')
         else:
             pdf.cell(0, 10, "No paid members for this period", 0, 1)
@@ -126,11 +150,14 @@ class ReportGenerator:
             pdf.cell(0, 10, str(name), 1, 1, 'L')
     
     @staticmethod
-    def _add_report_footer(pdf):
+    def _add_report_footer(pdf, source_digest=None):
         """Add report footer"""
         pdf.ln(10)
         pdf.set_font("Arial", 'I', 10)
-        pdf.cell(0, 10, f"Report generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1, 'C')
+        if source_digest:
+            pdf.cell(0, 10, f"Report of uploaded workbook {source_digest[:16]}", 0, 1, 'C')
+        else:
+            pdf.cell(0, 10, f"Report generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1, 'C')
     
     @staticmethod
     def _format_amount(amount):
@@ -1,5 +1,5 @@
 # app/services/report_serializer.py
-import pandas as pd
+from app.services.contribution_table import ContributionTable
 
 class ReportDataSerializer:
     """Utility class for serializing report data"""
@@ -7,11 +7,8 @@ class ReportDataSerializer:
     @staticmethod
     def serialize(data, report_path):
         """Serialize report data for session storage"""
-        # Ensure data['data'] is a DataFrame
-        if isinstance(data['data'], pd.DataFrame):
-            data_dict = data['data'].to_dict('records')
-        else:
-            data_dict = data['data']
+        # Records keyed by the original name/month column labels
+        data_dict = ContributionTable.from_data(data).to_records()
         
         # Convert numeric values
         money_dispensed = data.get('money_dispensed')
@@ -0,0 +1,125 @@
+# app/services/sheets_cache.py
+import sys
+import threading
+
+import pandas as pd
+from cachetools import TTLCache
+from flask import current_app, has_app_context
+
+
+class _StatsTTLCache(TTLCache):
+    """TTLCache that counts entries evicted to stay within its size budget"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.evictions = 0
+
+    def popitem(self):
+        # Only called when the cache is full; expiry goes through expire()
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class SheetsCache:
+    """Bounded, thread-safe TTL + LRU cache for fetched Google Sheets data.
+
+    Entries expire GOOGLE_SHEETS_CACHE_TTL seconds after they are stored.
+    The cache is also bounded by GOOGLE_SHEETS_CACHE_MAX_BYTES, with
+    DataFrames sized by their deep memory usage, and evicts the least
+    recently used entry to make room.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    DEFAULT_TTL = 300
+
+    def __init__(self):
+        self._cache = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+
+    def _entries(self):
+        """The underlying TTLCache, sized from config on first use; call with the lock held"""
+        if self._cache is None:
+            max_bytes, ttl = self.DEFAULT_MAX_BYTES, self.DEFAULT_TTL
+            if has_app_context():
+                max_bytes = current_app.config.get('GOOGLE_SHEETS_CACHE_MAX_BYTES', max_bytes)
+                ttl = current_app.config.get('GOOGLE_SHEETS_CACHE_TTL', ttl)
+            self._cache = _StatsTTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=self._sizeof)
+        return self._cache
+
+    def get(self, key):
+        with self._lock:
+            cache = self._entries()
+            self.expirations += len(cache.expire())
+            value = cache.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def peek(self, key):
+        """Return a live entry without touching the counters"""
+        with self._lock:
+            return self._entries().get(key)
+
+    def put(self, key, value):
+        with self._lock:
+            cache = self._entries()
+            self.expirations += len(cache.expire())
+            try:
+                cache[key] = value
+            except ValueError:
+                # Larger than the whole budget; serve it uncached
+                cache.pop(key, None)
+
+    def pop(self, key):
+        with self._lock:
+            return self._entries().pop(key, None)
+
+    def pop_prefix(self, prefix):
+        """Drop every entry whose key starts with ``prefix``"""
+        with self._lock:
+            cache = self._entries()
+            for key in [key for key in cache.keys() if key.startswith(prefix)]:
+                cache.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries().clear()
+            self._cache.evictions = 0
+            self.hits = self.misses = self.expirations = 0
+
+    def stats(self):
+        with self._lock:
+            cache = self._entries()
+            return {
+                'entries': len(cache),
+                'current_bytes': cache.currsize,
+                'max_bytes': cache.maxsize,
+                'ttl_seconds': cache.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': cache.evictions,
+                'expirations': self.expirations,
+            }
+
+    @staticmethod
+    def _sizeof(value):
+        """Approximate bytes held by a cached DataFrame or (title, rows) grid"""
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(deep=True).sum()) or 1
+        if isinstance(value, tuple) and len(value) == 2 and isinstance(value[1], list):
+            rows = value[1]
+            return sys.getsizeof(rows) + sum(
+                sys.getsizeof(row) + sum(sys.getsizeof(cell) for cell in row) for row in rows
+            )
+        return sys.getsizeof(value)
+
+
+# Singleton instance
+sheets_cache = SheetsCache()
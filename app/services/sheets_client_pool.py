@@ -0,0 +1,189 @@
+# app/services/sheets_client_pool.py
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+import gspread
+import requests
+from requests.adapters import HTTPAdapter
+from google.auth.transport.requests import AuthorizedSession, Request
+from flask import current_app, has_app_context
+
+from app.services.sheets_scheduler import sheets_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class _ScheduledSession(AuthorizedSession):
+    """AuthorizedSession whose Sheets API calls go through the request scheduler's rate limiter"""
+
+    def request(self, method, url, *args, **kwargs):
+        sheets_call = sheets_scheduler.is_sheets_call(url)
+        if sheets_call:
+            sheets_scheduler.acquire()
+        response = super().request(method, url, *args, **kwargs)
+        if sheets_call and response.status_code == 429:
+            sheets_scheduler.throttle(response.headers.get('Retry-After'))
+        return response
+
+
+class _PooledClient:
+    """An authorized gspread client, its keep-alive session and credentials"""
+
+    def __init__(self, credentials, pool_size, timeout):
+        self.credentials = credentials
+        self.session = _ScheduledSession(credentials)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.client = gspread.authorize(credentials, session=self.session)
+        # Bounds every API call, so a stalled download cannot hold a worker forever
+        self.client.set_timeout(timeout)
+        self.lock = threading.Lock()
+
+
+class SheetsClientPool:
+    """Long-lived authorized Google Sheets clients, one per credential.
+
+    Building service-account credentials and a gspread client costs a file
+    read, a token request and a TLS handshake; pooled clients keep their
+    AuthorizedSession (and its keep-alive connections) for the life of the
+    process. Access tokens are refreshed before they come within
+    GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS of expiry, so requests never stall on
+    an expired token. With GOOGLE_TOKEN_CACHE_PATH set, tokens are also
+    written to that file and reused after a restart while still valid.
+    """
+
+    DEFAULT_REFRESH_MARGIN = 300
+
+    DEFAULT_POOL_SIZE = 10
+
+    # Seconds before an API call is abandoned
+    DEFAULT_TIMEOUT = 30
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+        # Plain session for token requests, kept alive between refreshes
+        self._token_session = requests.Session()
+
+    def get_client(self, key, load_credentials):
+        """Return the pooled client for ``key``, building it with ``load_credentials()`` on first use.
+
+        ``key`` must change whenever the credential does (e.g. a hash of the
+        JSON or the key file's path and mtime).
+        """
+        with self._lock:
+            pooled = self._clients.get(key)
+            if pooled is None:
+                credentials = load_credentials()
+                if credentials is None:
+                    return None
+                self._restore_token(key, credentials)
+                pooled = _PooledClient(
+                    credentials,
+                    self._config('GOOGLE_HTTP_POOL_SIZE', self.DEFAULT_POOL_SIZE),
+                    self._config('GOOGLE_SHEETS_HTTP_TIMEOUT', self.DEFAULT_TIMEOUT),
+                )
+                self._clients[key] = pooled
+
+        self._ensure_fresh(key, pooled)
+        return pooled.client
+
+    def clear(self):
+        """Close every pooled session"""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for pooled in clients.values():
+            pooled.session.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'token_expiries': [
+                    pooled.credentials.expiry.isoformat() if pooled.credentials.expiry else None
+                    for pooled in self._clients.values()
+                ],
+            }
+
+    def _ensure_fresh(self, key, pooled):
+        """Refresh the access token if it is missing or expires within the margin"""
+        margin = timedelta(seconds=self._config('GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS', self.DEFAULT_REFRESH_MARGIN))
+        with pooled.lock:
+            credentials = pooled.credentials
+            # google-auth keeps expiry as naive UTC
+            if credentials.token and credentials.expiry and credentials.expiry - datetime.utcnow() > margin:
+                return
+            credentials.refresh(Request(self._token_session))
+            logger.info(f"Refreshed Google Sheets access token (expires {credentials.expiry})")
+            self._persist_token(key, credentials)
+
+    @staticmethod
+    def _config(name, default):
+        if has_app_context():
+            return current_app.config.get(name, default)
+        return default
+
+    @staticmethod
+    def _token_cache_path():
+        return current_app.config.get('GOOGLE_TOKEN_CACHE_PATH') if has_app_context() else None
+
+    @staticmethod
+    def _token_id(key):
+        # Keys may hold file paths; only a hash goes to disk
+        return hashlib.sha256(str(key).encode()).hexdigest()
+
+    def _read_tokens(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _restore_token(self, key, credentials):
+        path = self._token_cache_path()
+        if not path:
+            return
+        entry = self._read_tokens(path).get(self._token_id(key))
+        if not entry:
+            return
+        try:
+            expiry = datetime.fromisoformat(entry['expiry'])
+        except (KeyError, TypeError, ValueError):
+            return
+        if expiry > datetime.utcnow():
+            credentials.token = entry.get('token')
+            credentials.expiry = expiry
+            logger.info("Reusing persisted Google Sheets access token")
+
+    def _persist_token(self, key, credentials):
+        path = self._token_cache_path()
+        if not path or not credentials.token or not credentials.expiry:
+            return
+        try:
+            tokens = self._read_tokens(path)
+            now = datetime.utcnow()
+            tokens = {
+                token_id: entry for token_id, entry in tokens.items()
+                if entry.get('expiry', '') > now.isoformat()
+            }
+            tokens[self._token_id(key)] = {'token': credentials.token, 'expiry': credentials.expiry.isoformat()}
+
+            # Write owner-only and swap into place atomically
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix='.google_token_', dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(tokens, f)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist Google Sheets access token: {str(e)}")
+
+
+# Singleton instance
+sheets_client_pool = SheetsClientPool()
@@ -0,0 +1,133 @@
+# app/services/sheets_metadata_cache.py
+import copy
+import logging
+import threading
+from http import HTTPStatus
+
+import gspread
+from cachetools import TTLCache
+from flask import current_app, has_app_context
+from gspread.utils import extract_id_from_url
+
+from app.services.sheets_scheduler import sheets_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class _CachedSpreadsheet(gspread.Spreadsheet):
+    """Spreadsheet whose metadata reads (title, worksheets, sheet1...) are served from the cache"""
+
+    def __init__(self, http_client, spreadsheet_id, cache):
+        self._metadata_cache = cache
+        # True until this instance has fetched metadata itself
+        self._from_cache = cache.is_cached(spreadsheet_id)
+        super().__init__(http_client, {'id': spreadsheet_id})
+
+    def fetch_sheet_metadata(self, params=None):
+        if params:
+            # Grid data or other non-default requests bypass the cache
+            return super().fetch_sheet_metadata(params)
+        return copy.deepcopy(self._metadata_cache.metadata(self.client, self.id))
+
+    def worksheet(self, title):
+        try:
+            return super().worksheet(title)
+        except gspread.exceptions.WorksheetNotFound:
+            if not self._from_cache:
+                raise
+            # The tab may have been added since the metadata was cached
+            self._from_cache = False
+            self._metadata_cache.invalidate(self.id)
+            return super().worksheet(title)
+
+
+class SheetsMetadataCache:
+    """Short-lived cache of spreadsheet metadata, per spreadsheet id.
+
+    Opening a spreadsheet and listing its worksheets each cost a metadata
+    request in gspread, and one import used to repeat them three or four
+    times. ``open`` returns a Spreadsheet backed by this cache, so its id,
+    title, worksheet titles and grid sizes come from a single request that
+    is reused for GOOGLE_SHEETS_METADATA_TTL seconds. Concurrent misses for
+    the same spreadsheet share one request. A worksheet looked up by a
+    title the cached metadata does not have triggers one refetch.
+    """
+
+    DEFAULT_TTL = 60
+
+    MAX_SPREADSHEETS = 256
+
+    def __init__(self):
+        self._entries = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cache(self):
+        """The underlying TTLCache, sized from config on first use; call with the lock held"""
+        if self._entries is None:
+            ttl = self.DEFAULT_TTL
+            if has_app_context():
+                ttl = current_app.config.get('GOOGLE_SHEETS_METADATA_TTL', ttl)
+            self._entries = TTLCache(maxsize=self.MAX_SPREADSHEETS, ttl=ttl)
+        return self._entries
+
+    def open(self, client, sheet_url):
+        """Open a spreadsheet by URL, like ``client.open_by_url`` but with cached metadata"""
+        spreadsheet_id = extract_id_from_url(sheet_url)
+        try:
+            return _CachedSpreadsheet(client.http_client, spreadsheet_id, self)
+        except gspread.exceptions.APIError as ex:
+            # Same translation as gspread's open_by_key
+            if ex.response.status_code == HTTPStatus.NOT_FOUND:
+                raise gspread.exceptions.SpreadsheetNotFound(ex.response) from ex
+            if ex.response.status_code == HTTPStatus.FORBIDDEN:
+                raise PermissionError from ex
+            raise
+
+    def is_cached(self, spreadsheet_id):
+        with self._lock:
+            return spreadsheet_id in self._cache()
+
+    def metadata(self, http_client, spreadsheet_id):
+        """Spreadsheet metadata (properties and sheets, no cell data); do not modify the result"""
+        with self._lock:
+            metadata = self._cache().get(spreadsheet_id)
+            if metadata is not None:
+                self.hits += 1
+                return metadata
+
+        def fetch():
+            with self._lock:
+                metadata = self._cache().get(spreadsheet_id)
+            if metadata is None:
+                metadata = http_client.fetch_sheet_metadata(spreadsheet_id)
+                with self._lock:
+                    self.misses += 1
+                    self._cache()[spreadsheet_id] = metadata
+                logger.debug(f"Fetched metadata for spreadsheet {spreadsheet_id}")
+            return metadata
+
+        return sheets_scheduler.coalesce(f"metadata:{spreadsheet_id}", fetch)
+
+    def invalidate(self, spreadsheet_id=None):
+        """Forget one spreadsheet's metadata, or (no id given) all of it"""
+        with self._lock:
+            if spreadsheet_id is None:
+                self._cache().clear()
+            else:
+                self._cache().pop(spreadsheet_id, None)
+
+    def stats(self):
+        with self._lock:
+            cache = self._cache()
+            return {
+                'spreadsheets': len(cache),
+                'ttl_seconds': cache.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+# Singleton instance
+sheets_metadata = SheetsMetadataCache()
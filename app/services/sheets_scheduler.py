@@ -0,0 +1,182 @@
+# app/services/sheets_scheduler.py
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+
+class SheetsRateLimited(RuntimeError):
+    """A Sheets API call was shed because the read quota would be exceeded"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Google Sheets read quota is exhausted; try again in {retry_after:.0f} seconds.")
+        self.retry_after = retry_after
+
+
+class _Flight:
+    """One in-progress call and the outcome its waiters will share"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding at most ``capacity``.
+
+    Tokens may go negative: each caller reserves the next token and is told
+    how long to wait for it, so queued callers are served in arrival order.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, max_wait):
+        """Take a token; return the seconds to wait for it, or None (taking nothing) past ``max_wait``"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        wait = max((1 - self.tokens) / self.rate if self.tokens < 1 else 0.0, self.blocked_until - now)
+        if wait > max_wait:
+            return None
+        self.tokens -= 1
+        return wait
+
+    def block(self, seconds):
+        """Hold every caller back for ``seconds`` after the API reported the quota exhausted"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = min(self.tokens, 0)
+
+
+class SheetsRequestScheduler:
+    """Coalesces identical Sheets fetches and paces API calls to the read quota.
+
+    ``coalesce`` runs one call per key at a time: requests that ask for a
+    sheet already being fetched wait for that fetch and share its result
+    (or its failure) instead of repeating it. ``acquire`` is called before
+    every Sheets API request by the pooled sessions; it takes a token from
+    a bucket refilled at GOOGLE_SHEETS_READS_PER_MINUTE, queueing the call
+    when the bucket is empty and shedding it with SheetsRateLimited when
+    the wait would exceed GOOGLE_SHEETS_RATE_LIMIT_MAX_WAIT seconds. A 429
+    response empties the bucket and holds calls back for its Retry-After.
+    """
+
+    SHEETS_API_HOST = 'sheets.googleapis.com'
+
+    DEFAULT_READS_PER_MINUTE = 60
+
+    DEFAULT_BURST = 10
+
+    DEFAULT_MAX_WAIT = 10
+
+    # Pause after a 429 that carries no Retry-After header
+    DEFAULT_BACKOFF_SECONDS = 30
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._bucket = None
+        self.coalesced = 0
+        self.queued = 0
+        self.shed = 0
+        self.throttled = 0
+
+    @staticmethod
+    def _config(name, default):
+        if has_app_context():
+            return current_app.config.get(name, default)
+        return default
+
+    def _get_bucket(self):
+        """The token bucket, sized from config on first use; call with the lock held"""
+        if self._bucket is None:
+            per_minute = self._config('GOOGLE_SHEETS_READS_PER_MINUTE', self.DEFAULT_READS_PER_MINUTE)
+            burst = self._config('GOOGLE_SHEETS_RATE_LIMIT_BURST', self.DEFAULT_BURST)
+            self._bucket = _TokenBucket(per_minute / 60.0, burst)
+        return self._bucket
+
+    def coalesce(self, key, call):
+        """Return ``call()``, sharing one in-flight call among concurrent callers with the same key"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = call()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def is_sheets_call(self, url):
+        return urlparse(url).hostname == self.SHEETS_API_HOST
+
+    def acquire(self):
+        """Wait for a Sheets API token; raise SheetsRateLimited if it is too far off"""
+        max_wait = self._config('GOOGLE_SHEETS_RATE_LIMIT_MAX_WAIT', self.DEFAULT_MAX_WAIT)
+        with self._lock:
+            bucket = self._get_bucket()
+            wait = bucket.reserve(max_wait)
+            if wait is None:
+                self.shed += 1
+                retry_after = max(bucket.blocked_until - time.monotonic(), (1 - bucket.tokens) / bucket.rate)
+                raise SheetsRateLimited(retry_after)
+            if wait > 0:
+                self.queued += 1
+
+        if wait > 0:
+            logger.debug(f"Waiting {wait:.2f}s for Sheets API quota")
+            time.sleep(wait)
+
+    def throttle(self, retry_after=None):
+        """Record a 429 from the Sheets API"""
+        try:
+            seconds = float(retry_after)
+        except (TypeError, ValueError):
+            seconds = self.DEFAULT_BACKOFF_SECONDS
+        with self._lock:
+            self.throttled += 1
+            self._get_bucket().block(seconds)
+        logger.warning(f"Sheets API quota exhausted; holding requests for {seconds:.0f}s")
+
+    def stats(self):
+        with self._lock:
+            bucket = self._get_bucket()
+            return {
+                'reads_per_minute': round(bucket.rate * 60),
+                'burst': bucket.capacity,
+                'tokens_available': round(max(bucket.tokens, 0), 2),
+                'in_flight': len(self._flights),
+                'coalesced': self.coalesced,
+                'queued': self.queued,
+                'shed': self.shed,
+                'throttled': self.throttled,
+            }
+
+
+# Singleton instance
+sheets_scheduler = SheetsRequestScheduler()
@@ -0,0 +1,165 @@
+# app/services/sheets_snapshot_store.py
+import os
+import time
+import pickle
+import logging
+import sqlite3
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+
+class SheetsSnapshotStore:
+    """SQLite store of fetched Google Sheets data shared by every worker process.
+
+    Each worker keeps its own in-memory sheets_cache; this store sits behind
+    it, so a sheet fetched by one worker is served to the others (and after
+    a restart) without another Google API call. Snapshots carry their fetch
+    time and the spreadsheet version they were fetched at; a stale snapshot
+    is served only after checking that version is still current. Snapshots
+    older than GOOGLE_SHEETS_SNAPSHOT_MAX_STALE are dropped.
+    """
+
+    DEFAULT_MAX_STALE = 3600
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS snapshots ("
+        "key TEXT PRIMARY KEY, payload BLOB NOT NULL, fetched_at REAL NOT NULL, "
+        "version TEXT)"
+    )
+
+    def __init__(self):
+        self._initialized_paths = set()
+
+    @property
+    def enabled(self):
+        return has_app_context() and current_app.config.get('GOOGLE_SHEETS_SNAPSHOTS', True)
+
+    @property
+    def path(self):
+        path = current_app.config.get('GOOGLE_SHEETS_SNAPSHOT_PATH')
+        if not path:
+            path = os.path.join(current_app.config.get('TEMP_FOLDER', 'temp'), 'sheets_snapshots.sqlite3')
+        return path
+
+    @property
+    def max_stale(self):
+        return current_app.config.get('GOOGLE_SHEETS_SNAPSHOT_MAX_STALE', self.DEFAULT_MAX_STALE)
+
+    def _connect(self):
+        path = self.path
+        if path not in self._initialized_paths:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5)
+        if path not in self._initialized_paths:
+            # WAL lets workers read while another writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self.SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(snapshots)")}
+            if 'version' not in columns:
+                # Stores created before snapshots recorded their version
+                conn.execute("ALTER TABLE snapshots ADD COLUMN version TEXT")
+            conn.commit()
+            self._initialized_paths.add(path)
+        return conn
+
+    def get(self, key):
+        """Return (value, fetched_at, version) for ``key``, or None"""
+        if not self.enabled:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT payload, fetched_at, version FROM snapshots WHERE key = ? AND fetched_at >= ?",
+                    (key, time.time() - self.max_stale)
+                ).fetchone()
+            finally:
+                conn.close()
+            if row is None:
+                return None
+            return pickle.loads(row[0]), row[1], row[2]
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logger.warning(f"Could not read Sheets snapshot {key}: {str(e)}")
+            return None
+
+    def put(self, key, value, version=None):
+        """Store a fresh snapshot (releasing any refresh lease) and drop expired ones"""
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO snapshots (key, payload, fetched_at, version) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, payload, now, version)
+                    )
+                    conn.execute("DELETE FROM snapshots WHERE fetched_at < ?", (now - self.max_stale,))
+            finally:
+                conn.close()
+        except (sqlite3.Error, pickle.PicklingError) as e:
+            logger.warning(f"Could not write Sheets snapshot {key}: {str(e)}")
+
+    def touch(self, key):
+        """Mark a snapshot fresh again after its version was confirmed unchanged"""
+        if not self.enabled:
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "UPDATE snapshots SET fetched_at = ? WHERE key = ?", (time.time(), key)
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not touch Sheets snapshot {key}: {str(e)}")
+
+    def delete(self, key=None, prefix=None):
+        """Delete one snapshot, every snapshot under a key prefix, or (neither given) all of them"""
+        if not self.enabled:
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    if key is not None:
+                        conn.execute("DELETE FROM snapshots WHERE key = ?", (key,))
+                    elif prefix is not None:
+                        conn.execute("DELETE FROM snapshots WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+                    else:
+                        conn.execute("DELETE FROM snapshots")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not delete Sheets snapshots: {str(e)}")
+
+    def stats(self):
+        if not self.enabled:
+            return {'enabled': False}
+        try:
+            conn = self._connect()
+            try:
+                count, total_bytes, oldest = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0), MIN(fetched_at) FROM snapshots"
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            return {'enabled': True, 'error': str(e)}
+        return {
+            'enabled': True,
+            'snapshots': count,
+            'bytes': total_bytes,
+            'oldest_age_seconds': round(time.time() - oldest, 1) if oldest else None,
+        }
+
+
+# Singleton instance
+sheets_snapshots = SheetsSnapshotStore()
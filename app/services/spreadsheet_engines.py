@@ -0,0 +1,147 @@
+# app/services/spreadsheet_engines.py
+import os
+import importlib.util
+
+from flask import current_app, has_app_context
+
+from app.services.excel_parser import ExcelParser
+from app.services.streaming_reader import StreamingSheetReader
+from app.services.delimited_reader import DelimitedReader
+
+
+class SpreadsheetEngine:
+    """A reader that turns a workbook file into ExcelParser header groups.
+
+    Every engine returns (sheet name, header groups, financial info) from
+    ``read_year`` so the parser's cleaning and summary logic never depends
+    on which library decoded the file.
+    """
+
+    def __init__(self, name, extensions, requires=None):
+        self.name = name
+        self.extensions = frozenset(extensions)
+        # Importable module the engine needs, if any
+        self.requires = requires
+
+    def is_available(self):
+        return self.requires is None or importlib.util.find_spec(self.requires) is not None
+
+    def supports(self, filepath):
+        return os.path.splitext(str(filepath))[1].lower().lstrip('.') in self.extensions
+
+    def read_year(self, filepath, year):
+        raise NotImplementedError
+
+
+class PandasEngine(SpreadsheetEngine):
+    """Decode the whole year sheet with a pandas ExcelFile engine (cached)"""
+
+    def __init__(self, name, extensions, pandas_engine=None, requires=None):
+        super().__init__(name, extensions, requires)
+        # None lets pandas pick by file contents
+        self.pandas_engine = pandas_engine
+
+    def read_year(self, filepath, year):
+        year_sheet, raw_df, layout_key = ExcelParser._load_year_sheet(filepath, year, engine=self.pandas_engine)
+        header_groups, financial_info = ExcelParser._extract_sheet(raw_df, year_sheet, layout_key)
+        return year_sheet, header_groups, financial_info
+
+
+class StreamingEngine(SpreadsheetEngine):
+    """Read-only openpyxl row stream (bounded memory)"""
+
+    def read_year(self, filepath, year):
+        return StreamingSheetReader.read_year(filepath, year)
+
+
+class DelimitedEngine(SpreadsheetEngine):
+    """Native CSV/TSV reader"""
+
+    def read_year(self, filepath, year):
+        return DelimitedReader.read_year(filepath, year)
+
+
+class EngineRegistry:
+    """Named spreadsheet engines and the per-file-type preference order"""
+
+    # Older names accepted by ExcelParser.parse_year(engine=...)
+    ALIASES = {
+        'streaming': 'openpyxl-readonly',
+    }
+
+    def __init__(self):
+        self._engines = {}
+
+    def register(self, engine):
+        self._engines[engine.name] = engine
+        return engine
+
+    def get(self, name):
+        """Return the engine registered under ``name`` (or an alias)"""
+        name = self.ALIASES.get(name, name)
+        if name not in self._engines:
+            raise ValueError(f"Unknown parse engine: {name}. Registered engines: {self.names()}")
+        return self._engines[name]
+
+    def names(self):
+        return list(self._engines)
+
+    def available(self):
+        """Names of the engines whose dependencies are installed"""
+        return [name for name, engine in self._engines.items() if engine.is_available()]
+
+    def candidates(self, filepath):
+        """Available engines for a file, fastest first.
+
+        Large xlsx workbooks are streamed to bound memory; otherwise the
+        Rust-backed calamine reader is preferred when installed, then the
+        pure-Python readers, then pandas' own content-based detection.
+
+        openpyxl stays ahead of openpyxl-readonly even though the read-only
+        stream wins a cold parse of a large sheet (``parser_benchmark.py
+        --engines``, cold column). Only the pandas-backed engines decode a
+        raw frame that the parse cache keeps, so every later parse of the
+        same workbook (another month, the preview, a re-upload) is served
+        from memory. The stream has to re-read the sheet each time (warm
+        column: ~0.1s against ~8s on a 20k-row sheet). Workbooks above
+        STREAMING_PARSE_MIN_BYTES, where a decoded frame would cost too much
+        memory to keep, are streamed first.
+        """
+        extension = os.path.splitext(str(filepath))[1].lower().lstrip('.')
+
+        if extension in ('csv', 'tsv'):
+            order = ['csv']
+        elif extension in ('xlsx', 'xlsm'):
+            order = ['calamine', 'openpyxl', 'openpyxl-readonly', 'pandas']
+            if os.path.exists(filepath) and os.path.getsize(filepath) >= self._streaming_min_bytes():
+                order = ['openpyxl-readonly', 'calamine', 'openpyxl', 'pandas']
+        elif extension == 'xls':
+            order = ['calamine', 'xlrd', 'pandas']
+        else:
+            order = ['pandas']
+
+        return [
+            self._engines[name] for name in order
+            if name in self._engines and self._engines[name].is_available()
+        ]
+
+    def select(self, filepath):
+        """Return the preferred available engine for a file"""
+        candidates = self.candidates(filepath)
+        return candidates[0] if candidates else self._engines['pandas']
+
+    @staticmethod
+    def _streaming_min_bytes():
+        if has_app_context():
+            return current_app.config.get('STREAMING_PARSE_MIN_BYTES', 8 * 1024 * 1024)
+        return 8 * 1024 * 1024
+
+
+engine_registry = EngineRegistry()
+
+engine_registry.register(DelimitedEngine('csv', {'csv', 'tsv'}))
+engine_registry.register(PandasEngine('calamine', {'xlsx', 'xlsm', 'xls', 'ods'}, 'calamine', requires='python_calamine'))
+engine_registry.register(PandasEngine('openpyxl', {'xlsx', 'xlsm'}, 'openpyxl', requires='openpyxl'))
+engine_registry.register(StreamingEngine('openpyxl-readonly', {'xlsx', 'xlsm'}, requires='openpyxl'))
+engine_registry.register(PandasEngine('xlrd', {'xls'}, 'xlrd', requires='xlrd'))
+engine_registry.register(PandasEngine('pandas', {'xlsx', 'xlsm', 'xls', 'ods'}))
@@ -0,0 +1,252 @@
+# app/services/streaming_reader.py
+import calendar
+from array import array
+
+import numpy as np
+from openpyxl import load_workbook
+from flask import current_app
+
+from app.services.excel_parser import ExcelParser, SheetIndex, FINANCIAL_LABELS, NA_MARKERS
+from app.services.layout_cache import layout_cache
+
+
+class StreamingSheetReader:
+    """Bounded-memory reader for large xlsx workbooks.
+
+    Rows are streamed with openpyxl's read-only iterator. Header rows are
+    found where each month first appears, and each one's name column from
+    the rows just below it; after that each row contributes just its name
+    cell and month cells to compact arrays, so unrelated columns and sheets
+    are never materialized. When a cached
+    layout matches the sheet, discovery is skipped and only the known label
+    cells are checked.
+    """
+
+    # Rows below the header searched for the "name" label
+    NAME_SCAN_ROWS = SheetIndex.NAME_BAND_ROWS
+
+    @staticmethod
+    def read_year(filepath, year):
+        """Return (sheet name, header groups, financial info) for the year sheet"""
+        workbook = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+        try:
+            sheet_names = workbook.sheetnames
+            year_sheet, layout_key = ExcelParser._year_sheet(filepath, sheet_names, year)
+
+            current_app.logger.info(f"Streaming sheet: {year_sheet} for year {year}")
+
+            worksheet = workbook[year_sheet]
+            layout = layout_cache.get(layout_key)
+            result = None
+            if layout is not None:
+                result = StreamingSheetReader._scan_layout(worksheet.iter_rows(values_only=True), layout)
+                if result is None:
+                    current_app.logger.info(f"Cached layout no longer matches sheet {year_sheet}; detecting columns")
+                    layout_cache.invalidate(layout_key)
+
+            if result is None:
+                header_groups, financial_info, layout = StreamingSheetReader._scan(
+                    worksheet.iter_rows(values_only=True), year_sheet
+                )
+                if SheetIndex.is_complete(layout):
+                    layout_cache.put(layout_key, layout)
+            else:
+                header_groups, financial_info = result
+        finally:
+            workbook.close()
+
+        return year_sheet, header_groups, financial_info
+
+    @staticmethod
+    def _scan(rows, sheet):
+        """Single pass over row tuples; keeps only the name and month columns.
+
+        Months are grouped by the row they first appear in, as SheetIndex.layout
+        does, so a title row naming one month does not hide the real header.
+        Returns (header groups, financial info, detected layout).
+        """
+        financial_info = {key: None for key in FINANCIAL_LABELS}
+        financial_cells = {key: None for key in FINANCIAL_LABELS}
+        seen_months = set()
+        groups = []
+
+        for index, row in enumerate(rows):
+            labels = SheetIndex.row_labels(row)
+
+            for key in FINANCIAL_LABELS:
+                if labels.get(key) is not None:
+                    value = row[1] if len(row) > 1 else None
+                    financial_info[key] = ExcelParser._coerce_numeric_value(value)
+                    financial_cells[key] = (index, labels[key])
+
+            for group in groups:
+                group.feed(index, row, labels['name'])
+
+            new_months = [
+                (calendar.month_name[m], labels['months'][calendar.month_name[m].casefold()])
+                for m in range(1, 13)
+                if calendar.month_name[m].casefold() in labels['months'] and calendar.month_name[m].casefold() not in seen_months
+            ]
+            if new_months:
+                seen_months.update(month_name.casefold() for month_name, _ in new_months)
+                groups.append(_HeaderGroupScan(index, row, new_months))
+
+        layout = {'sheet': sheet, 'groups': [group.layout() for group in groups], 'financial_cells': financial_cells}
+        return [group.header_group() for group in groups], financial_info, layout
+
+    @staticmethod
+    def _scan_layout(rows, layout):
+        """Read the columns of a cached layout, checking only its label cells.
+
+        Financial labels are looked for on every row, as in a full scan,
+        since the last one wins. Returns (header groups, financial info), or
+        None as soon as a label is missing or a header row names a month
+        the layout lacks, so the caller can fall back to a full scan.
+        """
+        if not SheetIndex.is_complete(layout):
+            return None
+
+        expected = {}
+        for row, col, label in SheetIndex.expected_labels(layout):
+            expected.setdefault(row, []).append((col, label))
+
+        financial_info = {key: None for key in FINANCIAL_LABELS}
+        groups = [
+            {'layout': group, 'collector': _ColumnCollector(group['name_position'], group['months']),
+             'header': None, 'band': []}
+            for group in layout['groups']
+        ]
+        checked = 0
+        found = set()
+
+        for index, row in enumerate(rows):
+            for col, label in expected.get(index, ()):
+                if not SheetIndex.cell_has_label(row[col] if col < len(row) else None, label):
+                    return None
+            checked += index in expected
+
+            for key in SheetIndex.financial_labels(row):
+                financial_info[key] = ExcelParser._coerce_numeric_value(row[1] if len(row) > 1 else None)
+                found.add(key)
+
+            for group in groups:
+                header_row = group['layout']['header_row']
+                if index == header_row:
+                    if SheetIndex.has_new_months(layout, row):
+                        return None
+                    group['header'] = row
+                elif index > header_row:
+                    band = group['band']
+                    if len(band) < StreamingSheetReader.NAME_SCAN_ROWS:
+                        band.append(row)
+                        if len(band) == StreamingSheetReader.NAME_SCAN_ROWS and not SheetIndex.name_band_matches(group['layout'], band):
+                            return None
+                    group['collector'].collect(row)
+
+        for group in groups:
+            if group['header'] is None or not SheetIndex.name_band_matches(group['layout'], group['band']):
+                # The sheet ended before a header row, or a short sheet's name column moved
+                return None
+        if checked < len(expected):
+            # The sheet ended before a label row
+            return None
+        if len(found) < len(FINANCIAL_LABELS):
+            # A financial label was removed; a full scan records the layout without it
+            return None
+        return [group['collector'].header_group(group['header']) for group in groups], financial_info
+
+    @staticmethod
+    def _name_position(band):
+        """Leftmost column with a "name" cell in the rows below the header"""
+        positions = [position for _, _, name_positions in band for position in name_positions]
+        return min(positions) if positions else 0
+
+    @staticmethod
+    def _to_float(value):
+        if isinstance(value, bool) or value is None:
+            return np.nan
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                return np.nan
+        return np.nan
+
+
+class _HeaderGroupScan:
+    """One header row found by a full scan: its name-column band, then its columns"""
+
+    def __init__(self, header_row, header, month_columns):
+        self.header_row = header_row
+        self.header = header
+        self.month_columns = month_columns
+        # (index, row, name positions) of the rows searched for the "name" label
+        self.band = []
+        self.name_position = None
+        self.collector = None
+
+    def feed(self, index, row, name_positions):
+        if self.collector is not None:
+            self.collector.collect(row)
+            return
+        self.band.append((index, row, name_positions))
+        if len(self.band) == StreamingSheetReader.NAME_SCAN_ROWS:
+            self._start_collecting()
+
+    def _start_collecting(self):
+        self.name_position = StreamingSheetReader._name_position(self.band)
+        self.collector = _ColumnCollector(self.name_position, self.month_columns)
+        for _, buffered, _ in self.band:
+            self.collector.collect(buffered)
+
+    def header_group(self):
+        if self.collector is None:
+            # Sheet ended inside the name-scan band
+            self._start_collecting()
+        return self.collector.header_group(self.header)
+
+    def layout(self):
+        if self.collector is None:
+            self._start_collecting()
+        name_cell = next(
+            ((index, self.name_position) for index, _, name_positions in self.band if self.name_position in name_positions),
+            None
+        )
+        return {
+            'header_row': self.header_row,
+            'name_position': self.name_position,
+            'name_cell': name_cell,
+            'months': self.month_columns,
+        }
+
+
+class _ColumnCollector:
+    """Accumulates the name column and month columns of streamed rows"""
+
+    def __init__(self, name_position, month_columns):
+        self.name_position = name_position
+        self.month_columns = month_columns
+        self.names = []
+        self.amounts = [array('d') for _ in month_columns]
+
+    def collect(self, row):
+        name = row[self.name_position] if self.name_position < len(row) else None
+        # Rows without a member name are dropped by the parser anyway; "n/a"
+        # and the like are no name to the pandas readers either
+        if name is None or (isinstance(name, str) and (name.strip() == '' or name in NA_MARKERS)):
+            return
+        self.names.append(name)
+        for values, (_, position) in zip(self.amounts, self.month_columns):
+            values.append(StreamingSheetReader._to_float(row[position] if position < len(row) else None))
+
+    def header_group(self, header):
+        labels = ExcelParser._header_labels(header)
+        name_col = labels[self.name_position] if self.name_position < len(labels) else f"Unnamed: {self.name_position}"
+        return (
+            name_col,
+            np.array(self.names, dtype=object),
+            [(month_name, labels[position], np.frombuffer(values, dtype=float))
+             for (month_name, position), values in zip(self.month_columns, self.amounts)]
+        )
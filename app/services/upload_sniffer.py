@@ -0,0 +1,205 @@
+# app/services/upload_sniffer.py
+import os
+import struct
+import hashlib
+import zipfile
+from tempfile import SpooledTemporaryFile
+
+from flask import Request, current_app
+
+XLSX_MAGIC = b'PK\x03\x04'
+XLS_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+
+# Magic bytes accepted per extension; pandas reads .xls files that are really xlsx
+EXPECTED_MAGIC = {
+    'xlsx': (XLSX_MAGIC,),
+    'xls': (XLS_MAGIC, XLSX_MAGIC),
+}
+
+# Bytes of a text upload checked for binary content
+TEXT_SNIFF_BYTES = 8192
+
+
+class UploadRejected(ValueError):
+    """An upload failed the streaming pre-check"""
+
+
+class UploadSniffer:
+    """Writable upload stream that validates bytes as they arrive.
+
+    Werkzeug writes each multipart file part into the stream returned by
+    ``Request._get_file_stream``; this one checks the magic bytes against
+    the file extension on the first chunk and, for xlsx, walks the zip
+    local file headers to total the declared decompressed size. A bad
+    upload raises UploadRejected mid-request instead of being saved and
+    parsed. ``verify`` re-checks the zip central directory once the upload
+    is complete.
+
+    Werkzeug's form parser swallows ValueErrors, so the rejection is also
+    kept on ``rejection`` for SniffingRequest to report. The bytes are
+    hashed as they are written, so the upload store gets the content
+    digest without reading the file again.
+    """
+
+    def __init__(self, filename, max_uncompressed_bytes, max_members, spool_bytes=500 * 1024):
+        self.extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+        self.max_uncompressed_bytes = max_uncompressed_bytes
+        self.max_members = max_members
+        self._file = SpooledTemporaryFile(max_size=spool_bytes, mode='rb+')
+        self._head = b''
+        self._sniffed = False
+        # Zip walk state: buffered header bytes and bytes of member data to skip
+        self._zip_active = self.extension in ('xlsx', 'xls')
+        self._pending = b''
+        self._skip = 0
+        self.members = 0
+        self.uncompressed_bytes = 0
+        self.rejection = None
+        self._sha256 = hashlib.sha256()
+
+    def hexdigest(self):
+        """SHA-256 of every byte written so far"""
+        return self._sha256.hexdigest()
+
+    def write(self, data):
+        try:
+            if self._sniffed:
+                if self._zip_active:
+                    self._walk_zip(data)
+            else:
+                self._head += data
+                text = self.extension in ('csv', 'tsv')
+                if len(self._head) >= (TEXT_SNIFF_BYTES if text else len(XLS_MAGIC)):
+                    self._sniff_head()
+        except UploadRejected as e:
+            self.rejection = e
+            raise
+        self._sha256.update(data)
+        return self._file.write(data)
+
+    def verify(self):
+        """Final checks once the whole upload has been received"""
+        if self.rejection is not None:
+            raise self.rejection
+        if not self._sniffed:
+            if not self._head:
+                raise UploadRejected("The uploaded file is empty.")
+            self._sniff_head()
+
+        if self._head.startswith(XLSX_MAGIC):
+            position = self._file.tell()
+            try:
+                self._file.seek(0)
+                with zipfile.ZipFile(self._file) as archive:
+                    infos = archive.infolist()
+                    names = {info.filename for info in infos}
+            except zipfile.BadZipFile:
+                raise UploadRejected("The workbook is not a valid xlsx file.")
+            finally:
+                self._file.seek(position)
+
+            self._check_totals(len(infos), sum(info.file_size for info in infos))
+            if 'xl/workbook.xml' not in names:
+                raise UploadRejected("The file is a zip archive but not an Excel workbook.")
+
+    def _sniff_head(self):
+        """Check the buffered first bytes, then walk any zip headers they hold"""
+        self._sniff(self._head)
+        if self._zip_active:
+            self._walk_zip(self._head)
+
+    def _sniff(self, head):
+        self._sniffed = True
+        expected = EXPECTED_MAGIC.get(self.extension)
+        if expected is not None:
+            if not head.startswith(expected):
+                raise UploadRejected(f"The file does not look like an Excel .{self.extension} workbook.")
+            # Only zip packages have local headers to walk
+            self._zip_active = head.startswith(XLSX_MAGIC)
+        elif self.extension in ('csv', 'tsv'):
+            sample = head[:TEXT_SNIFF_BYTES]
+            if b'\x00' in sample or sample.startswith((XLSX_MAGIC, XLS_MAGIC)):
+                raise UploadRejected(f"The file does not look like a .{self.extension} text file.")
+
+    def _walk_zip(self, data):
+        """Follow local file headers through the stream, totalling declared sizes"""
+        if self._skip:
+            skipped = min(self._skip, len(data))
+            self._skip -= skipped
+            data = data[skipped:]
+        self._pending += data
+
+        while self._zip_active and not self._skip and len(self._pending) >= 4:
+            signature = self._pending[:4]
+            if signature != XLSX_MAGIC:
+                # Central directory (or a data descriptor we cannot size): the
+                # rest is checked by verify()
+                self._zip_active = False
+                break
+            if len(self._pending) < LOCAL_HEADER.size:
+                break
+
+            fields = LOCAL_HEADER.unpack_from(self._pending)
+            flags, compressed, uncompressed, name_length, extra_length = fields[2], fields[7], fields[8], fields[9], fields[10]
+            if flags & 0x08:
+                # Sizes follow the data in a descriptor; leave it to verify()
+                self._zip_active = False
+                break
+
+            self.members += 1
+            self.uncompressed_bytes += uncompressed
+            self._check_totals(self.members, self.uncompressed_bytes)
+
+            header_length = LOCAL_HEADER.size + name_length + extra_length
+            total = header_length + compressed
+            if len(self._pending) >= total:
+                self._pending = self._pending[total:]
+            else:
+                self._skip = total - len(self._pending)
+                self._pending = b''
+
+        if not self._zip_active:
+            self._pending = b''
+
+    def _check_totals(self, members, uncompressed_bytes):
+        if members > self.max_members:
+            raise UploadRejected(f"The workbook has more than {self.max_members} parts.")
+        if uncompressed_bytes > self.max_uncompressed_bytes:
+            raise UploadRejected(
+                f"The workbook expands to more than {self.max_uncompressed_bytes // (1024 * 1024)} MB."
+            )
+
+    def __getattr__(self, name):
+        # seek/read/tell/close... are served by the spooled file
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+
+class SniffingRequest(Request):
+    """Request whose file uploads are checked by UploadSniffer while they stream in"""
+
+    @property
+    def upload_rejection(self):
+        """The UploadRejected that stopped form parsing, if any"""
+        for sniffer in self.__dict__.get('_upload_sniffers', ()):
+            if sniffer.rejection is not None:
+                return sniffer.rejection
+        return None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+        if extension not in config.get('ALLOWED_EXTENSIONS', ()):
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+        sniffer = UploadSniffer(
+            filename,
+            max_uncompressed_bytes=config.get('UPLOAD_MAX_UNCOMPRESSED_MB', 200) * 1024 * 1024,
+            max_members=config.get('UPLOAD_MAX_ZIP_MEMBERS', 5000),
+        )
+        self.__dict__.setdefault('_upload_sniffers', []).append(sniffer)
+        return sniffer
@@ -0,0 +1,100 @@
+# app/services/upload_store.py
+import os
+import re
+import shutil
+import hashlib
+import tempfile
+
+from flask import current_app, has_app_context
+
+from app.services.upload_sniffer import UploadSniffer
+
+
+class UploadStore:
+    """Content-addressed store for uploaded workbooks.
+
+    Each upload is kept once under UPLOAD_FOLDER/objects/<ab>/<sha256>.<ext>,
+    where the SHA-256 of its bytes is the canonical key. The digest is taken
+    while the upload streams in (by UploadSniffer) or while it is copied
+    into the store, so re-uploading the same workbook under any filename
+    resolves to the existing object without a second write, and uploads that
+    share a filename can no longer overwrite each other. Objects are never
+    modified once written, so the digest in a stored path can key the parse
+    and report caches directly.
+    """
+
+    OBJECTS_DIR = 'objects'
+
+    CHUNK_SIZE = 1024 * 1024
+
+    DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+    @property
+    def root(self):
+        return os.path.join(current_app.config['UPLOAD_FOLDER'], self.OBJECTS_DIR)
+
+    def path_for(self, digest, extension):
+        return os.path.join(self.root, digest[:2], f"{digest}.{extension.lower()}")
+
+    def save(self, file, extension):
+        """Store an uploaded FileStorage; return (digest, path, created)"""
+        stream = file.stream
+        if isinstance(stream, UploadSniffer):
+            # Already hashed on the way in: a duplicate costs no write at all
+            digest = stream.hexdigest()
+            path = self.path_for(digest, extension)
+            if self._reuse(path):
+                return digest, path, False
+
+        stream.seek(0)
+        digest, temp_path = self._write_temp(stream)
+        path = self.path_for(digest, extension)
+        if self._reuse(path):
+            os.remove(temp_path)
+            return digest, path, False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+        return digest, path, True
+
+    def digest_of(self, filepath):
+        """Return the content digest of a stored object path, or None for other files"""
+        if not has_app_context() or 'UPLOAD_FOLDER' not in current_app.config:
+            return None
+
+        filepath = os.path.abspath(str(filepath))
+        shard_dir = os.path.dirname(filepath)
+        if os.path.dirname(shard_dir) != os.path.abspath(self.root):
+            return None
+
+        digest = os.path.splitext(os.path.basename(filepath))[0]
+        if not self.DIGEST_PATTERN.match(digest) or os.path.basename(shard_dir) != digest[:2]:
+            return None
+        return digest
+
+    @staticmethod
+    def _reuse(path):
+        """Refresh an existing object's mtime so upload retention counts from its latest use"""
+        if not os.path.exists(path):
+            return False
+        os.utime(path)
+        return True
+
+    def _write_temp(self, stream):
+        """Copy a stream into a temporary file in the store, hashing it in chunks"""
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(prefix='.incoming_', dir=self.root)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in iter(lambda: stream.read(self.CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return digest.hexdigest(), temp_path
+
+
+# Singleton instance
+upload_store = UploadStore()
@@ -18,6 +18,14 @@ document.addEventListener('DOMContentLoaded', function() {
     const monthSelect = document.getElementById('month');
     const selectedMonthYear = document.getElementById('selectedMonthYear');
     const uploadForm = document.getElementById('uploadForm');
+    const previewUrl = uploadForm ? uploadForm.dataset.previewUrl : null;
+
+    // Latest structure preview of the selected file (null until one returns)
+    let lastPreview = null;
+
+    // In-flight preview request and the number of the newest one; older responses are ignored
+    let previewController = null;
+    let previewRequest = 0;
 
     // Month names for display
     const monthNames = ['January', 'February', 'March', 'April', 'May', 'June', 
@@ -46,6 +54,11 @@ document.addEventListener('DOMContentLoaded', function() {
         monthSelect.addEventListener('change', updateDateDisplay);
     }
 
+    if (yearSelect && monthSelect) {
+        yearSelect.addEventListener('change', previewUpload);
+        monthSelect.addEventListener('change', previewUpload);
+    }
+
     // Toggle between file upload and Google Sheets
     function toggleInputMethod() {
         if (!fileUploadToggle || !sheetsToggle) return;
@@ -160,9 +173,11 @@ document.addEventListener('DOMContentLoaded', function() {
     function handleFile(file) {
         const validTypes = [
             'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'application/vnd.ms-excel'
+            'application/vnd.ms-excel',
+            'text/csv',
+            'text/tab-separated-values'
         ];
-        const validExtensions = ['.xlsx', '.xls'];
+        const validExtensions = ['.xlsx', '.xls', '.csv', '.tsv'];
         
         const isValidType = validTypes.includes(file.type);
         const isValidExtension = validExtensions.some(ext => 
@@ -182,13 +197,60 @@ document.addEventListener('DOMContentLoaded', function() {
             fileInput.files = dataTransfer.files;
             
             showToast('File selected successfully', 'success');
+            previewUpload();
         } else {
-            showToast('Please select a valid Excel file (.xlsx, .xls)', 'error');
+            showToast('Please select a valid Excel or CSV file (.xlsx, .xls, .csv, .tsv)', 'error');
             resetFileInput();
         }
     }
 
+    // Check the selected file's sheets and columns before the full upload
+    function previewUpload() {
+        cancelPreview();
+        if (!previewUrl || !fileInput || fileInput.files.length === 0) return;
+        if (sheetsToggle && sheetsToggle.checked) return;
+
+        const formData = new FormData();
+        formData.append('file', fileInput.files[0]);
+        if (yearSelect) formData.append('year', yearSelect.value);
+        if (monthSelect) formData.append('month', monthSelect.value);
+
+        const request = previewRequest;
+        previewController = new AbortController();
+
+        fetch(previewUrl, { method: 'POST', body: formData, signal: previewController.signal })
+            .then(response => response.json())
+            .then(preview => {
+                // A newer file, year or month was chosen while this one ran
+                if (request !== previewRequest) return;
+                lastPreview = preview;
+                if (preview.valid) {
+                    const structure = preview.structure;
+                    if (structure) {
+                        showToast(`Sheet "${structure.sheet}": header on row ${structure.header_row}, ${structure.months.length} months found`, 'success');
+                    }
+                } else {
+                    showToast(preview.errors.join(' '), 'error');
+                }
+            })
+            .catch(() => {
+                // Preview is advisory; the upload itself still validates
+                if (request === previewRequest) lastPreview = null;
+            });
+    }
+
+    // Abort the preview in flight and forget its result
+    function cancelPreview() {
+        previewRequest += 1;
+        lastPreview = null;
+        if (previewController) {
+            previewController.abort();
+            previewController = null;
+        }
+    }
+
     function resetFileInput() {
+        cancelPreview();
         if (fileInput) {
             fileInput.value = '';
             // Clear the file list
@@ -245,14 +307,17 @@ document.addEventListener('DOMContentLoaded', function() {
                 errorMessage = 'Please select an Excel file';
             } else {
                 const file = fileInput.files[0];
-                const validExtensions = ['.xlsx', '.xls'];
+                const validExtensions = ['.xlsx', '.xls', '.csv', '.tsv'];
                 const isValidExtension = validExtensions.some(ext => 
                     file.name.toLowerCase().endsWith(ext)
                 );
                 
                 if (!isValidExtension) {
                     isValid = false;
-                    errorMessage = 'Please select a valid Excel file (.xlsx, .xls)';
+                    errorMessage = 'Please select a valid Excel or CSV file (.xlsx, .xls, .csv, .tsv)';
+                } else if (lastPreview && !lastPreview.valid) {
+                    isValid = false;
+                    errorMessage = lastPreview.errors.join(' ');
                 }
             }
         }
@@ -91,7 +91,7 @@ class FileProcessor:
             return None
         
         try:
-            spreadsheet = client.open_by_url(sheet_url)
+            spreadsheet = google_sheets_service.open_spreadsheet(sheet_url, client)
             worksheets = spreadsheet.worksheets()
             
             # Try different matching strategies
@@ -116,14 +116,14 @@ class FileProcessor:
                         logger.info(f"Found matching sheet: {ws.title} for pattern: {pattern}")
                         return google_sheets_service.get_sheet_data(sheet_url, ws.title)
             
+            # Leading rows of every tab in one batchGet, instead of a request per tab
+            leading_rows = google_sheets_service.batch_get_values(
+                spreadsheet, [ws.title for ws in worksheets], max_rows=2
+            )
             for ws in worksheets:
-                try:
-                    data = ws.get_all_values()
-                    if len(data) > 1: 
-                        logger.info(f"Using first sheet with data: {ws.title}")
-                        return google_sheets_service.get_sheet_data(sheet_url, ws.title)
-                except:
-                    continue
+                if len(leading_rows.get(ws.title, [])) > 1:
+                    logger.info(f"Using first sheet with data: {ws.title}")
+                    return google_sheets_service.get_sheet_data(sheet_url, ws.title)
             
             return None
             
@@ -430,7 +430,7 @@ class GoogleSheetsManager:
                 return {'status': 'error', 'message': 'Failed to authenticate with Google Sheets'}
             
             # Try to access the sheet
-            spreadsheet = client.open_by_url(sheet_url)
+            spreadsheet = google_sheets_service.open_spreadsheet(sheet_url, client)
             worksheets = spreadsheet.worksheets()
             
             return {
@@ -453,7 +453,7 @@ class GoogleSheetsManager:
             if not client:
                 return None
             
-            spreadsheet = client.open_by_url(sheet_url)
+            spreadsheet = google_sheets_service.open_spreadsheet(sheet_url, client)
             
             info = {
                 'title': spreadsheet.title,
@@ -464,11 +464,22 @@ class GoogleSheetsManager:
                 'created_time': None    
             }
             
-            for ws in spreadsheet.worksheets():
+            # Grid sizes come from the spreadsheet metadata; every tab's
+            # values are fetched in one batchGet
+            worksheets = spreadsheet.worksheets()
+            try:
+                all_values = google_sheets_service.batch_get_values(spreadsheet, [ws.title for ws in worksheets])
+            except Exception as e:
+                logger.warning(f"Could not fetch worksheet values: {str(e)}")
+                all_values = {}
+            
+            for ws in worksheets:
                 try:
                     row_count = ws.row_count
                     col_count = ws.col_count
-                    values = ws.get_all_values()
+                    if ws.title not in all_values:
+                        raise ValueError("No values returned for worksheet")
+                    values = all_values[ws.title]
                     data_row_count = len(values) - 1 if len(values) > 1 else 0  
                     
                     info['worksheets'].append({
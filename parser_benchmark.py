@@ -0,0 +1,267 @@
+# parser_benchmark.py
+"""Time ExcelParser against a synthetic multi-year contribution workbook.
+
+Usage:
+    python parser_benchmark.py [--years 10] [--members 5000] [--repeat 3]
+    python parser_benchmark.py --engines [--years 2] [--members 5000]
+    python parser_benchmark.py --sheets-cleaning [--members 20000] [--columns 98]
+
+ExcelParser.parse_excel is timed cold (parse and layout caches cleared
+before every repeat, i.e. a first upload) and warm (caches filled by the
+previous call, i.e. a re-upload of the same workbook) and the two are
+reported separately.
+``--engines`` times every installed spreadsheet engine on the same synthetic
+data (xlsx, plus a CSV export) and reports rows/sec for a cold parse and the
+time of a warm one (the same file again, caches filled).
+``--sheets-cleaning`` times GoogleSheetsService._clean_dataframe against the
+row-wise cleaning it replaced, on a synthetic tab as get_all_values returns it.
+"""
+import argparse
+import calendar
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from app.services.excel_parser import ExcelParser
+from app.services.parse_cache import parse_cache
+from app.services.layout_cache import layout_cache
+from app.services.spreadsheet_engines import engine_registry
+from app.services.google_sheets_service import GoogleSheetsService
+
+
+def build_workbook(path, years, members, seed=2018):
+    """Write a workbook with one sheet per year laid out like the welfare books"""
+    rng = np.random.default_rng(seed)
+    months = [calendar.month_name[m] for m in range(1, 13)]
+    names = [f"Member {i:05d}" for i in range(members)]
+    
+    with pd.ExcelWriter(path) as writer:
+        for year in years:
+            amounts = rng.choice([1000.0, 2000.0, np.nan], size=(members, 12), p=[0.6, 0.2, 0.2])
+            rows = [
+                [f"MZUGOSS WELFARE CONTRIBUTIONS {year}"],
+                ["Money Dispensed", float(rng.integers(10_000, 500_000))],
+                ["Total Book Balance", float(rng.integers(100_000, 5_000_000))],
+                [],
+                ["Name", *months, "Total"],
+            ]
+            rows.extend([name, *row, np.nansum(row)] for name, row in zip(names, amounts))
+            pd.DataFrame(rows).to_excel(writer, sheet_name=str(year), header=False, index=False)
+
+
+def legacy_find_month_row(df, month_name):
+    """The row-by-row month header search parse_excel used before SheetIndex"""
+    for i, row in df.iterrows():
+        for cell in row:
+            if pd.notna(cell) and month_name.lower() in str(cell).lower():
+                return i
+    return None
+
+
+def legacy_financial_info(raw_df):
+    """The row-by-row financial label search parse_excel used before SheetIndex"""
+    money_dispensed = None
+    total_book_balance = None
+    
+    for i, row in raw_df.iterrows():
+        for cell in row:
+            if pd.notna(cell) and isinstance(cell, str):
+                cell_lower = cell.lower()
+                if "money dispensed" in cell_lower:
+                    money_dispensed = ExcelParser._extract_numeric_value(raw_df, i, 1)
+                elif "total book balance" in cell_lower:
+                    total_book_balance = ExcelParser._extract_numeric_value(raw_df, i, 1)
+    
+    return {
+        'money_dispensed': money_dispensed,
+        'total_book_balance': total_book_balance
+    }
+
+
+def legacy_month_column(df, month_name):
+    """The header string match for the month column"""
+    for col in df.columns:
+        if pd.notna(col) and month_name.lower() in str(col).lower():
+            return col
+    raise ValueError(f"No column found for month {month_name}")
+
+
+def legacy_name_column(df):
+    """The per-column scan for a cell mentioning the name label"""
+    for col in df.columns:
+        if df[col].dropna().apply(lambda x: isinstance(x, str) and "name" in x.lower()).any():
+            return col
+    return df.columns[0]
+
+
+def legacy_parse(filepath, year, month):
+    """The original parse: decode every sheet, find labels row by row, then re-read the year sheet"""
+    month_name = calendar.month_name[month]
+    all_sheets = pd.read_excel(filepath, sheet_name=None, header=None)
+    year_sheet = ExcelParser._find_year_sheet(list(all_sheets), year)
+    raw_df = all_sheets[year_sheet]
+    legacy_financial_info(raw_df)
+    month_row = legacy_find_month_row(raw_df, month_name)
+    df = pd.read_excel(filepath, sheet_name=year_sheet, header=month_row)
+    month_col = legacy_month_column(df, month_name)
+    name_col = legacy_name_column(df)
+    return df[[name_col, month_col]]
+
+
+def build_csv(path, year, members, seed=2018):
+    """Write the year sheet of ``build_workbook`` as a flat CSV export"""
+    rng = np.random.default_rng(seed)
+    months = [calendar.month_name[m] for m in range(1, 13)]
+    amounts = rng.choice([1000.0, 2000.0, np.nan], size=(members, 12), p=[0.6, 0.2, 0.2])
+    rows = [
+        [f"MZUGOSS WELFARE CONTRIBUTIONS {year}"],
+        ["Money Dispensed", 250000.0],
+        ["Total Book Balance", 2500000.0],
+        [],
+        ["Name", *months, "Total"],
+    ]
+    rows.extend([f"Member {i:05d}", *row, np.nansum(row)] for i, row in enumerate(amounts))
+    pd.DataFrame(rows).to_csv(path, header=False, index=False)
+
+
+def benchmark_engines(tmp, years, members, repeat):
+    """Print rows/sec for each installed engine that supports each file type"""
+    xlsx_path = os.path.join(tmp, 'synthetic_contributions.xlsx')
+    csv_path = os.path.join(tmp, 'synthetic_contributions.csv')
+    build_workbook(xlsx_path, years, members)
+    build_csv(csv_path, years[-1], members)
+    
+    print(f"Registered engines: {', '.join(engine_registry.names())}")
+    print(f"Installed engines:  {', '.join(engine_registry.available())}")
+    print("=" * 60)
+    print(f"{'file':<8}{'engine':<20}{'cold s':>10}{'rows/sec':>14}{'warm s':>10}")
+    
+    for path in (xlsx_path, csv_path):
+        extension = os.path.splitext(path)[1].lstrip('.')
+        preferred = engine_registry.select(path).name
+        for name in engine_registry.available():
+            engine = engine_registry.get(name)
+            if not engine.supports(path):
+                continue
+
+            def parse():
+                ExcelParser.parse_year(path, years[-1], engine=name)
+
+            # Cold times the decode; warm follows a call that filled the caches
+            seconds = time_call(parse, repeat, cold=True)
+            parse()
+            warm = time_call(parse, repeat)
+            marker = ' *' if name == preferred else ''
+            print(f"{extension:<8}{name + marker:<20}{seconds:>10.3f}{members / seconds:>14,.0f}{warm:>10.3f}")
+    print("* = selected automatically")
+
+
+def legacy_clean(df):
+    """The row-wise Sheets frame cleaning: every column coerced to numbers"""
+    df = df.dropna(how='all')
+    if df.empty:
+        return df
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    for col in df.columns:
+        if df[col].isna().all():
+            continue
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df.reset_index(drop=True)
+
+
+def build_sheet_frame(rows, columns, seed=2018):
+    """A tab as get_all_values returns it: names, then amounts as text with blanks and "-" placeholders"""
+    rng = np.random.default_rng(seed)
+    amounts = rng.choice(['1000', '2000', '1,500', '', '-'], size=(rows, columns - 1), p=[0.5, 0.15, 0.1, 0.2, 0.05])
+    frame = pd.DataFrame(amounts, columns=[f"Column {i}" for i in range(1, columns)])
+    frame.insert(0, 'Name', [f"Member {i:05d}" for i in range(rows)])
+    return frame
+
+
+def benchmark_sheets_cleaning(rows, columns, repeat):
+    frame = build_sheet_frame(rows, columns)
+    service = GoogleSheetsService()
+    print(f"Sheets frame: {rows} rows x {columns} columns")
+    print("=" * 60)
+    
+    before = time_call(lambda: legacy_clean(frame.copy()), repeat)
+    after = time_call(lambda: service._clean_dataframe(frame.copy()), repeat)
+    print(f"{'row-wise cleaning':<34}{before:>10.3f}s")
+    print(f"{'_clean_dataframe':<34}{after:>10.3f}s  {before / after:>6.2f}x")
+
+
+def clear_caches():
+    parse_cache.clear()
+    layout_cache.clear()
+
+
+def time_call(func, repeat, cold=False):
+    """Return the best wall time of ``repeat`` calls
+    
+    With ``cold`` the parse and layout caches are cleared before every
+    call, so no repeat is served from work done by an earlier one.
+    """
+    timings = []
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--members', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--engines', action='store_true', help='compare spreadsheet engines (rows/sec)')
+    parser.add_argument('--sheets-cleaning', action='store_true', help='time cleaning of a fetched Sheets frame')
+    parser.add_argument('--columns', type=int, default=98, help='columns of the --sheets-cleaning frame')
+    args = parser.parse_args()
+    
+    if args.sheets_cleaning:
+        benchmark_sheets_cleaning(args.members, args.columns, args.repeat)
+        return
+    
+    years = list(range(2025 - args.years, 2025))
+    target_year, target_month = years[-1], 6
+    
+    app = Flask(__name__)
+    with app.app_context(), tempfile.TemporaryDirectory() as tmp:
+        if args.engines:
+            print(f"Building workbooks: {args.years} years x {args.members} members ...")
+            benchmark_engines(tmp, years, args.members, args.repeat)
+            return
+        
+        path = os.path.join(tmp, 'synthetic_contributions.xlsx')
+        print(f"Building workbook: {args.years} years x {args.members} members ...")
+        build_workbook(path, years, args.members)
+        print(f"Workbook size: {os.path.getsize(path) / (1024 * 1024):.2f} MB")
+        print("=" * 60)
+        
+        def parse():
+            ExcelParser.parse_excel(path, year=target_year, month=target_month)
+        
+        before = time_call(lambda: legacy_parse(path, target_year, target_month), args.repeat, cold=True)
+        cold = time_call(parse, args.repeat, cold=True)
+        # Warm: every timed call follows one that filled the caches
+        clear_caches()
+        parse()
+        warm = time_call(parse, args.repeat)
+        
+        print(f"{'legacy double read':<34}{before:>10.3f}s")
+        print(f"{'parse_excel, cold caches':<34}{cold:>10.3f}s  {before / cold:>6.2f}x")
+        print(f"{'parse_excel, warm caches':<34}{warm:>10.3f}s  {before / warm:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
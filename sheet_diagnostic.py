@@ -27,12 +27,15 @@ def diagnose_all_sheets():
             worksheets = result['worksheet_names']
             print(f"\nWorksheets: {worksheets}")
             
+            # Download every tab in parallel, then report them in order
+            frames = google_sheets_service.get_sheets_data(sheet_url, worksheets)
+            
             for sheet_name in worksheets:
                 print(f"\n{'='*40}")
                 print(f"SHEET: {sheet_name}")
                 print(f"{'='*40}")
                 
-                df = google_sheets_service.get_sheet_data(sheet_url, sheet_name)
+                df = frames.get(sheet_name)
                 
                 if df is not None:
                     print(f"Shape: {df.shape}")
@@ -0,0 +1,59 @@
+# tests/conftest.py
+import calendar
+
+import openpyxl
+import pytest
+from flask import Flask
+
+from app.services.layout_cache import layout_cache
+from app.services.parse_cache import parse_cache
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Bare Flask app with the folders the parser and caches write to"""
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        TEMP_FOLDER=str(tmp_path / 'temp'),
+        UPLOAD_FOLDER=str(tmp_path / 'uploads'),
+        REPORTS_FOLDER=str(tmp_path / 'reports'),
+        GOOGLE_SHEETS_SNAPSHOTS=False,
+    )
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture(autouse=True)
+def clear_parser_caches():
+    """The parser caches are process-wide singletons; start every test cold"""
+    parse_cache.clear()
+    layout_cache.clear()
+    yield
+    parse_cache.clear()
+    layout_cache.clear()
+
+
+def contribution_rows(months, members=5, financial=True, amount=10):
+    """Rows of a year sheet: the financial labels, a header naming ``months``, then member rows.
+    
+    Without ``financial`` the money dispensed row is left blank, so the
+    header stays on the same row either way.
+    """
+    rows = [
+        ['Money Dispensed', 100] if financial else [None],
+        ['Total Book Balance', 200],
+        ['Name'] + [calendar.month_name[m] for m in months],
+    ]
+    rows += [[f"Member {i}"] + [amount * m for m in months] for i in range(members)]
+    return rows
+
+
+def write_workbook(path, rows, sheet_name='2024'):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = sheet_name
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+    return str(path)
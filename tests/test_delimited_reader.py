@@ -0,0 +1,56 @@
+# tests/test_delimited_reader.py
+import pytest
+
+from app.services.excel_parser import ExcelParser
+
+CSV_WITH_SEPARATORS = (
+    'MZUGOSS WELFARE CONTRIBUTIONS 2024\n'
+    'Money Dispensed,"95,418"\n'
+    'Total Book Balance,"4,114,004.50"\n'
+    '\n'
+    'Name,January,February\n'
+    'Member 1,"1,000",500\n'
+    'Member 2,2000,"1,500.50"\n'
+    'Member 3,,\n'
+)
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_quoted_thousands_amount_counts_as_paid(app, tmp_path):
+    path = write(tmp_path, 'book.csv', CSV_WITH_SEPARATORS)
+
+    result = ExcelParser.parse_excel(path, 2024, 1, engine='csv')
+
+    assert result['total_contributions'] == 3000
+    assert result['num_contributors'] == 2
+    assert result['defaulters'] == ['Member 3']
+    assert result['money_dispensed'] == 95418
+    assert result['total_book_balance'] == 4114004.5
+
+
+def test_thousands_amount_next_to_text_placeholder(app, tmp_path):
+    # "-" forces the text fallback; "1,000" must still parse
+    path = write(tmp_path, 'book.csv', CSV_WITH_SEPARATORS.replace('Member 3,,', 'Member 3,-,-'))
+
+    january = ExcelParser.parse_excel(path, 2024, 1, engine='csv')
+    february = ExcelParser.parse_excel(path, 2024, 2, engine='csv')
+
+    assert january['total_contributions'] == 3000
+    assert january['defaulters'] == ['Member 3']
+    assert february['total_contributions'] == pytest.approx(2000.5)
+
+
+def test_tsv_matches_csv(app, tmp_path):
+    tsv = CSV_WITH_SEPARATORS.replace('"', '').replace(',', '\t').replace('1\t000', '1,000')
+    tsv = tsv.replace('95\t418', '95,418').replace('4\t114\t004.50', '4,114,004.50').replace('1\t500.50', '1,500.50')
+    path = write(tmp_path, 'book.tsv', tsv)
+
+    result = ExcelParser.parse_excel(path, 2024, 1, engine='csv')
+
+    assert result['total_contributions'] == 3000
+    assert result['money_dispensed'] == 95418
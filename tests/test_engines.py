@@ -0,0 +1,67 @@
+# tests/test_engines.py
+import csv
+
+import pytest
+
+from app.services.excel_parser import ExcelParser
+from app.services.layout_cache import layout_cache
+from tests.conftest import contribution_rows, write_workbook
+
+ENGINES = ['openpyxl', 'openpyxl-readonly', 'grid', 'csv']
+
+# Engines that replay cached layouts; csv detects its columns in a small sample every time
+LAYOUT_ENGINES = ['openpyxl', 'openpyxl-readonly', 'grid']
+
+
+def parse(tmp_path, engine, rows, month):
+    if engine == 'grid':
+        return ExcelParser.parse_grid(rows, '2024', 2024, month)
+    if engine == 'csv':
+        path = tmp_path / 'export.csv'
+        with open(path, 'w', newline='') as f:
+            csv.writer(f).writerows(rows)
+        return ExcelParser.parse_excel(str(path), 2024, month, engine=engine)
+    path = write_workbook(tmp_path / f"{engine}.xlsx", rows)
+    return ExcelParser.parse_excel(path, 2024, month, engine=engine)
+
+
+def titled_rows():
+    """A title naming one month above the real header, and a financial value marked n/a"""
+    rows = [['Report for March 2024']] + contribution_rows(range(1, 13))
+    rows[1] = ['Money Dispensed', 'n/a']
+    return rows
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('month', [1, 6, 12])
+def test_title_row_naming_a_month_does_not_hide_the_header(app, tmp_path, engine, month):
+    result = parse(tmp_path, engine, titled_rows(), month)
+
+    assert result['total_contributions'] == 5 * 10 * month
+    assert result['num_contributors'] == 5
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engines_agree_on_a_titled_sheet(app, tmp_path, engine):
+    expected = parse(tmp_path, 'openpyxl', titled_rows(), 3)
+    result = parse(tmp_path, engine, titled_rows(), 3)
+
+    for key in ('name_col', 'month_col', 'total_contributions', 'num_contributors', 'defaulters'):
+        assert result[key] == expected[key]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_na_financial_value_is_none(app, tmp_path, engine):
+    result = parse(tmp_path, engine, titled_rows(), 1)
+
+    assert result['money_dispensed'] is None
+    assert result['total_book_balance'] == 200
+
+
+@pytest.mark.parametrize('engine', LAYOUT_ENGINES)
+def test_cached_layout_of_a_titled_sheet_is_replayed(app, tmp_path, engine):
+    cold = parse(tmp_path, engine, titled_rows(), 7)
+    warm = parse(tmp_path, engine, titled_rows(), 7)
+
+    assert layout_cache.stats()['hits'] == 1
+    assert warm['total_contributions'] == cold['total_contributions'] == 5 * 70
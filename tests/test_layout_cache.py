@@ -0,0 +1,95 @@
+# tests/test_layout_cache.py
+import pytest
+
+from app.services.excel_parser import ExcelParser
+from app.services.layout_cache import layout_cache
+from app.services.parse_cache import parse_cache
+from tests.conftest import contribution_rows, write_workbook
+
+ENGINES = ['openpyxl', 'openpyxl-readonly', 'grid']
+
+
+def parse(tmp_path, engine, rows, month, name):
+    """parse_excel through a workbook engine, or parse_grid for the Google Sheets path"""
+    if engine == 'grid':
+        return ExcelParser.parse_grid(rows, '2024', 2024, month)
+    path = write_workbook(tmp_path / f"{name}.xlsx", rows)
+    return ExcelParser.parse_excel(path, 2024, month, engine=engine)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_layout_is_reused_for_the_same_structure(app, tmp_path, engine):
+    parse(tmp_path, engine, contribution_rows(range(1, 7)), 1, 'first')
+    result = parse(tmp_path, engine, contribution_rows(range(1, 7), amount=20), 2, 'second')
+
+    assert result['total_contributions'] == 5 * 40
+    assert layout_cache.stats()['hits'] == 1
+    assert layout_cache.stats()['invalidations'] == 0
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_month_added_after_layout_was_cached(app, tmp_path, engine):
+    parse(tmp_path, engine, contribution_rows(range(1, 7)), 1, 'jan_jun')
+    result = parse(tmp_path, engine, contribution_rows(range(1, 8)), 7, 'jan_jul')
+
+    assert result['month'] == 'July'
+    assert result['total_contributions'] == 5 * 70
+    assert layout_cache.stats()['invalidations'] == 1
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_financial_label_added_after_layout_was_scanned(app, tmp_path, engine):
+    first = parse(tmp_path, engine, contribution_rows(range(1, 7), financial=False), 3, 'without_label')
+    second = parse(tmp_path, engine, contribution_rows(range(1, 7)), 3, 'with_label')
+
+    assert first['money_dispensed'] is None
+    assert second['money_dispensed'] == 100
+    assert second['total_book_balance'] == 200
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_moved_header_invalidates_cached_layout(app, tmp_path, engine):
+    parse(tmp_path, engine, contribution_rows(range(1, 7)), 1, 'plain')
+    result = parse(tmp_path, engine, [['Welfare contributions']] + contribution_rows(range(1, 7)), 1, 'titled')
+
+    assert result['total_contributions'] == 5 * 10
+    assert result['money_dispensed'] == 100
+    assert layout_cache.stats()['invalidations'] == 1
+
+
+def test_fingerprint_ignores_year_in_sheet_names():
+    assert layout_cache.fingerprint('a.xlsx', ['2024', 'Notes'], 2024) == \
+        layout_cache.fingerprint('b.xlsx', ['2025', 'Notes'], 2024)
+    assert layout_cache.fingerprint('a.xlsx', ['2024'], 2024) != layout_cache.fingerprint('a.csv', ['2024'], 2024)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_name_cell_added_below_header_matches_a_cold_parse(app, tmp_path, engine):
+    rows = contribution_rows(range(1, 7))
+    renamed = [list(row) for row in rows]
+    renamed[3] = ['Member 0', 'Member name changed'] + renamed[3][2:]
+
+    parse(tmp_path, engine, rows, 2, 'before')
+    warm = parse(tmp_path, engine, renamed, 2, 'after')
+    layout_cache.clear()
+    cold = parse(tmp_path, engine, renamed, 2, 'after_cold')
+
+    assert warm['name_col'] == cold['name_col']
+    assert warm['total_contributions'] == cold['total_contributions']
+    assert warm['defaulters'] == cold['defaulters']
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_trailing_financial_label_matches_a_cold_parse(app, tmp_path, engine):
+    rows = contribution_rows(range(1, 7)) + [[None], ['Money Dispensed', 999]]
+
+    parse(tmp_path, engine, contribution_rows(range(1, 7)), 2, 'plain')
+    warm = parse(tmp_path, engine, rows, 2, 'trailing')
+    layout_cache.clear()
+    parse_cache.clear()
+    cold = parse(tmp_path, engine, rows, 2, 'trailing')
+
+    assert layout_cache.stats()['misses'] == 1
+    assert cold['money_dispensed'] == 999
+    assert warm['money_dispensed'] == cold['money_dispensed']
+    assert warm['total_book_balance'] == cold['total_book_balance'] == 200
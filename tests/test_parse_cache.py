@@ -0,0 +1,67 @@
+# tests/test_parse_cache.py
+import shutil
+
+import pandas as pd
+
+from app.services.excel_parser import ExcelParser
+from app.services.parse_cache import parse_cache
+from tests.conftest import contribution_rows, write_workbook
+
+
+def test_repeat_parse_hits_cache(app, tmp_path):
+    path = write_workbook(tmp_path / 'book.xlsx', contribution_rows(range(1, 13)))
+
+    first = ExcelParser.parse_excel(path, 2024, 3, engine='openpyxl')
+    misses = parse_cache.stats()['misses']
+    second = ExcelParser.parse_excel(path, 2024, 3, engine='openpyxl')
+
+    assert parse_cache.stats()['misses'] == misses
+    assert parse_cache.stats()['hits'] >= 1
+    assert second['total_contributions'] == first['total_contributions'] == 5 * 30
+
+
+def test_same_bytes_under_another_name_hit_cache(app, tmp_path):
+    path = write_workbook(tmp_path / 'book.xlsx', contribution_rows(range(1, 13)))
+    copy = shutil.copy(path, tmp_path / 'renamed.xlsx')
+
+    ExcelParser.parse_excel(path, 2024, 1, engine='openpyxl')
+    hits = parse_cache.stats()['hits']
+    ExcelParser.parse_excel(copy, 2024, 1, engine='openpyxl')
+
+    assert parse_cache.stats()['hits'] > hits
+
+
+def test_edited_workbook_misses_cache(app, tmp_path):
+    path = tmp_path / 'book.xlsx'
+    write_workbook(path, contribution_rows(range(1, 13)))
+    ExcelParser.parse_excel(str(path), 2024, 1, engine='openpyxl')
+
+    write_workbook(path, contribution_rows(range(1, 13), amount=20))
+    result = ExcelParser.parse_excel(str(path), 2024, 1, engine='openpyxl')
+
+    assert result['total_contributions'] == 5 * 20
+
+
+def test_clear_resets_entries_and_counters(app):
+    parse_cache.put('digest', 'Sheet', pd.DataFrame({'a': [1, 2]}))
+    assert parse_cache.get('digest', 'Sheet') is not None
+
+    parse_cache.clear()
+
+    stats = parse_cache.stats()
+    assert (stats['entries'], stats['hits'], stats['misses']) == (0, 0, 0)
+    assert parse_cache.get('digest', 'Sheet') is None
+
+
+def test_budget_evicts_least_recently_used(app):
+    frame = pd.DataFrame({'a': range(100)})
+    app.config['PARSE_CACHE_MAX_BYTES'] = parse_cache._sizeof(frame) * 2
+
+    parse_cache.put('a', 'Sheet', frame)
+    parse_cache.put('b', 'Sheet', frame)
+    parse_cache.get('a', 'Sheet')
+    parse_cache.put('c', 'Sheet', frame)
+
+    assert parse_cache.get('b', 'Sheet') is None
+    assert parse_cache.get('a', 'Sheet') is not None
+    assert parse_cache.stats()['evictions'] == 1
@@ -0,0 +1,66 @@
+# tests/test_parse_worker.py
+import os
+
+import pytest
+
+from app.services.excel_parser import ExcelParser
+from app.services.parse_cache import parse_cache
+from app.services.parse_worker import ParseWorkerPool
+from tests.conftest import contribution_rows, write_workbook
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="parse workers need POSIX pipes")
+
+
+@pytest.fixture
+def pool(app):
+    app.config.update(PARSE_IN_SUBPROCESS=True, PARSE_WORKERS=2, PARSE_CACHE_MAX_BYTES=8 * 1024 * 1024)
+    pool = ParseWorkerPool()
+    yield pool
+    pool.shutdown()
+
+
+def test_workers_split_the_cache_budget(app):
+    app.config.update(PARSE_WORKERS=4, PARSE_CACHE_MAX_BYTES=1000)
+
+    assert ParseWorkerPool._worker_config(app.config)['PARSE_CACHE_MAX_BYTES'] == 250
+
+
+def test_stats_report_worker_caches(pool, tmp_path):
+    path = write_workbook(tmp_path / 'book.xlsx', contribution_rows(range(1, 13)))
+
+    first = pool.parse_excel(path, 2024, 3, engine='openpyxl')
+    second = pool.parse_excel(path, 2024, 4, engine='openpyxl')
+    stats = pool.stats()
+
+    assert first['total_contributions'] == 5 * 30
+    assert second['total_contributions'] == 5 * 40
+    assert stats['workers'] == 1
+    assert stats['parse_cache']['hits'] >= 1
+    assert stats['parse_cache']['max_bytes'] == 4 * 1024 * 1024
+    assert stats['layout_cache']['hits'] == 1
+    # The request process parsed nothing itself
+    assert parse_cache.stats()['hits'] == parse_cache.stats()['misses'] == 0
+
+
+def test_stats_drop_stopped_workers(pool, tmp_path):
+    path = write_workbook(tmp_path / 'book.xlsx', contribution_rows(range(1, 13)))
+    pool.parse_excel(path, 2024, 1, engine='openpyxl')
+
+    pool.shutdown()
+
+    assert pool.stats()['workers'] == 0
+
+
+def test_preview_runs_in_a_worker(pool, tmp_path, monkeypatch):
+    path = write_workbook(tmp_path / 'book.xlsx', contribution_rows(range(1, 13)))
+    expected = ExcelParser.preview(path, year=2024, month=3)
+
+    def in_process(*args, **kwargs):
+        raise AssertionError("workbook opened in the request process")
+
+    monkeypatch.setattr(ExcelParser, 'preview', in_process)
+
+    result = pool.preview(path, year=2024, month=3)
+
+    assert {**result, 'elapsed_ms': None} == {**expected, 'elapsed_ms': None}
+    assert pool.stats()['workers'] == 1
@@ -0,0 +1,90 @@
+# tests/test_report_generator.py
+import os
+
+import pytest
+
+from app.services.excel_parser import ExcelParser
+from app.services.report_generator import ReportGenerator, ReportPDF
+from tests.conftest import contribution_rows, write_workbook
+
+DIGEST = 'ab' * 32
+
+
+class RecordingPDF:
+    """Stands in for ReportPDF and keeps the text of every cell"""
+
+    def __init__(self):
+        self.text = []
+
+    def ln(self, *args):
+        pass
+
+    def set_font(self, *args, **kwargs):
+        pass
+
+    def cell(self, width, height, text='', *args):
+        self.text.append(text)
+
+
+def report_data(tmp_path, month=3):
+    rows = contribution_rows(range(1, 13))
+    # One member has not paid this month
+    rows[-1][month] = None
+    path = write_workbook(tmp_path / 'book.xlsx', rows)
+    return ExcelParser.parse_excel(path, 2024, month, engine='openpyxl')
+
+
+def fail_output(*args, **kwargs):
+    raise AssertionError("report was generated again")
+
+
+def test_reused_report_has_no_generation_time():
+    pdf = RecordingPDF()
+
+    ReportGenerator._add_report_footer(pdf, DIGEST)
+
+    assert pdf.text == [f"Report of uploaded workbook {DIGEST[:16]}"]
+
+
+def test_report_without_digest_is_timestamped():
+    pdf = RecordingPDF()
+
+    ReportGenerator._add_report_footer(pdf)
+
+    assert pdf.text[0].startswith("Report generated on: ")
+
+
+def test_report_for_same_digest_is_reused(app, tmp_path, monkeypatch):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    data = report_data(tmp_path)
+    first = ReportGenerator.generate_contribution_report(data, str(reports), source_digest=DIGEST)
+    inode = os.stat(first).st_ino
+    monkeypatch.setattr(ReportPDF, 'output', fail_output)
+
+    second = ReportGenerator.generate_contribution_report(data, str(reports), source_digest=DIGEST)
+
+    assert second == first
+    assert os.stat(second).st_ino == inode
+
+
+def test_report_is_swapped_into_place(app, tmp_path):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+
+    path = ReportGenerator.generate_contribution_report(report_data(tmp_path), str(reports), source_digest=DIGEST)
+
+    assert os.listdir(reports) == [os.path.basename(path)]
+    with open(path, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+
+
+def test_failed_report_leaves_nothing_behind(app, tmp_path, monkeypatch):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    monkeypatch.setattr(ReportPDF, 'output', fail_output)
+
+    with pytest.raises(AssertionError):
+        ReportGenerator.generate_contribution_report(report_data(tmp_path), str(reports), source_digest=DIGEST)
+
+    assert os.listdir(reports) == []
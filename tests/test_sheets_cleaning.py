@@ -0,0 +1,71 @@
+# tests/test_sheets_cleaning.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.google_sheets_service import GoogleSheetsService
+from parser_benchmark import build_sheet_frame, legacy_clean
+
+
+def fetched_frame():
+    """A tab as get_all_values returns it: strings, '' for blank cells"""
+    rows = [
+        ['Member 0', '10', '20', '1,000'],
+        ['Member 1', '', '-', '2,500'],
+        ['Member 2', '30', '40', '-'],
+        ['Member 3', '-', '', ''],
+        ['Member 4', '50.5', '60', '12,345,678'],
+    ]
+    return pd.DataFrame(rows, columns=['Name', 'January', 'February', 'March'])
+
+
+@pytest.fixture
+def service():
+    return GoogleSheetsService()
+
+
+@pytest.mark.parametrize('month', ['January', 'February'])
+def test_numeric_columns_match_legacy(service, month):
+    cleaned = service._clean_dataframe(fetched_frame())
+
+    pd.testing.assert_series_equal(cleaned[month], legacy_clean(fetched_frame())[month])
+
+
+def test_thousands_separators_are_parsed(service):
+    frame = fetched_frame()
+    cleaned = service._clean_dataframe(frame)
+    # The legacy cleaning turned every comma-formatted amount into NaN
+    expected = legacy_clean(frame.replace(',', '', regex=True))['March']
+
+    assert legacy_clean(frame)['March'].isna().all()
+    pd.testing.assert_series_equal(cleaned['March'], expected)
+    assert cleaned['March'].tolist()[:2] == [1000.0, 2500.0]
+
+
+def test_text_columns_are_kept(service):
+    cleaned = service._clean_dataframe(fetched_frame())
+
+    assert cleaned['Name'].tolist() == [f"Member {i}" for i in range(5)]
+
+
+def test_blank_rows_and_unheaded_columns_are_dropped(service):
+    frame = fetched_frame()
+    frame[''] = ''
+    frame.loc[len(frame)] = ['', '', '', '', '']
+
+    cleaned = service._clean_dataframe(frame)
+
+    assert list(cleaned.columns) == ['Name', 'January', 'February', 'March']
+    assert len(cleaned) == 5
+    assert np.isnan(cleaned['January'][1])
+
+
+def test_benchmark_frame_matches_legacy_where_it_parsed(service):
+    frame = build_sheet_frame(500, 6)
+    cleaned = service._clean_dataframe(frame)
+    legacy = legacy_clean(frame)
+    parsed = legacy.drop(columns='Name').notna()
+
+    # Same numbers wherever the row-wise cleaning produced one; it only added "1,500" and kept names
+    pd.testing.assert_frame_equal(cleaned.drop(columns='Name')[parsed], legacy.drop(columns='Name')[parsed])
+    assert (cleaned.drop(columns='Name') == 1500).sum().sum() > 0
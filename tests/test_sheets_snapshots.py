@@ -0,0 +1,88 @@
+# tests/test_sheets_snapshots.py
+import sqlite3
+import time
+
+import pytest
+
+from app.services.google_sheets_service import GoogleSheetsService
+from app.services.sheets_cache import sheets_cache
+from app.services.sheets_snapshot_store import sheets_snapshots
+
+SHEET_URL = 'https://docs.google.com/spreadsheets/d/abc123/edit'
+CACHE_KEY = f"{SHEET_URL}:2024"
+
+
+@pytest.fixture
+def service(app, tmp_path, monkeypatch):
+    app.config.update(
+        GOOGLE_SHEETS_SNAPSHOTS=True,
+        GOOGLE_SHEETS_SNAPSHOT_PATH=str(tmp_path / 'snapshots.sqlite3'),
+        GOOGLE_SHEETS_CACHE_TTL=300,
+    )
+    sheets_cache.clear()
+    service = GoogleSheetsService()
+    service.versions = ['v1']
+    monkeypatch.setattr(service, 'sheet_version', lambda sheet_url, client=None: service.versions[-1])
+    yield service
+    sheets_cache.clear()
+
+
+def store_stale_snapshot(value, version, age=1000):
+    sheets_snapshots.put(CACHE_KEY, value, version)
+    conn = sqlite3.connect(sheets_snapshots.path)
+    with conn:
+        conn.execute("UPDATE snapshots SET fetched_at = ? WHERE key = ?", (time.time() - age, CACHE_KEY))
+    conn.close()
+
+
+def fetch_counter(value):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return value
+    return fetch, calls
+
+
+def test_stale_snapshot_served_when_version_unchanged(service):
+    store_stale_snapshot('snapshot', 'v1')
+    fetch, calls = fetch_counter('fresh')
+
+    assert service._cached_fetch(SHEET_URL, CACHE_KEY, False, fetch) == 'snapshot'
+    assert calls == []
+    # Confirmed current, so it is fresh again
+    assert time.time() - sheets_snapshots.get(CACHE_KEY)[1] < 60
+
+
+def test_stale_snapshot_refetched_when_version_moved(service):
+    store_stale_snapshot('snapshot', 'v1')
+    service.versions.append('v2')
+    fetch, calls = fetch_counter('fresh')
+
+    assert service._cached_fetch(SHEET_URL, CACHE_KEY, False, fetch) == 'fresh'
+    assert calls == [1]
+
+
+def test_stale_snapshot_without_version_is_refetched(service):
+    store_stale_snapshot('snapshot', None)
+    fetch, calls = fetch_counter('fresh')
+
+    assert service._cached_fetch(SHEET_URL, CACHE_KEY, False, fetch) == 'fresh'
+
+
+def test_clear_cache_drops_month_grids_of_the_tab(service):
+    keys = [CACHE_KEY, f"{CACHE_KEY}#month3", f"{CACHE_KEY}#month4"]
+    other = f"{SHEET_URL}:2024_old"
+    for key in keys + [other]:
+        sheets_cache.put(key, key)
+        sheets_snapshots.put(key, key, 'v1')
+        service._mark_fetched(key, 'v1')
+
+    service.clear_cache(SHEET_URL, '2024')
+
+    for key in keys:
+        assert sheets_cache.peek(key) is None
+        assert sheets_snapshots.get(key) is None
+        assert key not in service._last_update_times
+    assert sheets_cache.peek(other) == other
+    assert sheets_snapshots.get(other) is not None